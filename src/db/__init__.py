@@ -1,5 +1,15 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+from .config.client_registry import client_registry, mongo_lifespan, shutdown_mongo, startup_mongo
 from .config.config import Config
 from .repository.fashion_async import AsyncFashionRepository
+from .repository.read_cache import ProductReadCache
+from .vector.cache import VectorSearchCache
+
+if TYPE_CHECKING:
+    from redis_cache.client import RedisCacheClient
 
 _config = Config()
 _mongodb_atlas_config = _config.get_atlas_config()
@@ -9,6 +19,73 @@ _mongodb_local_config = _config.get_local_config()
 # ===================================================================
 # 비동기/FastAPI 환경을 위한 팩토리 함수
 # ===================================================================
+# repository 는 공유 클라이언트(client_registry) 위의 컬렉션 뷰이므로 (연결 문자열, DB, 컬렉션) 별로 하나만 생성해 재사용
+_repositories: dict[tuple[str, str, str], AsyncFashionRepository] = {}
+# 프로세스(API / ARQ 워커)의 Redis 클라이언트. 설정되어 있으면 repository 에 Redis 기반 캐시를 연결
+_cache_redis_client: 'RedisCacheClient | None' = None
+
+
+def _attach_caches(repo: AsyncFashionRepository) -> None:
+    if _cache_redis_client is None:
+        repo.search_cache = None
+        repo.read_cache = None
+        return
+    repo.search_cache = VectorSearchCache(_cache_redis_client)
+    # find_by_id / get_product_description_info 의 read-through 캐시 (L1 프로세스 메모리 + L2 Redis)
+    repo.read_cache = ProductReadCache(_cache_redis_client)
+
+
+def set_cache_client(redis_client: 'RedisCacheClient | None') -> None:
+    """
+    Redis 클라이언트를 등록하고 이미 생성된 / 이후 생성될 repository 에 벡터 검색 결과 캐시와 상품 조회 캐시를 연결합니다.
+    None 을 넘기면 캐시를 분리합니다. (종료 시)
+    """
+    global _cache_redis_client
+    _cache_redis_client = redis_client
+    for repo in _repositories.values():
+        _attach_caches(repo)
+
+
+async def _get_repository(mongodb_config: dict) -> AsyncFashionRepository:
+    key = (
+        mongodb_config['MONGODB_ATLAS_CONNECTION_STRING'],
+        mongodb_config['MONGODB_ATLAS_DATABASE_NAME'],
+        mongodb_config['MONGODB_ATLAS_COLLECTION_NAME'],
+    )
+    repo = _repositories.get(key)
+    # 공유 클라이언트가 종료 / 교체된 경우(lifespan 재시작, 다른 이벤트 루프)에만 다시 생성
+    if repo is not None and repo.db_manager.client is not None and repo.db_manager.client is client_registry.peek(key[0]):
+        return repo
+
+    repo = AsyncFashionRepository(connection_string=key[0], database_name=key[1], collection_name=key[2])
+    await repo.connect()  # 공유 클라이언트에서 컬렉션 객체만 획득
+    if _config.get_filter_compiler_config().get('SYNC_ON_STARTUP'):
+        # 필터 검증 대상을 실제 벡터 인덱스 정의 / 카탈로그 값으로 교체
+        await repo.sync_search_metadata()
+    _attach_caches(repo)
+    _repositories[key] = repo
+    return repo
+
+
+@asynccontextmanager
+async def api_lifespan(app: Any = None) -> AsyncIterator[None]:
+    """
+    FastAPI lifespan: 공유 MongoDB 클라이언트와 Redis 캐시를 함께 관리
+
+    Usage:
+        app = FastAPI(lifespan=api_lifespan)
+    """
+    from redis_cache import RedisCacheClient, redis_settings
+
+    redis_client = RedisCacheClient(redis_settings)
+    await redis_client.connect()
+    set_cache_client(redis_client)
+    try:
+        async with mongo_lifespan(app):
+            yield
+    finally:
+        set_cache_client(None)
+        await redis_client.close()
 
 
 async def get_async_fashion_repo() -> AsyncFashionRepository:
@@ -16,13 +93,7 @@ async def get_async_fashion_repo() -> AsyncFashionRepository:
     [비동기] Atlas DB에 연결하는 비동기 Fashion Repository를 반환합니다.
     FastAPI와 같은 비동기 프레임워크에서 사용하기 위해 설계되었습니다.
     """
-    repo = AsyncFashionRepository(
-        connection_string=_mongodb_atlas_config['MONGODB_ATLAS_CONNECTION_STRING'],
-        database_name=_mongodb_atlas_config['MONGODB_ATLAS_DATABASE_NAME'],
-        collection_name=_mongodb_atlas_config['MONGODB_ATLAS_COLLECTION_NAME'],
-    )
-    await repo.connect()  # 비동기 연결 초기화
-    return repo
+    return await _get_repository(_mongodb_atlas_config)
 
 
 async def get_async_fashion_sku_repo() -> AsyncFashionRepository:
@@ -30,13 +101,18 @@ async def get_async_fashion_sku_repo() -> AsyncFashionRepository:
     [비동기] Atlas DB의 products_by_sku 컬렉션에 연결하는 비동기 Fashion Repository를 반환합니다.
     비정규화된 SKU 중심 데이터에 접근할 때 사용합니다.
     """
-    repo = AsyncFashionRepository(
-        connection_string=_mongodb_atlas_sku_config['MONGODB_ATLAS_CONNECTION_STRING'],
-        database_name=_mongodb_atlas_sku_config['MONGODB_ATLAS_DATABASE_NAME'],
-        collection_name=_mongodb_atlas_sku_config['MONGODB_ATLAS_COLLECTION_NAME'],
-    )
-    await repo.connect()  # 비동기 연결 초기화
-    return repo
-
+    return await _get_repository(_mongodb_atlas_sku_config)
 
 
+__all__ = [
+    'AsyncFashionRepository',
+    'Config',
+    'api_lifespan',
+    'client_registry',
+    'get_async_fashion_repo',
+    'get_async_fashion_sku_repo',
+    'mongo_lifespan',
+    'set_cache_client',
+    'shutdown_mongo',
+    'startup_mongo',
+]
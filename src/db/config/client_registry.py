@@ -0,0 +1,126 @@
+"""
+프로세스 단위 공유 AsyncMongoClient 레지스트리
+
+연결 문자열별로 하나의 풀링된 클라이언트를 만들어 모든 repository 가 공유합니다.
+- repository 를 만들 때마다 새 클라이언트 / TLS 핸드셰이크 / ping 이 발생하지 않음
+- 풀 크기 / 유휴 시간은 CONNECTION_SETTINGS (MAX_POOL_SIZE, MIN_POOL_SIZE, MAX_IDLE_TIME_MS) 로 설정
+- FastAPI lifespan (mongo_lifespan) 과 ARQ startup / shutdown (startup_mongo / shutdown_mongo) 에서 수명 관리
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from loguru import logger
+from pymongo import AsyncMongoClient
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo.server_api import ServerApi
+
+from db.config.config import Config
+
+
+class MongoClientRegistry:
+    """연결 문자열 -> 공유 AsyncMongoClient"""
+
+    def __init__(self):
+        self.connection_config = Config().get_connection_config()
+        self._clients: dict[str, tuple[AsyncMongoClient, asyncio.AbstractEventLoop]] = {}
+
+    def _create_client(self, connection_string: str) -> AsyncMongoClient:
+        return AsyncMongoClient(
+            connection_string,
+            maxPoolSize=self.connection_config.get('MAX_POOL_SIZE'),
+            minPoolSize=self.connection_config.get('MIN_POOL_SIZE'),
+            maxIdleTimeMS=self.connection_config.get('MAX_IDLE_TIME_MS'),
+            serverSelectionTimeoutMS=self.connection_config.get('SERVER_SELECTION_TIMEOUT_MS'),
+            connectTimeoutMS=self.connection_config.get('CONNECTION_TIMEOUT_MS'),
+            socketTimeoutMS=self.connection_config.get('SOCKET_TIMEOUT_MS'),
+            server_api=ServerApi('1'),
+        )
+
+    def peek(self, connection_string: str) -> AsyncMongoClient | None:
+        """현재 이벤트 루프에서 사용 가능한 공유 클라이언트 (없으면 None, 생성하지 않음)"""
+        entry = self._clients.get(connection_string)
+        if entry is None or entry[1] is not asyncio.get_running_loop():
+            return None
+        return entry[0]
+
+    async def get_client(self, connection_string: str) -> AsyncMongoClient:
+        """
+        공유 클라이언트를 반환합니다. 처음 요청될 때만 생성 후 ping 으로 검증합니다.
+        AsyncMongoClient 는 생성된 이벤트 루프에 묶이므로 루프가 바뀐 경우(테스트 / 스크립트 재실행) 새로 생성합니다.
+
+        Raises:
+            ConnectionError: 연결 검증 실패
+        """
+        if not connection_string:
+            raise ValueError('Connection string is required')
+        existing = self.peek(connection_string)
+        if existing is not None:
+            return existing
+
+        loop = asyncio.get_running_loop()
+        client = self._create_client(connection_string)
+        try:
+            await client.admin.command('ping')
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            await client.close()
+            raise ConnectionError(f'Connection verification failed (async): {e}') from e
+
+        # ping 대기 중 다른 코루틴이 먼저 등록했다면 그 클라이언트를 사용
+        existing = self.peek(connection_string)
+        if existing is not None:
+            await client.close()
+            return existing
+        self._clients[connection_string] = (client, loop)
+        logger.info(
+            f'Created shared MongoDB client (maxPoolSize={self.connection_config.get("MAX_POOL_SIZE")}, '
+            f'minPoolSize={self.connection_config.get("MIN_POOL_SIZE")}); {len(self._clients)} client(s) in registry'
+        )
+        return client
+
+    async def close_all(self) -> None:
+        """모든 공유 클라이언트 종료 (프로세스 종료 시)"""
+        clients, self._clients = self._clients, {}
+        for client, loop in clients.values():
+            if loop is asyncio.get_running_loop():
+                await client.close()
+        if clients:
+            logger.info(f'Closed {len(clients)} shared MongoDB client(s)')
+
+
+client_registry = MongoClientRegistry()
+
+
+async def startup_mongo(ctx: dict[str, Any] | None = None) -> None:
+    """ARQ on_startup 등에서 호출: 설정된 Atlas 클라이언트를 미리 생성해 첫 요청의 연결 비용을 없앰"""
+    config = Config()
+    connection_strings = {
+        config.get_atlas_config()['MONGODB_ATLAS_CONNECTION_STRING'],
+        config.get_atlas_sku_config()['MONGODB_ATLAS_CONNECTION_STRING'],
+    }
+    for connection_string in filter(None, connection_strings):
+        await client_registry.get_client(connection_string)
+
+
+async def shutdown_mongo(ctx: dict[str, Any] | None = None) -> None:
+    """ARQ on_shutdown 등에서 호출"""
+    await client_registry.close_all()
+
+
+@asynccontextmanager
+async def mongo_lifespan(app: Any = None) -> AsyncIterator[None]:
+    """
+    FastAPI lifespan 용 컨텍스트 매니저
+
+    Usage:
+        app = FastAPI(lifespan=mongo_lifespan)
+        # 다른 lifespan 과 함께 사용할 때
+        async with mongo_lifespan(app): ...
+    """
+    await startup_mongo()
+    try:
+        yield
+    finally:
+        await shutdown_mongo()
@@ -32,7 +32,15 @@ class Config_(dict):
 
         # 연결 타임아웃 설정
         _connection_settings = {
-            'CONNECTION_SETTINGS': {'CONNECTION_TIMEOUT_MS': 5000, 'SERVER_SELECTION_TIMEOUT_MS': 5000, 'SOCKET_TIMEOUT_MS': 5000}
+            'CONNECTION_SETTINGS': {
+                'CONNECTION_TIMEOUT_MS': 5000,
+                'SERVER_SELECTION_TIMEOUT_MS': 5000,
+                'SOCKET_TIMEOUT_MS': 5000,
+                # 프로세스 공유 클라이언트 풀 설정 (db.config.client_registry)
+                'MAX_POOL_SIZE': int(os.getenv('MONGODB_MAX_POOL_SIZE', '50')),
+                'MIN_POOL_SIZE': int(os.getenv('MONGODB_MIN_POOL_SIZE', '5')),
+                'MAX_IDLE_TIME_MS': int(os.getenv('MONGODB_MAX_IDLE_TIME_MS', '60000')),
+            }
         }
 
         # 벡터 검색 설정(이전 버전)
@@ -71,24 +79,314 @@ class Config_(dict):
                 'DEFAULT_SIMILARITY': 'cosine',
                 'DEFAULT_NUM_CANDIDATES': 100,
                 'DEFAULT_LIMIT': 10,
-                'DEFAULT_PROJECT_FIELDS': {
-                    # "products.product_id" : 1,
-                    # 'products.product_name': 1,
-                    # 'products.current_price': 1,
-                    # 'products.original_price': 1,
-                    'products.captions.comprehensive_description': 1,
-                    'product_skus.main_category': 1,
-                    'product_skus.sub_category': 1,
-                    # 'product_skus.image_urls': 1,
-                    # 'product_skus.color_name': 1,
-                    # "product_skus.color_brightness" : 1,
-                    # "product_skus.color_saturation" : 1,
-                    # "product_skus.sku_id" : 1,
-                    # 'product_skus.style_tags': 1,
-                    # 'product_skus.tpo_tags': 1,
-                    # 'product_skus.fit': 1,
-                    # 'product_skus.common': 1,
+                # vector_search_stream 의 커서 배치 크기 (작을수록 첫 문서가 빨리 도착)
+                'STREAM_BATCH_SIZE': 2,
+                # 벡터 인덱스에 filter 타입으로 선언된 필드 (로컬 엔진은 이 필드들을 메모리에 적재)
+                # 인덱스 정의가 이 목록과 다르면 Atlas 에서 필터가 실패하므로, 필드를 추가했다면 인덱스도 같은 filter 필드로 다시 빌드해야 함
+                # (FILTER_COMPILER_SETTINGS.SYNC_ON_STARTUP 이면 시작 시 실제 인덱스 정의로 검증 대상을 교체)
+                'FILTER_FIELDS': [
+                    'product_skus.main_category',
+                    'product_skus.sub_category',
+                    'product_skus.gender',
+                    'product_skus.fit',
+                    'product_skus.color_name',
+                    'product_skus.style_tags',
+                    'product_skus.tpo_tags',
+                    'products.current_price',
+                ],
+                # 검색 결과 기본 프로젝션 프로필 (db.query_builders.projections.PROJECTION_PROFILES)
+                'DEFAULT_PROJECTION_PROFILE': 'rerank',
+            }
+        }
+
+        # 사전 필터 컴파일러 설정 (VectorFilterSpec 필드 -> DB 필드 경로 / 값 코드)
+        _filter_compiler_settings = {
+            'FILTER_COMPILER_SETTINGS': {
+                'FIELD_PATHS': {
+                    'main_category': 'product_skus.main_category',
+                    'sub_category': 'product_skus.sub_category',
+                    'gender': 'product_skus.gender',
+                    'fit': 'product_skus.fit',
+                    'color': 'product_skus.color_name',
+                    'style_tags': 'product_skus.style_tags',
+                    'tpo_tags': 'product_skus.tpo_tags',
+                    'price': 'products.current_price',
+                },
+                'MAIN_CATEGORY_CODES': {'상의': 'TOP', 'TOP': 'TOP', '하의': 'BOTTOM', '바지': 'BOTTOM', 'BOTTOM': 'BOTTOM'},
+                # 서브 카테고리는 DB 에 무신사 카테고리 코드(숫자)로 저장됨
+                # [예시 데이터] SUB_CATEGORY_CODES / COLOR_FAMILIES 는 카탈로그에서 가져온 값이 아닌 수기 작성 샘플입니다.
+                # SYNC_ON_STARTUP 이면 repository 생성 시 카탈로그의 distinct 값으로 실제 존재하는 코드 / 색상만 남깁니다.
+                # (AsyncFashionRepository.sync_filter_vocabulary)
+                'SUB_CATEGORY_CODES': {
+                    '반소매 티셔츠': 1001,
+                    '셔츠/블라우스': 1002,
+                    '피케/카라 티셔츠': 1003,
+                    '후드 티셔츠': 1004,
+                    '맨투맨/스웨트': 1005,
+                    '니트/스웨터': 1006,
+                    '긴소매 티셔츠': 1010,
+                    '민소매 티셔츠': 1011,
+                    '데님 팬츠': 3002,
+                    '트레이닝/조거 팬츠': 3004,
+                    '코튼 팬츠': 3007,
+                    '슈트 팬츠/슬랙스': 3008,
+                    '숏 팬츠': 3009,
                 },
+                'COLOR_FAMILIES': {
+                    '블랙': ['블랙', '차콜'],
+                    '화이트': ['화이트', '오프화이트', '아이보리'],
+                    '그레이': ['그레이', '라이트 그레이', '다크 그레이', '멜란지 그레이'],
+                    '블루': ['네이비', '블루', '스카이 블루', '데님'],
+                    '브라운': ['베이지', '브라운', '카멜', '카키 베이지'],
+                    '그린': ['카키', '올리브', '그린', '민트'],
+                    '레드': ['레드', '버건디', '핑크'],
+                    '옐로우': ['옐로우', '머스타드', '오렌지'],
+                },
+                # repository 생성 시 벡터 인덱스 정의의 filter 필드(sync_filter_fields_from_index)와
+                # 카탈로그 어휘(sync_filter_vocabulary)로 검증 대상을 교체. 실패하면 위의 정적 설정을 그대로 사용
+                # list_search_indexes + 전체 컬렉션 distinct 2 번이 실행되므로 기본값은 False (필요하면 sync_search_metadata() 를 직접 호출)
+                'SYNC_ON_STARTUP': False,
+            }
+        }
+
+        # 하이브리드(어휘 + 벡터) 검색 설정
+        _hybrid_search_settings = {
+            'HYBRID_SEARCH_SETTINGS': {
+                # 'server' : $rankFusion 단일 aggregation (Atlas 8.1+), 'client' : 두 검색을 동시에 실행 후 앱에서 RRF
+                'MODE': 'client',
+                'TEXT_SEARCH_INDEX': 'text',
+                'TEXT_SEARCH_PATHS': ['products.product_name', 'products.brand_name', 'products.captions.comprehensive_description'],
+                # 'server' 모드의 $rankFusion 벡터 단계 후보 수 ('client' 모드는 vector_search 의 numCandidates 정책을 따름)
+                'NUM_CANDIDATES': 40,
+                'CANDIDATE_LIMIT': 20,
+                'RRF_K': 60,
+                'VECTOR_WEIGHT': 1.0,
+                'TEXT_WEIGHT': 1.0,
+            }
+        }
+
+        # 로컬(in-process) 벡터 엔진 설정
+        _local_vector_engine_settings = {
+            'LOCAL_VECTOR_ENGINE_SETTINGS': {
+                'HNSW_M': 16,
+                'HNSW_EF_CONSTRUCTION': 100,
+                'HNSW_EF_SEARCH': 64,
+                # HNSWIndex 는 순수 파이썬 구현이라 3072 차원 기준 구축이 삽입당 수 ms~수십 ms 걸림 (1만 개 ≈ 수 분).
+                # 이 값을 넘는 코퍼스는 구축을 거부하므로 ExactVectorEngine(mmap) 이나 Atlas 를 사용 (None 이면 제한 없음)
+                'HNSW_MAX_VECTORS': 20000,
+                # 필터 통과 문서 수가 이 값 이하이면 그래프 탐색 대신 전수 탐색
+                'BRUTE_FORCE_THRESHOLD': 2000,
+                # exact 검색 시 한 번의 행렬-벡터 곱에 사용하는 행 수
+                'EXACT_SEARCH_BLOCK_SIZE': 8192,
+            }
+        }
+
+        # 벡터 검색 결과 캐시 설정 (Redis)
+        _vector_search_cache_settings = {
+            'VECTOR_SEARCH_CACHE_SETTINGS': {
+                'KEY_PREFIX': 'vsearch',
+                'TTL': 60 * 60 * 6,
+                # 쿼리 임베딩을 정규화 후 소수점 이하 PRECISION 자리로 양자화해 키를 생성
+                'PRECISION': 3,
+                # 카탈로그 버전을 Redis 에서 다시 읽기까지의 로컬 캐시 시간(초)
+                'VERSION_REFRESH_SECONDS': 5,
+            }
+        }
+
+        # 적응형 numCandidates 설정 (FashionQueryBuilder.vector_search_pipeline 의 num_candidates='auto')
+        _num_candidates_settings = {
+            'NUM_CANDIDATES_SETTINGS': {
+                # 'fixed' : DEFAULT_NUM_CANDIDATES 사용, 'adaptive' : 필터 선택도 / 목표 recall 기반으로 결정
+                'MODE': 'fixed',
+                'RECALL_TARGET': 0.95,
+                # limit 대비 배수 = 1 + RECALL_COEFFICIENT * ln(1 / (1 - RECALL_TARGET))
+                'RECALL_COEFFICIENT': 4.0,
+                # Atlas $vectorSearch numCandidates 상한
+                'MAX_CANDIDATES': 10000,
+                # 필터 통과 문서 수가 이 값 이하이면 exact(ENN) 검색으로 전환
+                'EXACT_THRESHOLD': 500,
+                # 필터별 문서 수 추정치 유지 시간(초). 갱신(count_documents)은 요청 경로 밖의 백그라운드 태스크에서 실행
+                'ESTIMATE_TTL_SECONDS': 60 * 10,
+                # 필터별 추정치 최대 보관 수 (가격 범위처럼 값이 다양한 필터로 무한히 늘지 않도록 LRU)
+                'MAX_ESTIMATES': 1024,
+            }
+        }
+
+        # 2단계(축소 차원 후보 검색 + 전체 차원 재정렬) 벡터 검색 설정
+        _two_stage_search_settings = {
+            'TWO_STAGE_SEARCH_SETTINGS': {
+                # 'truncate' : 앞쪽 차원 절단 (Matryoshka), 'pca' : 오프라인 보정한 PCA 투영
+                'METHOD': 'truncate',
+                'REDUCED_DIMENSIONS': 512,
+                'REDUCED_VECTOR_INDEX': 'reduced',
+                'REDUCED_EMBEDDING_FIELD_PATH': 'embedding.comprehensive_description.vector_reduced',
+                # 1단계 후보 수 = limit * CANDIDATE_MULTIPLIER
+                'CANDIDATE_MULTIPLIER': 10,
+            }
+        }
+
+        # 상품 단위 collapse / MMR 다양화 설정
+        _diversify_settings = {
+            'DIVERSIFY_SETTINGS': {
+                'PRODUCT_KEY_PATH': 'products.product_id',
+                # 초기 상품당 SKU 히트 수 추정치 (조회마다 지수이동평균으로 갱신)
+                'INITIAL_SKUS_PER_PRODUCT': 3.0,
+                'OVERSAMPLE_SAFETY': 1.5,
+                'MAX_OVERSAMPLE': 20,
+                'OVERSAMPLE_EMA_ALPHA': 0.2,
+                # MMR 관련도 가중치 (1 이면 관련도만 고려)
+                'MMR_LAMBDA': 0.7,
+                # MMR 후보 상품 수 = limit * MMR_POOL_MULTIPLIER
+                'MMR_POOL_MULTIPLIER': 3,
+            }
+        }
+
+        # 상품 조회 read-through 캐시 설정 (L1 : 프로세스 내 LRU, L2 : Redis)
+        _read_cache_settings = {
+            'READ_CACHE_SETTINGS': {
+                'KEY_PREFIX': 'product',
+                'L1_MAXSIZE': 2048,
+                # 다른 프로세스에서 무효화된 값을 보여줄 수 있는 최대 시간이므로 짧게 유지
+                'L1_TTL': 30,
+                'L2_TTL': 60 * 60,
+            }
+        }
+
+        # find_by_id 요청 병합(DataLoader) 설정
+        _batch_loader_settings = {
+            'BATCH_LOADER_SETTINGS': {
+                'ENABLED': True,
+                # 0 이면 같은 이벤트 루프 tick 의 호출만 병합 (추가 지연 없음)
+                'WINDOW_MS': 0,
+                'MAX_BATCH_SIZE': 100,
+            }
+        }
+
+        # update_by_id write-behind 버퍼 설정
+        _write_buffer_settings = {
+            'WRITE_BUFFER_SETTINGS': {
+                'ENABLED': True,
+                # 버퍼에 모인 문서 수가 이 값에 도달하면 즉시 bulk_write
+                'MAX_BATCH_SIZE': 500,
+                # 첫 쓰기 이후 최대 대기 시간 (호출자는 flush 까지 결과를 기다림)
+                'FLUSH_INTERVAL_MS': 50,
+            }
+        }
+
+        # products -> products_by_sku 비정규화 마이그레이션 파이프라인 설정
+        _migration_settings = {
+            'MIGRATION_SETTINGS': {
+                # insert_many 한 번에 쓸 SKU 문서 수
+                'BATCH_SIZE': 500,
+                # 동시에 실행할 bulk writer 수
+                'WRITE_CONCURRENCY': 4,
+                # 단계 사이 큐에 쌓아 둘 최대 배치 수 (backpressure)
+                'QUEUE_SIZE': 8,
+                # 소스 커서가 한 번에 가져올 문서 수
+                'READ_BATCH_SIZE': 1000,
+                'CHECKPOINT_COLLECTION': 'migration_checkpoints',
+                # insert : insert_many (기존 문서는 건너뜀) / upsert : 바뀐 문서만 ReplaceOne(upsert=True)
+                # 기본값은 기존 동작인 insert. 재실행으로 변경분을 반영하려면 migrate_data(write_mode='upsert') 로 선택
+                'WRITE_MODE': 'insert',
+                # 검증 시 $in 한 번에 조회할 SKU 수
+                'VERIFY_BATCH_SIZE': 1000,
+                # 오래된 사본(stale) 판별에 비교할 필드 (products.* 가격 / 벡터 필드는 SKU 컬렉션에서 따로 갱신되므로 제외)
+                'VERIFY_HASH_FIELDS': ['source_product_id', 'product_skus', 'images', 'reviews'],
+                # 리포트에 포함할 항목별 최대 _id 수
+                'VERIFY_REPORT_LIMIT': 100,
+            }
+        }
+
+        # products -> products_by_sku change stream 증분 동기화 설정
+        _sku_sync_settings = {
+            'SKU_SYNC_SETTINGS': {
+                # 한 번에 반영할 최대 변경 이벤트 수
+                'BATCH_SIZE': 200,
+                # 이벤트가 없을 때 배치를 닫기까지 대기 시간 (반영 지연의 상한)
+                'MAX_AWAIT_MS': 1000,
+                # 첫 미반영 이벤트 이후 이 시간(초)이 지나면 배치가 차지 않아도 반영 (이벤트가 계속 들어오는 경우의 지연 상한)
+                'MAX_LAG_SECONDS': 2,
+                # resume token 을 저장할 체크포인트 이름 (MIGRATION_SETTINGS.CHECKPOINT_COLLECTION 에 저장)
+                'CHECKPOINT_NAME': 'products_by_sku_change_stream',
+            }
+        }
+
+        # 상품 임베딩 공유 레이아웃 설정
+        # embedded : SKU 문서마다 상품 임베딩을 복사 (기존)
+        # shared   : 상품당 하나의 임베딩 문서(COLLECTION_NAME)에 벡터 인덱스를 두고 검색 후 SKU 문서로 $lookup
+        #            임베딩 문서에는 FILTER_FIELDS 가 상품의 SKU 값 목록으로 저장되어 같은 사전 필터를 사용할 수 있음
+        #            (VECTOR_INDEX 는 EMBEDDING_FIELD_PATH 와 FILTER_FIELDS 를 선언해야 함)
+        _shared_embedding_settings = {
+            'SHARED_EMBEDDING_SETTINGS': {
+                'LAYOUT': 'embedded',
+                'COLLECTION_NAME': 'product_embeddings',
+                'VECTOR_INDEX': 'product_embedding',
+                # 필터가 있을 때 SKU limit 개를 채우기 위해 가져올 상품 수 배수 (상품 필터 필드는 SKU 값의 합집합이라 SKU 단계에서 걸러질 수 있음)
+                'PRODUCT_OVERSAMPLE': 3,
+            }
+        }
+
+        # 벡터 필드 백필(add_bson_vector_field / add_quantized_vector_fields / add_reduced_vector_field) 설정
+        _backfill_settings = {
+            'BACKFILL_SETTINGS': {
+                # 동시에 실행할 _id 범위 파티션(커서) 수
+                'PARTITIONS': 8,
+                'BATCH_SIZE': 500,
+                # 변환 실행 풀: thread (이벤트 루프 기본 스레드 풀) / process (spawn 컨텍스트, 배치마다 벡터를 pickle 로 전달)
+                'EXECUTOR': 'thread',
+                # None 이면 CPU 수
+                'MAX_WORKERS': None,
+            }
+        }
+
+        # 스키마 마이그레이션(remove_field 등) 스로틀링 설정
+        _schema_migration_settings = {
+            'SCHEMA_MIGRATION_SETTINGS': {
+                'BATCH_SIZE': 500,
+                # 초당 수정 문서 수 상한(초기값) / 하한
+                'OPS_PER_SECOND': 2000,
+                'MIN_OPS_PER_SECOND': 100,
+                # 배치 쓰기 지연이 이 값을 넘으면 예산을 BACKOFF_FACTOR 배로 줄이고, 이하이면 상한의 RECOVERY_STEP 만큼 늘림
+                'TARGET_WRITE_LATENCY_MS': 100,
+                'BACKOFF_FACTOR': 0.5,
+                'RECOVERY_STEP': 0.1,
+            }
+        }
+
+        # FashionRepository.bulk_insert_documents(chunked=True) 청크 병렬 삽입 설정
+        _bulk_insert_settings = {
+            'BULK_INSERT_SETTINGS': {
+                # 청크당 최대 문서 수 / BSON 크기 (서버 배치 한도 48MB, 트랜잭션 한도 16MB 보다 충분히 작게)
+                'CHUNK_SIZE': 1000,
+                'MAX_CHUNK_BYTES': 8 * 1024 * 1024,
+                # 동시에 bulk_write 하는 청크 수
+                'MAX_WORKERS': 4,
+                # 일시적 오류(네트워크 / RetryableWriteError) 시 청크 재시도 횟수와 기본 대기 시간 (지수 증가)
+                'MAX_RETRIES': 3,
+                'RETRY_BACKOFF_SECONDS': 0.5,
+            }
+        }
+
+        # FashionRepository.bulk_update_document_payloads 적응형 청크 설정
+        _bulk_update_settings = {
+            'BULK_UPDATE_SETTINGS': {
+                'INITIAL_CHUNK_SIZE': 1000,
+                'MIN_CHUNK_SIZE': 100,
+                'MAX_CHUNK_SIZE': 10000,
+                # 청크 지연이 목표를 넘으면 청크를 절반으로, 목표의 절반 미만이면 두 배로
+                'TARGET_CHUNK_LATENCY_MS': 500,
+            }
+        }
+
+        # 프로젝션 프로필별 반환 문서 크기 측정 (ProjectionSizeStats)
+        _projection_stats_settings = {
+            'PROJECTION_STATS_SETTINGS': {
+                # 조회 호출 중 BSON 크기를 측정할 비율 (1.0 이면 모든 호출)
+                'SAMPLE_RATE': 0.01,
+                # find_all 처럼 커서를 그대로 반환하는 호출은 같은 조건의 앞쪽 문서 이 개수만큼 별도로 읽어 측정
+                'SAMPLE_DOCUMENTS': 20,
+                # 누적 요약 INFO 로그 간격(초). 호출별 로그는 DEBUG
+                'LOG_INTERVAL_SECONDS': 300,
             }
         }
 
@@ -98,6 +396,24 @@ class Config_(dict):
         self.update(_mongodb_atlas_sku_dict)
         self.update(_connection_settings)
         self.update(_vector_search_settings)
+        self.update(_filter_compiler_settings)
+        self.update(_hybrid_search_settings)
+        self.update(_local_vector_engine_settings)
+        self.update(_vector_search_cache_settings)
+        self.update(_num_candidates_settings)
+        self.update(_two_stage_search_settings)
+        self.update(_diversify_settings)
+        self.update(_read_cache_settings)
+        self.update(_batch_loader_settings)
+        self.update(_write_buffer_settings)
+        self.update(_migration_settings)
+        self.update(_sku_sync_settings)
+        self.update(_shared_embedding_settings)
+        self.update(_backfill_settings)
+        self.update(_schema_migration_settings)
+        self.update(_bulk_insert_settings)
+        self.update(_bulk_update_settings)
+        self.update(_projection_stats_settings)
 
     def get_atlas_config(self):
         return self.get('MONGODB_ATLAS')
@@ -111,6 +427,60 @@ class Config_(dict):
     def get_vector_search_config(self):
         return self.get('VECTOR_SEARCH_SETTINGS')
 
+    def get_filter_compiler_config(self):
+        return self.get('FILTER_COMPILER_SETTINGS')
+
+    def get_hybrid_search_config(self):
+        return self.get('HYBRID_SEARCH_SETTINGS')
+
+    def get_local_vector_engine_config(self):
+        return self.get('LOCAL_VECTOR_ENGINE_SETTINGS')
+
+    def get_vector_search_cache_config(self):
+        return self.get('VECTOR_SEARCH_CACHE_SETTINGS')
+
+    def get_num_candidates_config(self):
+        return self.get('NUM_CANDIDATES_SETTINGS')
+
+    def get_two_stage_search_config(self):
+        return self.get('TWO_STAGE_SEARCH_SETTINGS')
+
+    def get_diversify_config(self):
+        return self.get('DIVERSIFY_SETTINGS')
+
+    def get_read_cache_config(self):
+        return self.get('READ_CACHE_SETTINGS')
+
+    def get_batch_loader_config(self):
+        return self.get('BATCH_LOADER_SETTINGS')
+
+    def get_write_buffer_config(self):
+        return self.get('WRITE_BUFFER_SETTINGS')
+
+    def get_migration_config(self):
+        return self.get('MIGRATION_SETTINGS')
+
+    def get_sku_sync_config(self):
+        return self.get('SKU_SYNC_SETTINGS')
+
+    def get_shared_embedding_config(self):
+        return self.get('SHARED_EMBEDDING_SETTINGS')
+
+    def get_backfill_config(self):
+        return self.get('BACKFILL_SETTINGS')
+
+    def get_schema_migration_config(self):
+        return self.get('SCHEMA_MIGRATION_SETTINGS')
+
+    def get_bulk_insert_config(self):
+        return self.get('BULK_INSERT_SETTINGS')
+
+    def get_bulk_update_config(self):
+        return self.get('BULK_UPDATE_SETTINGS')
+
+    def get_projection_stats_config(self):
+        return self.get('PROJECTION_STATS_SETTINGS')
+
     def get_connection_config(self):
         return self.get('CONNECTION_SETTINGS')
 
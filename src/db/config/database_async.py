@@ -4,16 +4,25 @@ from pymongo.database import Database
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from pymongo.server_api import ServerApi
 
+from db.config.client_registry import client_registry
+
 
 class AsyncDatabaseManager:
     """비동기 DB 연결 관리 클래스"""
 
-    def __init__(self, connection_string: str, database_name: str = None, collection_name: str = None, timeout_ms: int = 5000):
-        """AsyncDatabaseManager 클래스 초기화 (연결은 하지 않음)"""
+    def __init__(self, connection_string: str, database_name: str = None, collection_name: str = None, timeout_ms: int = 5000, shared: bool = True):
+        """
+        AsyncDatabaseManager 클래스 초기화 (연결은 하지 않음)
+
+        Args:
+            shared (bool): True 면 client_registry 의 프로세스 공유 클라이언트를 사용하고 close() 에서 클라이언트를 닫지 않음.
+                False 면 전용 클라이언트를 생성 (timeout_ms 적용)
+        """
         self.connection_string = connection_string
         self.database_name = database_name
         self.collection_name = collection_name
         self.timeout_ms = timeout_ms
+        self.shared = shared
 
         self._client: AsyncMongoClient = None
         self._db: Database = None
@@ -25,9 +34,14 @@ class AsyncDatabaseManager:
             return
         try:
             self._validate_connection_string()
-            self._create_client()
-            await self._connect_to_database()
-            await self._verify_connection()
+            if self.shared:
+                # 공유 클라이언트는 생성 시 한 번만 ping 으로 검증됨
+                self._client = await client_registry.get_client(self.connection_string)
+                await self._connect_to_database()
+            else:
+                self._create_client()
+                await self._connect_to_database()
+                await self._verify_connection()
             self._connection_status = True
             logger.info(f'Successfully connected to MongoDB (async): {self.database_name}')
         except Exception as e:
@@ -69,6 +83,17 @@ class AsyncDatabaseManager:
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
             raise ConnectionError(f'Connection verification failed (async): {e}')
 
+    @property
+    def client(self) -> AsyncMongoClient | None:
+        return self._client
+
+    @property
+    def max_pool_size(self) -> int:
+        """연결 풀의 최대 커넥션 수 (동시 요청 상한 산정용)"""
+        if not self._client:
+            raise ConnectionError('AsyncMongoClient is not initialized')
+        return self._client.options.pool_options.max_pool_size
+
     def get_collection(self):
         if self._db is None:
             raise ConnectionError('Database connection not established (async)')
@@ -85,9 +110,10 @@ class AsyncDatabaseManager:
             return False
 
     async def close(self):
-        if self._client:
+        if self._client and not self.shared:
             await self._client.close()
             logger.info('MongoDB async client closed')
+        # 공유 클라이언트는 client_registry (lifespan / worker shutdown) 에서 종료
         self._connection_status = False
 
     async def __aenter__(self):
@@ -7,26 +7,44 @@ MongoDB 데이터 비정규화 스크립트
 """
 
 import asyncio
+import hashlib
+import time
 from typing import Any
 
+from bson import json_util
 from loguru import logger
+from pymongo import ASCENDING, ReplaceOne
+from pymongo.collection import Collection
 from pymongo.errors import BulkWriteError
 
+from db.config.client_registry import shutdown_mongo
 from db.config.config import Config
+from db.repository.checkpoint import CheckpointStore
 from db.repository.fashion_async import AsyncFashionRepository
+from db.vector.base import get_path
+from db.vector.cache import VectorSearchCache
 
 # 로깅 설정
 
+MIGRATION_NAME = 'denormalize_products_by_sku'
+DUPLICATE_KEY_ERROR = 11000
+CONTENT_HASH_FIELD = 'content_hash'
+MISSING = object()
+
 
 class DenormalizationService:
     """데이터 비정규화 서비스"""
 
-    def __init__(self):
+    def __init__(self, search_cache: VectorSearchCache | None = None):
+        """
+        Args:
+            search_cache (VectorSearchCache, optional): 마이그레이션 완료 시 무효화할 벡터 검색 캐시
+        """
         self.config = Config()
         self.atlas_config = self.config.get_atlas_config()
         self.atlas_sku_config = self.config.get_atlas_sku_config()
 
-        # 소스와 타겟 Repository 초기화
+        # 소스와 타겟 Repository 초기화 (같은 클러스터면 client_registry 의 공유 클라이언트 하나를 사용)
         self.source_repo = AsyncFashionRepository(
             connection_string=self.atlas_config['MONGODB_ATLAS_CONNECTION_STRING'],
             database_name=self.atlas_config['MONGODB_ATLAS_DATABASE_NAME'],
@@ -39,7 +57,15 @@ class DenormalizationService:
             collection_name=self.atlas_sku_config['MONGODB_ATLAS_COLLECTION_NAME'],
         )
 
-        self.batch_size = 50  # 배치 크기
+        self.search_cache = search_cache
+        self.migration_config = self.config.get_migration_config()
+        self.batch_size = self.migration_config.get('BATCH_SIZE')  # 배치 크기
+        self.write_mode = self.migration_config.get('WRITE_MODE')
+        self.embedding_layout = self.config.get_shared_embedding_config().get('LAYOUT')
+        self.write_concurrency = self.migration_config.get('WRITE_CONCURRENCY')
+        self.queue_size = self.migration_config.get('QUEUE_SIZE')
+        self.read_batch_size = self.migration_config.get('READ_BATCH_SIZE')
+        self.checkpoint_store: CheckpointStore | None = None
         self.processed_count = 0
         self.error_count = 0
 
@@ -48,6 +74,10 @@ class DenormalizationService:
         try:
             await self.source_repo.connect()
             await self.target_repo.connect()
+            self.checkpoint_store = CheckpointStore(self.target_repo.collection.database[self.migration_config.get('CHECKPOINT_COLLECTION')])
+            if self.embedding_layout == 'shared':
+                # shared 레이아웃의 벡터 검색은 임베딩 문서에서 SKU 를 source_product_id 로 $lookup 하므로 인덱스가 필요
+                await self.target_repo.collection.create_index([('source_product_id', ASCENDING)])
             logger.info('Successfully connected to source and target databases')
         except Exception as e:
             logger.error(f'Failed to connect to databases: {e}')
@@ -72,13 +102,15 @@ class DenormalizationService:
         if not product_doc:
             return []
 
-        # 공통 데이터 추출
+        # 공통 데이터 추출 (shared 레이아웃이면 임베딩은 상품 임베딩 문서에만 저장)
         common_data = {
             'products': product_doc.get('products', {}),
             'embedding': product_doc.get('embedding', {}),
             'reviews': product_doc.get('reviews', []),
             'images': product_doc.get('images', {}),
         }
+        if self.embedding_layout == 'shared':
+            del common_data['embedding']
 
         # product_skus 데이터 추출
         product_skus = product_doc.get('product_skus', {})
@@ -128,9 +160,12 @@ class DenormalizationService:
                 # SKU 문서 생성
                 sku_document = {
                     '_id': sku_ids[i],  # SKU ID를 문서 ID로 사용
+                    'source_product_id': product_doc.get('_id'),  # 증분 동기화(sku_sync) 시 상품에서 사라진 SKU 를 찾기 위한 원본 _id
                     **common_data,  # 공통 데이터 복사
                     'product_skus': product_sku,  # 단일 SKU 객체
                 }
+                # upsert 모드에서 바뀌지 않은 문서를 건너뛰기 위한 내용 해시
+                sku_document[CONTENT_HASH_FIELD] = content_hash(sku_document)
 
                 sku_documents.append(sku_document)
 
@@ -140,103 +175,235 @@ class DenormalizationService:
 
         return sku_documents
 
-    async def process_batch(self, batch_documents: list[dict]) -> int:
+    def transform_product_to_embedding_document(self, product_doc: dict, sku_documents: list[dict]) -> dict | None:
         """
-        배치 단위로 문서 처리
+        shared 레이아웃의 상품 임베딩 문서 생성
+
+        벡터 인덱스의 filter 필드(FILTER_FIELDS)는 상품의 SKU 값들을 모아 저장합니다.
+        (값이 하나면 그대로, 여러 개면 배열 -> 배열 원소 중 하나라도 조건을 만족하면 후보가 됨)
+
+        Args:
+            product_doc: 원본 상품 문서
+            sku_documents: transform_product_to_sku_documents 결과
+
+        Returns:
+            dict | None: {'_id': 상품 _id, 'embedding': ..., <filter 필드>..., 'content_hash'} (SKU 가 없으면 None)
+        """
+        if not product_doc or not sku_documents:
+            return None
+
+        embedding_document: dict[str, Any] = {'_id': product_doc['_id'], 'embedding': product_doc.get('embedding', {})}
+        for path in self.config.get_vector_search_config().get('FILTER_FIELDS'):
+            values: list[Any] = []
+            for sku_document in sku_documents:
+                value = get_path(sku_document, path)
+                for item in value if isinstance(value, list) else [value]:
+                    if item is not None and item not in values:
+                        values.append(item)
+            if values:
+                _set_path(embedding_document, path, values[0] if len(values) == 1 else values)
+        embedding_document[CONTENT_HASH_FIELD] = content_hash(embedding_document)
+        return embedding_document
+
+    async def process_batch(self, batch_documents: list[dict], write_mode: str | None = None) -> tuple[int, int, int]:
+        """
+        배치 단위로 문서 쓰기
+
+        - insert : insert_many(ordered=False). 이미 있는 문서(중복 키)는 건너뜀으로 집계하며 갱신하지 않음
+        - upsert : 타겟의 content_hash 를 $in 으로 한 번 조회해 새 문서 / 바뀐 문서만 ReplaceOne(upsert=True) 로 씀
 
         Args:
             batch_documents: 처리할 문서 배치
+            write_mode: 'insert' | 'upsert' (기본값: MIGRATION_SETTINGS.WRITE_MODE)
 
         Returns:
-            int: 성공적으로 처리된 문서 수
+            tuple[int, int, int]: (새로 생성된 문서 수, 갱신된 문서 수, 변경이 없어 건너뛴 문서 수)
+
+        Raises:
+            Exception: 쓰기 오류가 아닌 오류 (네트워크 등). 체크포인트를 넘기지 않도록 파이프라인을 중단
         """
         if not batch_documents:
-            return 0
+            return 0, 0, 0
 
+        write_mode = write_mode or self.write_mode
         try:
-            # 배치 삽입
+            if write_mode == 'upsert':
+                return await self._upsert_batch(batch_documents)
+            if write_mode != 'insert':
+                raise ValueError(f'Unsupported write mode: {write_mode}')
             result = await self.target_repo.collection.insert_many(batch_documents, ordered=False)
-            return len(result.inserted_ids)
+            return len(result.inserted_ids), 0, 0
         except BulkWriteError as e:
-            # 일부 문서는 성공했을 수 있음
-            success_count = e.details.get('nInserted', 0)
-            logger.warning(f'Bulk write error: {success_count} documents inserted successfully')
-            return success_count
+            # unordered 이므로 실패한 문서 외에는 반영됨. insert 모드의 중복 키는 이전 (중단된) 실행에서 이미 옮긴 문서
+            created = e.details.get('nInserted', 0) + e.details.get('nUpserted', 0)
+            updated = e.details.get('nMatched', 0)
+            write_errors = e.details.get('writeErrors', [])
+            duplicates = sum(1 for error in write_errors if error.get('code') == DUPLICATE_KEY_ERROR) if write_mode == 'insert' else 0
+            if len(write_errors) > duplicates:
+                logger.warning(f'Bulk write error: {created} created, {updated} updated, {duplicates} already existed, {len(write_errors) - duplicates} failed')
+            return created, updated, duplicates
         except Exception as e:
             logger.error(f'Error processing batch: {e}')
-            return 0
+            raise
 
-    async def migrate_data(self, limit: int | None = None) -> dict[str, int]:
+    async def process_embedding_batch(self, embedding_documents: list[dict]) -> tuple[int, int, int]:
+        """shared 레이아웃의 상품 임베딩 문서 쓰기 (항상 upsert 모드)"""
+        if not embedding_documents:
+            return 0, 0, 0
+        return await self._upsert_batch(embedding_documents, self.target_repo.embedding_collection)
+
+    async def _upsert_batch(self, batch_documents: list[dict], collection: Collection | None = None) -> tuple[int, int, int]:
+        """content_hash 가 다른 (또는 없는) 문서만 ReplaceOne(upsert=True)"""
+        collection = collection if collection is not None else self.target_repo.collection
+        cursor = collection.find({'_id': {'$in': [doc['_id'] for doc in batch_documents]}}, projection={CONTENT_HASH_FIELD: 1})
+        existing_hashes = {doc['_id']: doc.get(CONTENT_HASH_FIELD) async for doc in cursor}
+        changed = [doc for doc in batch_documents if existing_hashes.get(doc['_id'], MISSING) != doc[CONTENT_HASH_FIELD]]
+        unchanged = len(batch_documents) - len(changed)
+        if not changed:
+            return 0, 0, unchanged
+
+        result = await collection.bulk_write([ReplaceOne({'_id': doc['_id']}, doc, upsert=True) for doc in changed], ordered=False)
+        return result.upserted_count, result.matched_count, unchanged
+
+    async def migrate_data(
+        self, limit: int | None = None, resume: bool = True, batch_size: int | None = None, concurrency: int | None = None, write_mode: str | None = None
+    ) -> dict[str, Any]:
         """
         데이터 마이그레이션 실행
 
+        reader(소스 커서, _id 오름차순) -> transform(SKU 문서 배치 생성) -> writer N 개(process_batch) 로 이어지는
+        파이프라인이며, 단계 사이의 큐 크기가 제한되어 있어 쓰기가 밀리면 읽기도 멈춥니다.
+        모든 이전 배치까지 쓰기가 끝난 소스 _id 를 체크포인트로 저장하므로, 중단된 실행은 resume=True 로 이어서 진행합니다.
+
         Args:
-            limit: 처리할 최대 문서 수 (None이면 모든 문서)
+            limit: 이번 실행에서 처리할 최대 상품 수 (None이면 모든 문서)
+            resume: 저장된 체크포인트 이후부터 진행할지 여부 (False 면 처음부터)
+            batch_size: insert_many 배치 크기 (기본값: MIGRATION_SETTINGS.BATCH_SIZE)
+            concurrency: 동시 writer 수 (기본값: MIGRATION_SETTINGS.WRITE_CONCURRENCY)
+            write_mode: 'insert' | 'upsert' (기본값: MIGRATION_SETTINGS.WRITE_MODE). upsert 면 재실행 시 바뀐 문서만 씀
 
         Returns:
-            Dict[str, int]: 마이그레이션 결과 통계
+            Dict[str, Any]: 마이그레이션 결과 통계
         """
-        logger.info('Starting data denormalization migration...')
+        batch_size = batch_size or self.batch_size
+        concurrency = concurrency or self.write_concurrency
+        write_mode = write_mode or self.write_mode
+
+        checkpoint = await self.checkpoint_store.load(MIGRATION_NAME) if resume else None
+        if checkpoint is not None and checkpoint.get('status') == 'completed':
+            checkpoint = None
+        resume_after = checkpoint.get('last_source_id') if checkpoint else None
+        logger.info(
+            f'Starting data denormalization migration (batch_size={batch_size}, concurrency={concurrency}, write_mode={write_mode}, resume_after={resume_after})'
+        )
 
-        try:
-            # 소스 컬렉션에서 모든 문서 조회
-            cursor = self.source_repo.collection.find({})
+        stats = {
+            'total_products_processed': 0,
+            'total_sku_documents_created': 0,
+            'total_sku_documents_updated': 0,
+            'total_skipped_existing': 0,
+            'total_product_embeddings_written': 0,
+            'total_errors': 0,
+        }
+        product_queue: asyncio.Queue[dict | None] = asyncio.Queue(maxsize=self.read_batch_size)
+        # (배치 번호, 배치의 마지막 소스 _id, SKU 문서, 상품 임베딩 문서(shared 레이아웃))
+        batch_queue: asyncio.Queue[tuple[int, Any, list[dict], list[dict]] | None] = asyncio.Queue(maxsize=self.queue_size)
+
+        # 배치는 순서와 다르게 끝날 수 있으므로 0..n 번 배치가 모두 끝난 경우에만 체크포인트를 전진
+        finished: dict[int, Any] = {}
+        next_seq = 0
+        checkpoint_lock = asyncio.Lock()
+
+        async def read() -> None:
+            query = {'_id': {'$gt': resume_after}} if resume_after is not None else {}
+            cursor = self.source_repo.collection.find(query).sort('_id', 1).batch_size(self.read_batch_size)
             if limit:
                 cursor = cursor.limit(limit)
-
-            batch_documents = []
-            total_processed = 0
-            total_created = 0
-            total_errors = 0
-
             async for product_doc in cursor:
+                await product_queue.put(product_doc)
+            await product_queue.put(None)
+
+        async def transform() -> None:
+            seq, batch, embedding_batch, last_source_id, last_emitted_id = 0, [], [], None, None
+            while (product_doc := await product_queue.get()) is not None:
                 try:
-                    # 상품 문서를 SKU 문서들로 변환
                     sku_documents = self.transform_product_to_sku_documents(product_doc)
-
                     if not sku_documents:
                         logger.warning(f'No SKU documents created for product {product_doc.get("_id")}')
-                        continue
-
-                    # 배치에 추가
-                    batch_documents.extend(sku_documents)
-
-                    # 배치 크기에 도달하면 처리
-                    if len(batch_documents) >= self.batch_size:
-                        created_count = await self.process_batch(batch_documents)
-                        total_created += created_count
-                        total_errors += len(batch_documents) - created_count
-                        batch_documents = []
-
-                    total_processed += 1
-
-                    # 진행 상황 로깅
-                    if total_processed % 100 == 0:
-                        logger.info(f'Processed {total_processed} products, created {total_created} SKU documents')
-
+                    if self.embedding_layout == 'shared' and sku_documents:
+                        embedding_batch.append(self.transform_product_to_embedding_document(product_doc, sku_documents))
                 except Exception as e:
                     logger.error(f'Error processing product {product_doc.get("_id")}: {e}')
-                    total_errors += 1
-                    continue
-
-            # 남은 배치 처리
-            if batch_documents:
-                created_count = await self.process_batch(batch_documents)
-                total_created += created_count
-                total_errors += len(batch_documents) - created_count
-
-            result_stats = {'total_products_processed': total_processed, 'total_sku_documents_created': total_created, 'total_errors': total_errors}
-
-            logger.info(f'Migration completed: {result_stats}')
-            return result_stats
-
-        except Exception as e:
-            logger.error(f'Migration failed: {e}')
-            raise
+                    stats['total_errors'] += 1
+                    sku_documents = []
+                batch.extend(sku_documents)
+                last_source_id = product_doc['_id']
+                stats['total_products_processed'] += 1
+
+                # 상품 경계에서만 배치를 나눠 체크포인트가 상품 단위로 정확하도록 함
+                if len(batch) >= batch_size:
+                    await batch_queue.put((seq, last_source_id, batch, embedding_batch))
+                    seq, batch, embedding_batch, last_emitted_id = seq + 1, [], [], last_source_id
+
+                if stats['total_products_processed'] % 1000 == 0:
+                    logger.info(f'Processed {stats["total_products_processed"]} products, created {stats["total_sku_documents_created"]} SKU documents')
+
+            # SKU 가 없는 상품만 남은 경우에도 체크포인트가 끝까지 전진하도록 빈 배치를 보냄
+            if last_source_id != last_emitted_id:
+                await batch_queue.put((seq, last_source_id, batch, embedding_batch))
+            for _ in range(concurrency):
+                await batch_queue.put(None)
+
+        async def commit(seq: int, last_source_id: Any) -> None:
+            nonlocal next_seq
+            async with checkpoint_lock:
+                finished[seq] = last_source_id
+                watermark = None
+                while next_seq in finished:
+                    watermark = finished.pop(next_seq)
+                    next_seq += 1
+                if watermark is not None:
+                    await self.checkpoint_store.save(MIGRATION_NAME, last_source_id=watermark, status='running')
+
+        async def write() -> None:
+            while (item := await batch_queue.get()) is not None:
+                seq, last_source_id, documents, embedding_documents = item
+                created, updated, skipped = await self.process_batch(documents, write_mode)
+                embeddings_created, embeddings_updated, _ = await self.process_embedding_batch(embedding_documents)
+                stats['total_product_embeddings_written'] += embeddings_created + embeddings_updated
+                stats['total_sku_documents_created'] += created
+                stats['total_sku_documents_updated'] += updated
+                stats['total_skipped_existing'] += skipped
+                stats['total_errors'] += len(documents) - created - updated - skipped
+                await commit(seq, last_source_id)
+
+        started = time.perf_counter()
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(read())
+                task_group.create_task(transform())
+                for _ in range(concurrency):
+                    task_group.create_task(write())
+        except ExceptionGroup as eg:
+            logger.error(f'Migration failed (resumable from checkpoint): {eg.exceptions[0]}')
+            raise eg.exceptions[0] from None
+
+        if limit is None or stats['total_products_processed'] < limit:
+            # 소스 끝까지 처리함
+            await self.checkpoint_store.save(MIGRATION_NAME, status='completed')
+        elapsed = time.perf_counter() - started
+        result_stats = {**stats, 'resumed_after': resume_after, 'elapsed_seconds': round(elapsed, 2)}
+        written = stats['total_sku_documents_created'] + stats['total_sku_documents_updated']
+        logger.info(f'Migration completed: {result_stats} ({written / max(elapsed, 1e-9):.0f} written docs/s)')
+
+        # SKU 컬렉션이 바뀌었으므로 캐시된 벡터 검색 결과 무효화
+        if self.search_cache is not None and (stats['total_sku_documents_created'] or stats['total_sku_documents_updated']):
+            await self.search_cache.invalidate()
+        return result_stats
 
     async def verify_migration(self, sample_size: int = 10) -> dict[str, Any]:
         """
-        마이그레이션 결과 검증
+        마이그레이션 결과 샘플 검증 (샘플의 모든 SKU 를 $in 한 번으로 확인)
 
         Args:
             sample_size: 검증할 샘플 크기
@@ -258,21 +425,15 @@ class DenormalizationService:
             async for doc in self.source_repo.collection.find({}).limit(sample_size):
                 sample_products.append(doc)
 
-            verification_results = {'source_collection_count': source_count, 'target_collection_count': target_count, 'sample_verification': []}
+            sample_sku_ids = [sku_id for product in sample_products for sku_id in product.get('product_skus', {}).get('sku_id', []) if sku_id]
+            found_ids = {doc['_id'] async for doc in self.target_repo.collection.find({'_id': {'$in': sample_sku_ids}}, projection={'_id': 1})}
 
+            verification_results = {'source_collection_count': source_count, 'target_collection_count': target_count, 'sample_verification': []}
             for product in sample_products:
-                product_id = product.get('_id')
                 sku_ids = product.get('product_skus', {}).get('sku_id', [])
-
-                # 각 SKU가 타겟 컬렉션에 존재하는지 확인
-                sku_verification = {'product_id': product_id, 'expected_sku_count': len(sku_ids), 'found_sku_documents': []}
-
-                for sku_id in sku_ids:
-                    sku_doc = await self.target_repo.collection.find_one({'_id': sku_id})
-                    if sku_doc:
-                        sku_verification['found_sku_documents'].append(sku_id)
-
-                verification_results['sample_verification'].append(sku_verification)
+                verification_results['sample_verification'].append(
+                    {'product_id': product.get('_id'), 'expected_sku_count': len(sku_ids), 'found_sku_documents': [sku_id for sku_id in sku_ids if sku_id in found_ids]}
+                )
 
             logger.info(f'Verification completed: {verification_results}')
             return verification_results
@@ -281,6 +442,103 @@ class DenormalizationService:
             logger.error(f'Verification failed: {e}')
             raise
 
+    async def verify_catalog(self, limit: int | None = None, batch_size: int | None = None) -> dict[str, Any]:
+        """
+        전체(또는 limit 개) 상품에 대한 마이그레이션 검증
+
+        소스 상품을 스트리밍하며 기대 SKU 문서를 만들고, batch_size 개씩 $in 으로 타겟 문서를 조회해
+        존재 여부와 VERIFY_HASH_FIELDS 의 해시를 비교합니다. 전체 검증(limit=None)이면 타겟 _id 를 한 번 더 스트리밍해
+        소스에 없는 SKU(extra)도 찾습니다.
+
+        Args:
+            limit: 검증할 최대 상품 수 (None 이면 전체, extra 검사 포함)
+            batch_size: $in 한 번에 조회할 SKU 수 (기본값: MIGRATION_SETTINGS.VERIFY_BATCH_SIZE)
+
+        Returns:
+            Dict[str, Any]: {'source_products', 'expected_skus', 'target_skus', 'missing', 'extra', 'stale', 'ok'}
+            missing / extra / stale 은 {'count': int, 'ids': [...]} (ids 는 VERIFY_REPORT_LIMIT 개까지)
+        """
+        batch_size = batch_size or self.migration_config.get('VERIFY_BATCH_SIZE')
+        hash_fields = self.migration_config.get('VERIFY_HASH_FIELDS')
+        report_limit = self.migration_config.get('VERIFY_REPORT_LIMIT')
+        logger.info(f'Verifying catalog (limit={limit}, batch_size={batch_size})')
+
+        diff: dict[str, list] = {'missing': [], 'extra': [], 'stale': []}
+        counts = {'missing': 0, 'extra': 0, 'stale': 0}
+        expected_ids: set[str] = set()
+        source_products = 0
+        semaphore = asyncio.Semaphore(self.write_concurrency)
+
+        def record(kind: str, ids: list[str]) -> None:
+            counts[kind] += len(ids)
+            diff[kind].extend(ids[: max(report_limit - len(diff[kind]), 0)])
+
+        async def check(expected: dict[str, str]) -> None:
+            async with semaphore:
+                cursor = self.target_repo.collection.find({'_id': {'$in': list(expected)}}, projection=dict.fromkeys(hash_fields, 1))
+                actual = {doc['_id']: field_hash(doc, hash_fields) async for doc in cursor}
+            record('missing', [sku_id for sku_id in expected if sku_id not in actual])
+            record('stale', [sku_id for sku_id, digest in expected.items() if sku_id in actual and actual[sku_id] != digest])
+
+        started = time.perf_counter()
+        async with asyncio.TaskGroup() as task_group:
+            expected: dict[str, str] = {}
+            cursor = self.source_repo.collection.find({}).sort('_id', 1).batch_size(self.read_batch_size)
+            if limit:
+                cursor = cursor.limit(limit)
+            async for product_doc in cursor:
+                source_products += 1
+                for sku_document in self.transform_product_to_sku_documents(product_doc):
+                    expected[sku_document['_id']] = field_hash(sku_document, hash_fields)
+                if len(expected) >= batch_size:
+                    expected_ids.update(expected)
+                    task_group.create_task(check(expected))
+                    expected = {}
+            if expected:
+                expected_ids.update(expected)
+                task_group.create_task(check(expected))
+
+        target_skus = None
+        if limit is None:
+            target_skus = 0
+            extra: list[str] = []
+            async for doc in self.target_repo.collection.find({}, projection={'_id': 1}).batch_size(self.read_batch_size):
+                target_skus += 1
+                if doc['_id'] not in expected_ids:
+                    extra.append(doc['_id'])
+            record('extra', extra)
+
+        report = {
+            'source_products': source_products,
+            'expected_skus': len(expected_ids),
+            'target_skus': target_skus,
+            **{kind: {'count': counts[kind], 'ids': diff[kind]} for kind in ('missing', 'extra', 'stale')},
+            'ok': not any(counts.values()),
+            'elapsed_seconds': round(time.perf_counter() - started, 2),
+        }
+        log = logger.info if report['ok'] else logger.warning
+        log(f'Catalog verification: {source_products} products, {len(expected_ids)} SKUs, missing={counts["missing"]}, extra={counts["extra"]}, stale={counts["stale"]}')
+        return report
+
+
+def content_hash(document: dict) -> str:
+    """_id / content_hash 를 제외한 문서 전체의 해시"""
+    return field_hash(document, sorted(field for field in document if field not in ('_id', CONTENT_HASH_FIELD)))
+
+
+def _set_path(document: dict, path: str, value: Any) -> None:
+    """점(.)으로 구분된 경로에 값을 설정 (중간 dict 는 생성)"""
+    *parents, leaf = path.split('.')
+    for key in parents:
+        document = document.setdefault(key, {})
+    document[leaf] = value
+
+
+def field_hash(document: dict, fields: list[str]) -> str:
+    """document 의 지정 필드 값으로 만든 안정적인 해시 (필드 / 키 순서와 무관)"""
+    content = {field: document.get(field) for field in fields}
+    return hashlib.sha1(json_util.dumps(content, sort_keys=True).encode()).hexdigest()
+
 
 async def main():
     """메인 실행 함수"""
@@ -296,22 +554,27 @@ async def main():
 
         # 결과 검증
         verification_results = await denormalization_service.verify_migration(sample_size=5)
+        catalog_report = await denormalization_service.verify_catalog(limit=10)
 
         print('\n=== Migration Results ===')
         print(f'Products processed: {migration_stats["total_products_processed"]}')
         print(f'SKU documents created: {migration_stats["total_sku_documents_created"]}')
+        print(f'SKU documents updated: {migration_stats["total_sku_documents_updated"]}')
+        print(f'Unchanged SKU documents skipped: {migration_stats["total_skipped_existing"]}')
         print(f'Errors: {migration_stats["total_errors"]}')
 
         print('\n=== Verification Results ===')
         print(f'Source collection count: {verification_results["source_collection_count"]}')
         print(f'Target collection count: {verification_results["target_collection_count"]}')
+        print(f'Catalog missing / extra / stale: {catalog_report["missing"]["count"]} / {catalog_report["extra"]["count"]} / {catalog_report["stale"]["count"]}')
 
     except Exception as e:
         logger.error(f'Migration process failed: {e}')
         raise
     finally:
-        # 연결 종료
+        # 연결 종료 (공유 클라이언트는 프로세스 종료 시 레지스트리에서 닫음)
         await denormalization_service.close()
+        await shutdown_mongo()
 
 
 if __name__ == '__main__':
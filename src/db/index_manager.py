@@ -70,6 +70,44 @@ class VectorIndexManager:
     def __init__(self, collection: Collection):
         self.collection: Collection = collection
 
+    @staticmethod
+    def build_vector_index_definition(
+        field_names: list[str] | str,
+        dimensions: int,
+        similarity: str = 'cosine',
+        quantization: str = 'none',
+        num_edge_candidates: int = 100,
+        filter_fields: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        벡터 인덱스 정의 생성 (vector 필드 + 사전 필터링에 사용할 filter 필드)
+
+        Args:
+            field_names (list[str] | str): 벡터 필드 경로
+            dimensions (int): 벡터 차원
+            similarity (str): 유사도 함수
+            quantization (str): 자동 양자화 ('none' / 'scalar' / 'binary')
+            num_edge_candidates (int): HNSW 구축 시 후보 수
+            filter_fields (list[str], optional): filter 로 선언할 필드 (VectorFilterCompiler 가 사용하는 필드)
+
+        Returns:
+            dict[str, Any]: 인덱스 정의
+        """
+        field_names = [field_names] if isinstance(field_names, str) else field_names
+        fields = [
+            {
+                'type': 'vector',
+                'path': field_name,
+                'numDimensions': dimensions,
+                'similarity': similarity,
+                'quantization': quantization.lower(),
+                'hnswOptions': {'numEdgeCandidates': num_edge_candidates},
+            }
+            for field_name in field_names
+        ]
+        fields.extend({'type': 'filter', 'path': path} for path in filter_fields or [])
+        return {'fields': fields}
+
     def create_vector_index(
         self,
         index_name: str,
@@ -78,20 +116,10 @@ class VectorIndexManager:
         similarity: str = 'cosine',
         quantization: str = 'None',
         num_edge_candidates: int = 100,
+        filter_fields: list[str] | None = None,
     ):
         search_index_model = SearchIndexModel(
-            definition={
-                'fields': [
-                    {
-                        'type': 'vector',
-                        'path': 'plot_embedding',
-                        'numDimensions': 1536,
-                        'similarity': 'cosine',
-                        'quantization': 'none',
-                        'hnswOptions': {'numEdgeCandidates': 100},
-                    }
-                ]
-            },
+            definition=self.build_vector_index_definition(field_names, dimensions, similarity, quantization, num_edge_candidates, filter_fields),
             name=index_name,
             type='vectorSearch',
         )
@@ -0,0 +1,136 @@
+"""
+필터 선택도와 목표 recall 에 따라 $vectorSearch numCandidates 를 정하는 컨트롤러
+
+numCandidates = limit * m(recall_target) / sqrt(selectivity)
+- m(r) = 1 + RECALL_COEFFICIENT * ln(1 / (1 - r))  (r=0.90 -> ~10배, r=0.95 -> ~13배, r=0.99 -> ~19배)
+- selectivity = 필터 통과 문서 수 / 전체 문서 수 (필터별 count 를 TTL 동안 최대 MAX_ESTIMATES 개 LRU 캐싱)
+- 추정치 갱신은 schedule_refresh 로 백그라운드에서 실행하므로 요청은 count 를 기다리지 않음 (추정치가 없으면 선택도 1.0)
+- 필터 통과 문서 수가 EXACT_THRESHOLD 이하이면 ANN 대신 exact(ENN) 검색이 더 싸고 정확하므로 exact 로 전환
+선택한 값과 관측 지연시간은 로그로 남겨 exact 기준값과 비교해 오프라인 튜닝에 사용합니다.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Any
+
+from loguru import logger
+
+from db.config.config import Config
+from db.vector.base import filter_cache_key
+
+
+class AdaptiveNumCandidates:
+    """필터별 카디널리티 추정치 기반 numCandidates 선택기"""
+
+    def __init__(self, recall_target: float | None = None):
+        """
+        Args:
+            recall_target (float, optional): 목표 recall (0~1). 기본값은 NUM_CANDIDATES_SETTINGS.RECALL_TARGET
+        """
+        settings = Config().get_num_candidates_config()
+        self.recall_target = recall_target if recall_target is not None else settings.get('RECALL_TARGET')
+        if not 0 < self.recall_target < 1:
+            raise ValueError(f'recall_target 은 0 과 1 사이여야 합니다. : {self.recall_target}')
+        self.recall_coefficient = settings.get('RECALL_COEFFICIENT')
+        self.max_candidates = settings.get('MAX_CANDIDATES')
+        self.exact_threshold = settings.get('EXACT_THRESHOLD')
+        self.estimate_ttl = settings.get('ESTIMATE_TTL_SECONDS')
+        self.max_estimates = settings.get('MAX_ESTIMATES')
+
+        self._total: tuple[int, float] | None = None
+        self._estimates: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        # 진행 중인 백그라운드 갱신 (같은 필터의 중복 count 방지, 태스크 참조 유지)
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    def _fresh(self, entry: tuple[int, float] | None) -> bool:
+        return entry is not None and time.monotonic() - entry[1] < self.estimate_ttl
+
+    def _estimate(self, filter_expr: dict) -> tuple[int, float] | None:
+        key = filter_cache_key(filter_expr)
+        estimate = self._estimates.get(key)
+        if estimate is not None:
+            self._estimates.move_to_end(key)
+        return estimate
+
+    async def refresh(self, collection: Any, filter_expr: dict | None) -> None:
+        """만료된 전체 / 필터별 문서 수 추정치를 갱신합니다."""
+        if not self._fresh(self._total):
+            self._total = (await collection.estimated_document_count(), time.monotonic())
+        if filter_expr:
+            key = filter_cache_key(filter_expr)
+            if not self._fresh(self._estimates.get(key)):
+                self._estimates[key] = (await collection.count_documents(filter_expr), time.monotonic())
+                self._estimates.move_to_end(key)
+                while len(self._estimates) > self.max_estimates:
+                    self._estimates.popitem(last=False)
+
+    def schedule_refresh(self, collection: Any, filter_expr: dict | None) -> asyncio.Task | None:
+        """
+        추정치가 없거나 만료된 경우 refresh 를 백그라운드 태스크로 실행합니다. (요청 경로에서 count 를 기다리지 않음)
+
+        Returns:
+            asyncio.Task | None: 새로 시작했거나 진행 중인 갱신 태스크. 갱신이 필요 없으면 None
+        """
+        key = filter_cache_key(filter_expr)
+        if self._fresh(self._total) and (not filter_expr or self._fresh(self._estimates.get(key))):
+            return None
+        task = self._refreshing.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh_in_background(key, collection, filter_expr))
+            self._refreshing[key] = task
+        return task
+
+    async def _refresh_in_background(self, key: str, collection: Any, filter_expr: dict | None) -> None:
+        try:
+            await self.refresh(collection, filter_expr)
+        except Exception as e:
+            logger.warning(f'[num_candidates] estimate refresh failed for filter={key}: {e}')
+        finally:
+            self._refreshing.pop(key, None)
+
+    def selectivity(self, filter_expr: dict | None) -> float:
+        """필터 선택도 (추정치가 없으면 1.0)"""
+        if not filter_expr or not self._total or not self._total[0]:
+            return 1.0
+        estimate = self._estimate(filter_expr)
+        if estimate is None:
+            return 1.0
+        return max(estimate[0], 1) / self._total[0]
+
+    def matching_count(self, filter_expr: dict | None) -> int | None:
+        """필터 통과 문서 수 추정치"""
+        if not filter_expr:
+            return self._total[0] if self._total else None
+        estimate = self._estimate(filter_expr)
+        return estimate[0] if estimate else None
+
+    def choose(self, limit: int, filter_expr: dict | None = None) -> tuple[int, bool]:
+        """
+        numCandidates 와 exact 전환 여부를 결정합니다. (캐시된 추정치만 사용하는 동기 함수)
+
+        Args:
+            limit (int): 결과 개수
+            filter_expr (dict, optional): $vectorSearch.filter 표현식
+
+        Returns:
+            tuple[int, bool]: (numCandidates, exact 사용 여부)
+        """
+        matching = self.matching_count(filter_expr)
+        if filter_expr and matching is not None and matching <= self.exact_threshold:
+            return limit, True
+
+        multiplier = 1 + self.recall_coefficient * math.log(1 / (1 - self.recall_target))
+        num_candidates = math.ceil(limit * multiplier / math.sqrt(self.selectivity(filter_expr)))
+        if matching is not None:
+            num_candidates = min(num_candidates, max(matching, limit))
+        return max(limit, min(num_candidates, self.max_candidates)), False
+
+    def observe(self, limit: int, filter_expr: dict | None, num_candidates: int, exact: bool, latency_ms: float, result_count: int) -> None:
+        """선택한 numCandidates 와 관측 지연시간 기록 (오프라인 튜닝용)"""
+        logger.info(
+            f'[num_candidates] limit={limit} num_candidates={num_candidates} exact={exact} '
+            f'selectivity={self.selectivity(filter_expr):.4f} recall_target={self.recall_target} '
+            f'latency_ms={latency_ms:.1f} results={result_count} filter={filter_cache_key(filter_expr)}'
+        )
@@ -1,6 +1,7 @@
-from collections.abc import Callable
-
 from db.config.config import Config
+from db.query_builders.candidate_controller import AdaptiveNumCandidates
+from db.query_builders.filter_compiler import VectorFilterCompiler, VectorFilterSpec
+from db.query_builders.projections import get_projection
 
 """
 원하는 데이터를 가져오기 위해서 mongodb 쿼리로 변환
@@ -15,6 +16,10 @@ class FashionQueryBuilder:
     def __init__(self):
         self.config = Config()
         self.vector_search_config = self.config.get_vector_search_config()
+        self.hybrid_search_config = self.config.get_hybrid_search_config()
+        self.filter_compiler = VectorFilterCompiler()
+        self.num_candidates_config = self.config.get_num_candidates_config()
+        self.candidate_controller = AdaptiveNumCandidates()
 
     # def caption_status_filter(self , caption_status: str="COMPLETED") -> dict:
     #     return {"caption_info.caption_status": caption_status}
@@ -27,26 +32,32 @@ class FashionQueryBuilder:
             )
         return {'data_status': data_status}
 
-    # TODO : 벡터 검색 효율성 및 정확성을 위한 사전 필터링 인자 추가
     def vector_search_pipeline(
         self,
         embedding: list[float],
         limit: int | None,
-        pre_filter: dict | None = None,
-        num_candidates: int | None = None,
+        pre_filter: VectorFilterSpec | dict | None = None,
+        num_candidates: int | str | None = None,
         index_name: str | None = None,
         embedding_field_path: str | None = None,
+        exact: bool = False,
+        profile: str | None = None,
+        dimensions: int | None = None,
     ) -> list[dict]:
         """
         Vector Search 파이프라인 생성
 
         Args:
             embedding list[float]]): 사용자 쿼리에 대한 임베딩 벡터
-            pre_filter (Optional[Dict], optional): 사전 필터링 조건. Defaults to None.
-            num_candidates (int, optional): 후보 개수. Defaults to 100.
+            pre_filter (VectorFilterSpec | Dict, optional): 사전 필터링 조건. Defaults to None.
+            num_candidates (int | str, optional): 후보 개수. 'auto' 이거나 None 이면서 NUM_CANDIDATES_SETTINGS.MODE 가 'adaptive' 이면
+                필터 선택도와 목표 recall 로 결정 (통과 문서가 적으면 exact 로 전환). Defaults to 100.
             index_name (str, optional): 인덱스 이름. Defaults to None.
             embedding_field_path (str, optional): 임베딩 필드 경로. Defaults to None.
             limit (int, optional): 결과 개수. Defaults to 10.
+            exact (bool, optional): True 면 ENN(exact) 검색. numCandidates 는 사용하지 않음. Defaults to False.
+            profile (str, optional): 프로젝션 프로필 이름. Defaults to DEFAULT_PROJECTION_PROFILE.
+            dimensions (int, optional): 쿼리 벡터 차원 (축소 차원 인덱스 검색 시). Defaults to EMBEDDING_DIMENSIONS.
 
         Returns:
             List[Dict]: 검색 결과(유사도 점수 높은 순)
@@ -55,54 +66,253 @@ class FashionQueryBuilder:
         # 기본 설정값 설정
         index_name = index_name or self.vector_search_config.get('DEFAULT_VECTOR_INDEX')
         embedding_field_path = embedding_field_path or self.vector_search_config.get('EMBEDDING_FIELD_PATH')
+        self.validate_embedding(embedding, dimensions)
+        vector_filter = self.vector_search_filter(pre_filter)
+
+        if num_candidates == 'auto' or (num_candidates is None and self.num_candidates_config.get('MODE') == 'adaptive'):
+            num_candidates, auto_exact = self.candidate_controller.choose(limit, vector_filter)
+            exact = exact or auto_exact
         num_candidates = num_candidates or self.vector_search_config.get('DEFAULT_NUM_CANDIDATES')
-        if len(embedding) != self.vector_search_config.get('EMBEDDING_DIMENSIONS'):
-            raise ValueError(
-                f'embedding 의 차원이 올바르지 않습니다. : {len(embedding)} \
-                             \n 허용된 차원 : {self.vector_search_config.get("EMBEDDING_DIMENSIONS")}'
-            )
 
         pipeline = []
 
         vector_search_stage = {
             'index': index_name,
             'queryVector': embedding,
-            'exact': False,
+            'exact': exact,
             'path': embedding_field_path,
-            'numCandidates': num_candidates,
             'limit': limit,
         }
-        # TODO: 지금은 main_category 만 필터링 하고 있는데 추후 필터링 조건 추가가능(sub_category인 경우에는 실제 db에는 숫자로 저장하고 있어서 변환과정 필요)
-        # if pre_filter:
-        #     main_category = pre_filter.get("main_category")
-        #     main_category = "TOP" if main_category == "상의" else "BOTTOM"
-        #     vector_search_stage["filter"] = {
-        #         "product_skus.main_category": main_category,
-        #     }
-        if pre_filter:
-            main_category = pre_filter.get('main_category')
-            color_name = pre_filter.get('color')
-            main_category = 'TOP' if main_category == '상의' else 'BOTTOM'
-            if color_name:
-                vector_search_stage['filter'] = {'product_skus.main_category': main_category, 'product_skus.color_name': color_name}
-            else:
-                vector_search_stage['filter'] = {'product_skus.main_category': main_category}
+        if not exact:
+            vector_search_stage['numCandidates'] = num_candidates
+        if vector_filter:
+            vector_search_stage['filter'] = vector_filter
 
         pipeline.append({'$vectorSearch': vector_search_stage})
 
-        # 기본 프로젝션값 설정
-        project = {'$project': self.vector_search_config.get('DEFAULT_PROJECT_FIELDS')}
-        # 유사도 점수 추가
-        project['$project']['score'] = {'$meta': 'vectorSearchScore'}
-        pipeline.append(project)
+        # 프로젝션 프로필 + 유사도 점수
+        pipeline.append(self._result_projection('vectorSearchScore', profile))
+        return pipeline
+
+    def collapsed_vector_search_pipeline(
+        self,
+        embedding: list[float],
+        candidate_limit: int,
+        product_limit: int,
+        pre_filter: VectorFilterSpec | dict | None = None,
+        profile: str | None = None,
+        include_vector: bool = False,
+    ) -> list[dict]:
+        """
+        SKU 후보를 상품(products.product_id) 단위로 묶어 상품당 최고 점수 SKU 만 반환하는 파이프라인
+
+        Args:
+            embedding (list[float]): 쿼리 임베딩
+            candidate_limit (int): $vectorSearch 로 가져올 SKU 후보 수 (oversampling 반영)
+            product_limit (int): 반환할 상품 수
+            pre_filter (VectorFilterSpec | Dict, optional): 사전 필터링 조건
+            profile (str, optional): 프로젝션 프로필 이름
+            include_vector (bool): MMR 계산을 위해 임베딩 필드를 함께 반환
+
+        Returns:
+            List[Dict]: 각 결과에 상품별 SKU 히트 수(sku_hits) 포함
+        """
+        product_key = self.config.get_diversify_config().get('PRODUCT_KEY_PATH')
+        pipeline = self.vector_search_pipeline(embedding=embedding, limit=candidate_limit, pre_filter=pre_filter, profile=profile)
+        pipeline[-1]['$project'][product_key] = 1
+        if include_vector:
+            pipeline[-1]['$project'][self.vector_search_config.get('EMBEDDING_FIELD_PATH')] = 1
+        pipeline.extend(
+            [
+                {
+                    '$group': {
+                        '_id': f'${product_key}',
+                        'doc': {'$top': {'sortBy': {'score': -1}, 'output': '$$ROOT'}},
+                        'sku_hits': {'$sum': 1},
+                    }
+                },
+                {'$replaceRoot': {'newRoot': {'$mergeObjects': ['$doc', {'sku_hits': '$sku_hits'}]}}},
+                {'$sort': {'score': -1}},
+                {'$limit': product_limit},
+            ]
+        )
+        return pipeline
+
+    def shared_embedding_vector_search_pipeline(
+        self,
+        embedding: list[float],
+        limit: int,
+        sku_collection: str,
+        pre_filter: VectorFilterSpec | dict | None = None,
+        num_candidates: int | str | None = None,
+        exact: bool = False,
+        profile: str | None = None,
+    ) -> list[dict]:
+        """
+        공유 임베딩 레이아웃(SHARED_EMBEDDING_SETTINGS.LAYOUT='shared') 의 벡터 검색 파이프라인
+
+        상품 임베딩 컬렉션에서 $vectorSearch 로 상품을 찾고, SKU 컬렉션을 source_product_id 로 $lookup 하여
+        사전 필터를 SKU 단위로 다시 적용합니다. 결과는 embedded 레이아웃과 같은 SKU 문서(프로젝션 + score) 입니다.
+
+        상품 임베딩 문서의 필터 필드는 SKU 값의 합집합이므로, 범위 조건이나 서로 다른 SKU 가 각각 만족하는 필드 간 AND 조건은
+        조건을 모두 만족하는 SKU 가 없는 상품도 통과시킵니다. 그래서 필터가 있으면 상품을 limit * PRODUCT_OVERSAMPLE 개 가져와
+        SKU 단계에서 걸러진 뒤 $limit 으로 자릅니다. 통과 SKU 가 없는 상품이 그보다 많으면 limit 개보다 적게 반환될 수 있습니다.
+
+        Args:
+            embedding (list[float]): 쿼리 임베딩
+            limit (int): 반환할 SKU 수
+            sku_collection (str): $lookup 대상 SKU 컬렉션 이름
+            pre_filter (VectorFilterSpec | Dict, optional): 사전 필터링 조건 (상품 단계 / SKU 단계에 동일하게 적용)
+            num_candidates (int | str, optional): vector_search_pipeline 과 동일
+            exact (bool): True 면 ENN(exact) 검색
+            profile (str, optional): SKU 문서 프로젝션 프로필 이름
+
+        Returns:
+            List[Dict]: 유사도 점수 높은 순의 SKU 문서 파이프라인
+        """
+        shared_config = self.config.get_shared_embedding_config()
+        product_limit = limit * shared_config.get('PRODUCT_OVERSAMPLE') if self.vector_search_filter(pre_filter) else limit
+        pipeline = self.vector_search_pipeline(
+            embedding=embedding,
+            limit=product_limit,
+            pre_filter=pre_filter,
+            num_candidates=num_candidates,
+            index_name=shared_config.get('VECTOR_INDEX'),
+            exact=exact,
+            profile='ids_only',
+        )
+        vector_filter = pipeline[0]['$vectorSearch'].get('filter')
+        sku_pipeline = [{'$match': vector_filter}] if vector_filter else []
+        sku_pipeline.append({'$project': self.projection(profile)})
+        pipeline.extend(
+            [
+                {'$lookup': {'from': sku_collection, 'localField': '_id', 'foreignField': 'source_product_id', 'pipeline': sku_pipeline, 'as': 'sku'}},
+                {'$unwind': '$sku'},
+                {'$replaceRoot': {'newRoot': {'$mergeObjects': ['$sku', {'score': '$score'}]}}},
+                {'$limit': limit},
+            ]
+        )
         return pipeline
 
+    def validate_embedding(self, embedding: list[float], dimensions: int | None = None) -> None:
+        """임베딩 차원 검증"""
+        dimensions = dimensions or self.vector_search_config.get('EMBEDDING_DIMENSIONS')
+        if len(embedding) != dimensions:
+            raise ValueError(
+                f'embedding 의 차원이 올바르지 않습니다. : {len(embedding)} \
+                             \n 허용된 차원 : {dimensions}'
+            )
+
+    def vector_search_filter(self, pre_filter: VectorFilterSpec | dict | None) -> dict | None:
+        """
+        사전 필터링 조건을 $vectorSearch.filter 표현식으로 변환 (VectorFilterCompiler)
+        Atlas 파이프라인과 로컬 벡터 엔진이 동일한 필터 표현식을 사용합니다.
+
+        Args:
+            pre_filter (VectorFilterSpec | Dict | None): 사전 필터링 조건
+
+        Returns:
+            Optional[Dict]: $vectorSearch.filter 표현식. 조건이 없으면 None
+        """
+        return self.filter_compiler.compile(pre_filter)
+
+    def projection(self, profile: str | None = None) -> dict:
+        """프로젝션 프로필의 사본 (profile 이 None 이면 DEFAULT_PROJECTION_PROFILE)"""
+        return get_projection(profile or self.vector_search_config.get('DEFAULT_PROJECTION_PROFILE'))
+
+    def _result_projection(self, score_meta: str, profile: str | None = None) -> dict:
+        """프로젝션 프로필 + 지정한 메타 점수 필드"""
+        return {'$project': {**self.projection(profile), 'score': {'$meta': score_meta}}}
+
+    def text_search_filter(self, pre_filter: VectorFilterSpec | dict | None) -> list[dict]:
+        """사전 필터링 조건을 $search compound.filter 연산자(equals / in / range) 리스트로 변환"""
+        vector_filter = self.vector_search_filter(pre_filter) or {}
+        operators = []
+        for path, condition in vector_filter.items():
+            if not isinstance(condition, dict):
+                operators.append({'equals': {'path': path, 'value': condition}})
+            elif '$in' in condition:
+                operators.append({'in': {'path': path, 'value': condition['$in']}})
+            else:
+                operators.append({'range': {'path': path, **{op.lstrip('$'): value for op, value in condition.items()}}})
+        return operators
+
+    def text_search_stages(self, user_query: str, limit: int, pre_filter: dict | None = None, index_name: str | None = None) -> list[dict]:
+        """Atlas Search($search) 어휘 검색 단계 (브랜드명, 상품 코드 등 정확한 단어 매칭)"""
+        search_stage = {
+            'index': index_name or self.hybrid_search_config.get('TEXT_SEARCH_INDEX'),
+            'compound': {
+                'must': [{'text': {'query': user_query, 'path': self.hybrid_search_config.get('TEXT_SEARCH_PATHS')}}],
+            },
+        }
+        search_filter = self.text_search_filter(pre_filter)
+        if search_filter:
+            search_stage['compound']['filter'] = search_filter
+        return [{'$search': search_stage}, {'$limit': limit}]
+
+    def text_search_pipeline(self, user_query: str, limit: int, pre_filter: dict | None = None, index_name: str | None = None) -> list[dict]:
+        """
+        어휘 검색 파이프라인 생성
+
+        Args:
+            user_query (str): 사용자 쿼리
+            limit (int): 결과 개수
+            pre_filter (Optional[Dict], optional): 사전 필터링 조건. Defaults to None.
+            index_name (str, optional): Atlas Search 인덱스 이름. Defaults to None.
+
+        Returns:
+            List[Dict]: 검색 결과(searchScore 높은 순)
+        """
+        return [*self.text_search_stages(user_query, limit, pre_filter, index_name), self._result_projection('searchScore')]
+
     def hybrid_search_pipeline(
         self,
         user_query: str,
-        embedding_factory: Callable[[str], list[float]],
-        num_candidates: int = 100,
-        index_name: str = None,
-        embedding_field_path: str = None,
+        embedding: list[float],
         limit: int = 10,
-    ) -> list[dict]: ...
+        pre_filter: dict | None = None,
+        num_candidates: int | None = None,
+        candidate_limit: int | None = None,
+        vector_weight: float | None = None,
+        text_weight: float | None = None,
+    ) -> list[dict]:
+        """
+        $rankFusion (reciprocal rank fusion) 을 사용한 서버 측 하이브리드 검색 파이프라인 생성
+        어휘 검색 결과가 함께 순위에 반영되므로 정확한 단어 매칭을 위해 numCandidates 를 크게 잡을 필요가 없습니다.
+
+        Args:
+            user_query (str): 사용자 쿼리 (어휘 검색)
+            embedding (list[float]): 사용자 쿼리 임베딩 (벡터 검색)
+            limit (int, optional): 결과 개수. Defaults to 10.
+            pre_filter (Optional[Dict], optional): 사전 필터링 조건. Defaults to None.
+            num_candidates (int, optional): 벡터 검색 후보 개수. Defaults to HYBRID NUM_CANDIDATES.
+            candidate_limit (int, optional): 각 검색 단계에서 융합에 넘길 결과 개수. Defaults to HYBRID CANDIDATE_LIMIT.
+            vector_weight (float, optional): 벡터 검색 가중치
+            text_weight (float, optional): 어휘 검색 가중치
+
+        Returns:
+            List[Dict]: 검색 결과(RRF 점수 높은 순)
+        """
+        candidate_limit = max(candidate_limit or self.hybrid_search_config.get('CANDIDATE_LIMIT'), limit)
+        vector_stages = self.vector_search_pipeline(
+            embedding=embedding,
+            limit=candidate_limit,
+            pre_filter=pre_filter,
+            num_candidates=num_candidates or self.hybrid_search_config.get('NUM_CANDIDATES'),
+        )[:1]  # $vectorSearch 단계만 사용 ($rankFusion 입력 파이프라인에는 $project 불가)
+
+        rank_fusion_stage = {
+            'input': {
+                'pipelines': {
+                    'vector': vector_stages,
+                    'text': self.text_search_stages(user_query, candidate_limit, pre_filter),
+                }
+            },
+            'combination': {
+                'weights': {
+                    'vector': vector_weight if vector_weight is not None else self.hybrid_search_config.get('VECTOR_WEIGHT'),
+                    'text': text_weight if text_weight is not None else self.hybrid_search_config.get('TEXT_WEIGHT'),
+                }
+            },
+        }
+        return [{'$rankFusion': rank_fusion_stage}, {'$limit': limit}, self._result_projection('score')]
@@ -0,0 +1,170 @@
+"""
+벡터 검색 사전 필터 컴파일러
+
+타입이 지정된 필터 스펙(VectorFilterSpec)을 Atlas $vectorSearch.filter 표현식으로 변환합니다.
+- 카테고리 / 서브 카테고리 코드 변환 (sub_category 는 DB 에 숫자 코드로 저장)
+- 성별, 핏, 가격 범위, 태그 $in, 색상 계열 확장
+- 벡터 인덱스에 filter 로 선언된 필드만 사용하도록 검증 (선언되지 않은 필드는 Atlas 에서 오류)
+"""
+
+from typing import Any
+
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from db.config.config import Config
+
+
+class VectorFilterSpec(BaseModel):
+    """벡터 검색 사전 필터 스펙 (모든 조건은 AND 로 결합, 리스트 값은 OR)"""
+
+    model_config = ConfigDict(extra='forbid', populate_by_name=True)
+
+    main_category: str | None = Field(default=None, description='대분류 (상의/하의 또는 TOP/BOTTOM)')
+    sub_category: str | int | list[str | int] | None = Field(default=None, description='서브 카테고리 이름 또는 코드')
+    gender: str | list[str] | None = Field(default=None, description='성별')
+    fit: str | list[str] | None = Field(default=None, description='핏')
+    color: str | list[str] | None = Field(default=None, description='색상 이름 (정확히 일치)')
+    color_family: str | list[str] | None = Field(default=None, description='색상 계열 (계열에 속한 색상 이름으로 확장)')
+    style_tags: list[str] | None = Field(default=None, description='스타일 태그 (하나라도 포함)')
+    tpo_tags: list[str] | None = Field(default=None, description='TPO 태그 (하나라도 포함)')
+    min_price: int | None = Field(default=None, ge=0, description='최소 판매가')
+    max_price: int | None = Field(default=None, ge=0, description='최대 판매가')
+
+    @model_validator(mode='after')
+    def _check_price_range(self) -> 'VectorFilterSpec':
+        if self.min_price is not None and self.max_price is not None and self.min_price > self.max_price:
+            raise ValueError(f'min_price({self.min_price}) 가 max_price({self.max_price}) 보다 큽니다.')
+        return self
+
+
+def _as_list(value: Any) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def _eq_or_in(values: list) -> Any:
+    """값이 하나면 등호, 여러 개면 $in"""
+    values = list(dict.fromkeys(values))
+    return values[0] if len(values) == 1 else {'$in': values}
+
+
+class VectorFilterCompiler:
+    """VectorFilterSpec -> $vectorSearch.filter 표현식 변환기"""
+
+    def __init__(self, declared_fields: list[str] | None = None):
+        """
+        Args:
+            declared_fields (list[str], optional): 벡터 인덱스에 filter 로 선언된 필드.
+                기본값은 VECTOR_SEARCH_SETTINGS.FILTER_FIELDS
+        """
+        self.config = Config()
+        vector_search_config = self.config.get_vector_search_config()
+        filter_config = self.config.get_filter_compiler_config()
+        self.declared_fields = set(declared_fields if declared_fields is not None else vector_search_config.get('FILTER_FIELDS'))
+        self.field_paths: dict[str, str] = filter_config.get('FIELD_PATHS')
+        self.main_category_codes: dict[str, str] = filter_config.get('MAIN_CATEGORY_CODES')
+        self.sub_category_codes: dict[str, int] = dict(filter_config.get('SUB_CATEGORY_CODES'))
+        self.color_families: dict[str, list[str]] = {family: list(members) for family, members in filter_config.get('COLOR_FAMILIES').items()}
+        # 카탈로그에 존재하는 서브 카테고리 코드 (set_vocabulary 전에는 검증하지 않음)
+        self.catalog_sub_category_codes: set[int] | None = None
+
+    def set_declared_fields(self, declared_fields: list[str]) -> None:
+        """실제 벡터 인덱스 정의에서 읽은 filter 필드로 검증 대상을 교체"""
+        self.declared_fields = set(declared_fields)
+
+    def set_vocabulary(self, sub_category_codes: list[int], color_names: list[str]) -> None:
+        """
+        카탈로그의 distinct 값으로 서브 카테고리 코드표와 색상 계열을 실제 존재하는 값만 남도록 제한합니다.
+
+        Args:
+            sub_category_codes (list[int]): 카탈로그의 서브 카테고리 코드
+            color_names (list[str]): 카탈로그의 색상 이름
+        """
+        self.catalog_sub_category_codes = {code for code in sub_category_codes if isinstance(code, int)}
+        unknown_codes = {name: code for name, code in self.sub_category_codes.items() if code not in self.catalog_sub_category_codes}
+        self.sub_category_codes = {name: code for name, code in self.sub_category_codes.items() if code in self.catalog_sub_category_codes}
+
+        catalog_colors = set(color_names)
+        color_families = {family: [color for color in members if color in catalog_colors] for family, members in self.color_families.items()}
+        unknown_colors = sorted({color for members in self.color_families.values() for color in members} - catalog_colors)
+        self.color_families = {family: members for family, members in color_families.items() if members}
+        if unknown_codes or unknown_colors:
+            logger.warning(f'Filter vocabulary entries not found in catalog (dropped): sub_category={unknown_codes}, colors={unknown_colors}')
+
+    def _main_category(self, value: str) -> str:
+        code = self.main_category_codes.get(value)
+        if code is None:
+            # 기존 동작 유지: 상의가 아닌 값은 하의(BOTTOM) 로 간주
+            logger.warning(f'Unknown main_category {value!r}, falling back to BOTTOM (allowed: {list(self.main_category_codes)})')
+            return 'BOTTOM'
+        return code
+
+    def _sub_category(self, value: str | int) -> int:
+        if isinstance(value, int) or value.isdigit():
+            code = int(value)
+            if self.catalog_sub_category_codes is not None and code not in self.catalog_sub_category_codes:
+                raise ValueError(f'sub_category 코드가 카탈로그에 없습니다. : {code} \n 허용된 코드 : {sorted(self.catalog_sub_category_codes)}')
+            return code
+        code = self.sub_category_codes.get(value)
+        if code is None:
+            raise ValueError(f'sub_category 의 값이 올바르지 않습니다. : {value} \n 허용된 값 : {list(self.sub_category_codes)}')
+        return code
+
+    def _colors(self, spec: VectorFilterSpec) -> list[str]:
+        colors = _as_list(spec.color) if spec.color else []
+        for family in _as_list(spec.color_family) if spec.color_family else []:
+            members = self.color_families.get(family)
+            if members is None:
+                raise ValueError(f'color_family 의 값이 올바르지 않습니다. : {family} \n 허용된 값 : {list(self.color_families)}')
+            colors.extend(members)
+        return colors
+
+    def compile(self, pre_filter: VectorFilterSpec | dict | None) -> dict | None:
+        """
+        필터 스펙을 $vectorSearch.filter 표현식으로 변환합니다.
+
+        Args:
+            pre_filter (VectorFilterSpec | dict | None): 필터 스펙 (dict 는 VectorFilterSpec 으로 검증)
+
+        Returns:
+            Optional[dict]: 필드 경로별 조건. 조건이 없으면 None
+
+        Raises:
+            ValueError: 알 수 없는 값(main_category 는 제외, BOTTOM 으로 대체)이거나 인덱스에 선언되지 않은 필드를 사용하는 경우
+        """
+        if not pre_filter:
+            return None
+        spec = pre_filter if isinstance(pre_filter, VectorFilterSpec) else VectorFilterSpec.model_validate(pre_filter)
+
+        conditions: dict[str, Any] = {}
+        if spec.main_category:
+            conditions['main_category'] = self._main_category(spec.main_category)
+        if spec.sub_category is not None:
+            conditions['sub_category'] = _eq_or_in([self._sub_category(v) for v in _as_list(spec.sub_category)])
+        if spec.gender:
+            conditions['gender'] = _eq_or_in(_as_list(spec.gender))
+        if spec.fit:
+            conditions['fit'] = _eq_or_in(_as_list(spec.fit))
+        colors = self._colors(spec)
+        if colors:
+            conditions['color'] = _eq_or_in(colors)
+        if spec.style_tags:
+            conditions['style_tags'] = {'$in': spec.style_tags}
+        if spec.tpo_tags:
+            conditions['tpo_tags'] = {'$in': spec.tpo_tags}
+        price_range = {}
+        if spec.min_price is not None:
+            price_range['$gte'] = spec.min_price
+        if spec.max_price is not None:
+            price_range['$lte'] = spec.max_price
+        if price_range:
+            conditions['price'] = price_range
+
+        if not conditions:
+            return None
+
+        vector_filter = {self.field_paths[name]: condition for name, condition in conditions.items()}
+        undeclared = [path for path in vector_filter if path not in self.declared_fields]
+        if undeclared:
+            raise ValueError(f'벡터 인덱스에 filter 로 선언되지 않은 필드입니다. : {undeclared} \n 선언된 필드 : {sorted(self.declared_fields)}')
+        return vector_filter
@@ -0,0 +1,145 @@
+"""
+이름이 붙은 불변(immutable) 프로젝션 프로필
+
+repository 조회(vector_search / find_by_id / find_all)는 필요한 필드만 가져오도록 프로필 이름으로 프로젝션을 선택합니다.
+- ids_only : _id 만 (후속 조회 / 중복 제거용)
+- rerank   : 캡션 + 카테고리 (에이전트 재정렬 / 응답 생성용, 기존 DEFAULT_PROJECT_FIELDS)
+- card     : 상품 카드 표시용 (이름, 브랜드, 가격, 대표 이미지, 색상)
+- detail   : 상세 화면용 (card + 캡션, 상세 정보, 태그)
+프로필은 MappingProxyType 으로 감싸 공유 설정이 호출자에 의해 변경되지 않도록 합니다.
+"""
+
+import random
+import time
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+from typing import Any
+
+import bson
+from loguru import logger
+
+_IDS_ONLY = {'_id': 1}
+
+_RERANK = {
+    'products.captions.comprehensive_description': 1,
+    'product_skus.main_category': 1,
+    'product_skus.sub_category': 1,
+}
+
+_CARD = {
+    'products.product_id': 1,
+    'products.product_name': 1,
+    'products.brand_name': 1,
+    'products.current_price': 1,
+    'products.original_price': 1,
+    'product_skus.sku_id': 1,
+    'product_skus.color_name': 1,
+    'product_skus.image_urls': 1,
+    'product_skus.main_category': 1,
+    'product_skus.sub_category': 1,
+}
+
+_DETAIL = {
+    **_CARD,
+    'products.captions.comprehensive_description': 1,
+    'products.description_info': 1,
+    'product_skus.color_hex': 1,
+    'product_skus.gender': 1,
+    'product_skus.fit': 1,
+    'product_skus.style_tags': 1,
+    'product_skus.tpo_tags': 1,
+    'product_skus.common': 1,
+}
+
+PROJECTION_PROFILES: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+    {
+        'ids_only': MappingProxyType(_IDS_ONLY),
+        'rerank': MappingProxyType(_RERANK),
+        'card': MappingProxyType(_CARD),
+        'detail': MappingProxyType(_DETAIL),
+    }
+)
+
+
+def get_projection(profile: str | None) -> dict | None:
+    """
+    프로필 이름에 해당하는 프로젝션 사본을 반환합니다. (pymongo / $project 에 그대로 전달 가능)
+
+    Args:
+        profile (str | None): 프로필 이름. None 이면 프로젝션 없음(전체 문서)
+
+    Raises:
+        ValueError: 등록되지 않은 프로필
+    """
+    if profile is None:
+        return None
+    fields = PROJECTION_PROFILES.get(profile)
+    if fields is None:
+        raise ValueError(f'projection profile 의 값이 올바르지 않습니다. : {profile} \n 허용된 값 : {list(PROJECTION_PROFILES)}')
+    return dict(fields)
+
+
+def bson_size(document: dict) -> int:
+    """문서의 BSON 인코딩 크기(바이트)"""
+    return len(bson.encode(document))
+
+
+class ProjectionSizeStats:
+    """
+    프로필별 반환 문서 수 / BSON 바이트 누적 집계
+
+    조회 경로의 bson.encode 비용을 줄이기 위해 호출 중 sample_rate 비율만 측정하고 (documents 는 측정한 문서 수),
+    호출별 로그는 DEBUG, 누적 요약은 log_interval_seconds 마다 INFO 로 남깁니다.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, log_interval_seconds: float = 60.0):
+        """
+        Args:
+            sample_rate (float): 측정할 호출 비율 (0 이면 측정하지 않음)
+            log_interval_seconds (float): 누적 요약 INFO 로그 간격(초)
+        """
+        self.sample_rate = sample_rate
+        self.log_interval_seconds = log_interval_seconds
+        self.documents: dict[str, int] = {}
+        self.bytes: dict[str, int] = {}
+        self._last_summary_log = time.monotonic()
+
+    def should_sample(self) -> bool:
+        """이번 호출을 측정할지 여부"""
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def record(self, profile: str | None, documents: Iterable[dict], operation: str) -> int:
+        """
+        샘플링된 호출이면 반환 문서의 BSON 크기를 집계합니다.
+
+        Returns:
+            int: 이번 호출의 총 바이트 (측정하지 않은 경우 0)
+        """
+        if not self.should_sample():
+            return 0
+        sizes = [bson_size(doc) for doc in documents if doc is not None]
+        total = sum(sizes)
+        self.add(profile, len(sizes), total, operation)
+        return total
+
+    def add(self, profile: str | None, count: int, total: int, operation: str) -> None:
+        """이미 계산된 문서 수 / 바이트를 집계 (별도 샘플 조회로 크기를 잰 경우)"""
+        if not count:
+            return
+        name = profile or 'full'
+        self.documents[name] = self.documents.get(name, 0) + count
+        self.bytes[name] = self.bytes.get(name, 0) + total
+        logger.debug(
+            f'[projection] op={operation} profile={name} docs={count} bytes={total} '
+            f'avg_bytes={total // count} cumulative_avg_bytes={self.bytes[name] // self.documents[name]}'
+        )
+        now = time.monotonic()
+        if now - self._last_summary_log >= self.log_interval_seconds:
+            self._last_summary_log = now
+            logger.info(f'[projection] sampled size summary (sample_rate={self.sample_rate}): {self.summary()}')
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        return {
+            name: {'documents': count, 'bytes': self.bytes[name], 'avg_bytes': self.bytes[name] // count if count else 0}
+            for name, count in self.documents.items()
+        }
@@ -0,0 +1,204 @@
+"""
+파티션 병렬 백필(backfill) 엔진
+
+벡터 필드 하나를 읽어 새 필드를 계산해 쓰는 작업(BSON 변환, 양자화, 차원 축소)을 위한 공통 엔진입니다.
+- _id 키 공간을 $sample 로 구한 경계값으로 partitions 개 범위로 나누고, 범위마다 커서를 동시에 실행
+- 커서는 _id 와 source_field 만 프로젝션 (리뷰 / 이미지 / 캡션을 읽지 않음)
+- 변환(convert)은 스레드 / 프로세스 풀에서 배치 단위로 실행해 이벤트 루프를 막지 않음
+- 파티션별 마지막 _id 를 CheckpointStore 에 저장하므로 중단된 작업은 같은 경계로 이어서 진행
+
+convert 는 프로세스 풀에서 실행될 수 있도록 모듈 수준 함수(또는 그 partial)여야 합니다.
+기본 풀은 스레드입니다. (numpy 연산은 GIL 을 놓으므로 충분히 병렬) process 풀은 pymongo 클라이언트의 백그라운드 스레드가
+있는 프로세스를 fork 하지 않도록 spawn 컨텍스트로 만들며, 배치마다 벡터를 pickle 로 넘기므로 변환이 무거운 경우에만 사용합니다.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype
+from loguru import logger
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+from db.config.config import Config
+from db.vector.base import get_path
+
+from .checkpoint import CheckpointStore
+
+# 경계값 계산 시 파티션당 샘플링할 _id 수
+SAMPLES_PER_PARTITION = 32
+PROGRESS_LOG_SECONDS = 5.0
+
+
+def bson_vector_converter(vectors: list[list[float]], target_field: str, vector_dtype: BinaryVectorDtype) -> list[dict[str, Any]]:
+    """float 벡터 -> BSON 벡터 ($set 페이로드)"""
+    return [{target_field: Binary.from_vector(vector, vector_dtype)} for vector in vectors]
+
+
+def quantized_vector_converter(vectors: list[list[float]], targets: list[tuple[str, Any]]) -> list[dict[str, Any]]:
+    """float 벡터 -> 양자화기(to_bson) 별 BSON 벡터 ($set 페이로드)"""
+    return [{field: quantizer.to_bson(vector) for field, quantizer in targets} for vector in vectors]
+
+
+def reduced_vector_converter(vectors: list[list[float]], target_field: str, reducer: Any) -> list[dict[str, Any]]:
+    """float 벡터 -> 축소 차원 float32 BSON 벡터 ($set 페이로드, 배치 단위 행렬 연산)"""
+    reduced = reducer.transform(np.asarray(vectors, dtype=np.float32))
+    return [{target_field: Binary.from_vector(row.tolist(), BinaryVectorDtype.FLOAT32)} for row in reduced]
+
+
+class PartitionedBackfill:
+    """_id 범위 파티션별 동시 커서 + 풀 변환 + bulk_write 백필"""
+
+    def __init__(
+        self,
+        collection: Collection,
+        source_field: str,
+        convert: Callable[[list[list[float]]], list[dict[str, Any]]],
+        name: str,
+        checkpoint_store: CheckpointStore | None = None,
+        partitions: int | None = None,
+        batch_size: int | None = None,
+        executor: Executor | None = None,
+    ):
+        """
+        Args:
+            collection (Collection): 대상 컬렉션
+            source_field (str): 읽을 벡터 필드 경로
+            convert (Callable): 벡터 리스트 -> 문서별 $set 페이로드 리스트 (같은 순서)
+            name (str): 체크포인트 이름
+            checkpoint_store (CheckpointStore, optional): None 이면 이어하기 없이 실행
+            partitions (int, optional): 동시 파티션 수. 기본값은 BACKFILL_SETTINGS.PARTITIONS
+            batch_size (int, optional): 변환 / bulk_write 배치 크기. 기본값은 BACKFILL_SETTINGS.BATCH_SIZE
+            executor (Executor, optional): 변환 실행 풀. None 이면 BACKFILL_SETTINGS.EXECUTOR 에 따라 생성
+        """
+        backfill_config = Config().get_backfill_config()
+        self.collection = collection
+        self.source_field = source_field
+        self.convert = convert
+        self.name = name
+        self.checkpoint_store = checkpoint_store
+        self.partitions = partitions or backfill_config.get('PARTITIONS')
+        self.batch_size = batch_size or backfill_config.get('BATCH_SIZE')
+        self.executor = executor
+        self.executor_kind = backfill_config.get('EXECUTOR')
+        self.max_workers = backfill_config.get('MAX_WORKERS')
+        self.stats = {'processed': 0, 'modified': 0, 'skipped': 0}
+        self._total = 0
+        self._last_log = 0.0
+
+    async def _boundaries(self) -> list[Any]:
+        """$sample 한 _id 의 분위수로 파티션 경계값(partitions - 1 개)을 계산"""
+        if self.partitions <= 1:
+            return []
+        pipeline = [
+            {'$match': {self.source_field: {'$exists': True}}},
+            {'$sample': {'size': self.partitions * SAMPLES_PER_PARTITION}},
+            {'$project': {'_id': 1}},
+        ]
+        cursor = await self.collection.aggregate(pipeline)
+        sampled = sorted({doc['_id'] async for doc in cursor})
+        if len(sampled) < self.partitions:
+            return []
+        step = len(sampled) / self.partitions
+        return list(dict.fromkeys(sampled[int(step * i)] for i in range(1, self.partitions)))
+
+    async def run(self, resume: bool = True) -> dict[str, int]:
+        """
+        백필 실행
+
+        Args:
+            resume (bool): 저장된 체크포인트(같은 name)가 있으면 그 경계 / 위치부터 이어서 진행
+
+        Returns:
+            dict[str, int]: processed(읽은 문서) / modified(수정된 문서) / skipped(벡터가 아닌 값)
+        """
+        checkpoint = await self.checkpoint_store.load(self.name) if self.checkpoint_store is not None and resume else None
+        if checkpoint is not None and checkpoint.get('status') == 'completed':
+            checkpoint = None
+        if checkpoint is not None:
+            boundaries = checkpoint['boundaries']
+            logger.info(f"Resuming backfill '{self.name}' over {len(boundaries) + 1} partitions")
+        else:
+            boundaries = await self._boundaries()
+            if self.checkpoint_store is not None:
+                await self.checkpoint_store.clear(self.name)
+                await self.checkpoint_store.save(self.name, boundaries=boundaries, status='running')
+        positions = (checkpoint or {}).get('positions', {})
+        done = (checkpoint or {}).get('done', {})
+
+        ranges = list(zip([None, *boundaries], [*boundaries, None], strict=True))
+        self._total = await self.collection.estimated_document_count()
+        started = time.perf_counter()
+        owns_executor = self.executor is None and self.executor_kind == 'process'
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn')) if owns_executor else self.executor
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for index, (lower, upper) in enumerate(ranges):
+                    if done.get(str(index)):
+                        continue
+                    task_group.create_task(self._run_partition(index, lower, upper, positions.get(str(index)), executor))
+        except ExceptionGroup as eg:
+            logger.error(f"Backfill '{self.name}' failed (resumable from checkpoint): {eg.exceptions[0]}")
+            raise eg.exceptions[0] from None
+        finally:
+            if owns_executor:
+                executor.shutdown()
+
+        if self.checkpoint_store is not None:
+            await self.checkpoint_store.save(self.name, status='completed', stats=self.stats)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Backfill '{self.name}' completed: {self.stats} in {elapsed:.1f}s ({self.stats['processed'] / max(elapsed, 1e-9):.0f} docs/s)")
+        return dict(self.stats)
+
+    async def _run_partition(self, index: int, lower: Any, upper: Any, resume_after: Any, executor: Executor | None) -> None:
+        id_range: dict[str, Any] = {}
+        if resume_after is not None:
+            id_range['$gt'] = resume_after
+        elif lower is not None:
+            id_range['$gte'] = lower
+        if upper is not None:
+            id_range['$lt'] = upper
+        query: dict[str, Any] = {self.source_field: {'$exists': True}}
+        if id_range:
+            query['_id'] = id_range
+
+        cursor = self.collection.find(query, projection={self.source_field: 1}).sort('_id', 1).batch_size(self.batch_size)
+        batch: list[dict] = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= self.batch_size:
+                await self._write_batch(index, batch, executor)
+                batch = []
+        if batch:
+            await self._write_batch(index, batch, executor)
+        if self.checkpoint_store is not None:
+            await self.checkpoint_store.save(self.name, **{f'done.{index}': True})
+
+    async def _write_batch(self, index: int, batch: list[dict], executor: Executor | None) -> None:
+        ids, vectors = [], []
+        for doc in batch:
+            vector = get_path(doc, self.source_field)
+            if vector and isinstance(vector, list):
+                ids.append(doc['_id'])
+                vectors.append(vector)
+        self.stats['processed'] += len(batch)
+        self.stats['skipped'] += len(batch) - len(ids)
+
+        if ids:
+            payloads = await asyncio.get_running_loop().run_in_executor(executor, self.convert, vectors)
+            updates = [UpdateOne({'_id': doc_id}, {'$set': payload}) for doc_id, payload in zip(ids, payloads, strict=True)]
+            result = await self.collection.bulk_write(updates, ordered=False)
+            self.stats['modified'] += result.modified_count
+
+        if self.checkpoint_store is not None:
+            await self.checkpoint_store.save(self.name, **{f'positions.{index}': batch[-1]['_id']})
+
+        now = time.monotonic()
+        if now - self._last_log >= PROGRESS_LOG_SECONDS:
+            self._last_log = now
+            logger.info(f"Backfill '{self.name}': {self.stats['processed']}/{self._total} documents ({self.stats['processed'] / max(self._total, 1):.1%})")
@@ -0,0 +1,89 @@
+"""
+DataLoader 방식의 요청 병합 로더
+
+같은 이벤트 루프 tick (또는 window_ms 이내) 에 들어온 load(key) 호출을 모아 batch_fn 한 번으로 조회하고,
+결과를 기다리는 호출자들에게 나눠 줍니다.
+- memoize=True 면 같은 키의 결과(Future)를 보관해 요청 범위 내 재조회를 없앰 (AsyncFashionRepository.request_scope)
+- memoize=False 면 같은 배치 안의 중복 키만 합침 (프로세스 공유 로더)
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any
+
+from loguru import logger
+
+
+class BatchLoader:
+    """키 단위 load 를 배치 조회로 병합"""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[Hashable]], Awaitable[dict[Hashable, Any]]],
+        max_batch_size: int = 100,
+        window_ms: float = 0.0,
+        memoize: bool = True,
+    ):
+        """
+        Args:
+            batch_fn (Callable): 키 리스트 -> {키: 값} 을 반환하는 비동기 함수 (없는 키는 생략 -> None)
+            max_batch_size (int): 한 번에 조회할 최대 키 수 (도달하면 즉시 실행)
+            window_ms (float): 0 이면 현재 tick 의 호출만 모음, 양수면 해당 시간 동안 모음
+            memoize (bool): 결과 보관 여부
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.window_ms = window_ms
+        self.memoize = memoize
+        self._cache: dict[Hashable, asyncio.Future] = {}
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        self._scheduled: asyncio.Handle | None = None
+
+    async def load(self, key: Hashable) -> Any | None:
+        future = self._cache.get(key) or self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if self.memoize:
+                self._cache[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._scheduled is None:
+                self._scheduled = loop.call_soon(self._dispatch) if self.window_ms <= 0 else loop.call_later(self.window_ms / 1000, self._dispatch)
+        # 한 호출자가 취소되어도 같은 키를 기다리는 다른 호출자에게 영향을 주지 않도록 shield
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> list[Any | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def clear(self, key: Hashable | None = None) -> None:
+        """보관된 결과 제거 (key 가 None 이면 전체)"""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        asyncio.get_running_loop().create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: dict[Hashable, asyncio.Future]) -> None:
+        try:
+            results = await self.batch_fn(list(batch))
+        except Exception as e:
+            logger.error(f'Batch load of {len(batch)} keys failed: {e}')
+            for key, future in batch.items():
+                # 실패한 결과는 보관하지 않아 다음 호출에서 다시 조회
+                self._cache.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
@@ -0,0 +1,35 @@
+"""
+장시간 작업(마이그레이션 / 동기화)의 진행 위치 저장소
+
+작업 이름을 _id 로 하는 문서 하나에 진행 상태(마지막 처리 _id, 누적 통계 등)를 저장합니다.
+작업이 중단되면 다음 실행에서 load 로 읽어 이어서 진행합니다.
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+from loguru import logger
+from pymongo.collection import Collection
+
+
+class CheckpointStore:
+    """MongoDB 컬렉션 기반 체크포인트 저장소"""
+
+    def __init__(self, collection: Collection):
+        """
+        Args:
+            collection (Collection): 체크포인트를 저장할 컬렉션 (예: target_db.migration_checkpoints)
+        """
+        self.collection = collection
+
+    async def load(self, name: str) -> dict[str, Any] | None:
+        return await self.collection.find_one({'_id': name})
+
+    async def save(self, name: str, **state: Any) -> None:
+        """state 필드를 덮어쓰고 updated_at 을 갱신 (없으면 생성)"""
+        await self.collection.update_one({'_id': name}, {'$set': {**state, 'updated_at': datetime.now(timezone.utc)}}, upsert=True)
+
+    async def clear(self, name: str) -> None:
+        result = await self.collection.delete_one({'_id': name})
+        if result.deleted_count:
+            logger.info(f'Checkpoint cleared: {name}')
@@ -1,34 +1,204 @@
-from collections.abc import AsyncIterator
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Hashable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import partial
 from typing import Any, override
 
+import numpy as np
 from bson.binary import Binary, BinaryVectorDtype
 from loguru import logger
 from pymongo import UpdateOne
-from pymongo.errors import DuplicateKeyError
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
+from db.query_builders.projections import PROJECTION_PROFILES, ProjectionSizeStats, bson_size, get_projection
+from db.vector.base import BaseVectorEngine, cosine_to_score, get_path, normalize_rows, top_k, vector_query_fingerprint
+from db.vector.cache import VectorSearchCache
+from db.vector.diversify import ProductOversampler, collapse_by_key, mmr_select
+from db.vector.fusion import reciprocal_rank_fusion
+from db.vector.quantization import BinaryQuantizer, ScalarQuantizer, benchmark_quantization
+from db.vector.reduction import DimensionReducer, benchmark_two_stage
+
+from .backfill import PartitionedBackfill, bson_vector_converter, quantized_vector_converter, reduced_vector_converter
 from .base_async import BaseAsyncRepository
+from .batch_loader import BatchLoader
+from .checkpoint import CheckpointStore
+from .read_cache import ProductReadCache
+from .schema_migration import SchemaMigration, SchemaMigrationRunner
+from .write_buffer import PendingWrite, WriteBehindBuffer
+
+
+DESCRIPTION_INFO_PATH = 'products.description_info'
+PRODUCT_ID_PATH = 'products.product_id'
 
 
 class AsyncFashionRepository(BaseAsyncRepository):
     """패션 상품 전용 비동기 Repository"""
 
-    def __init__(self, connection_string: str, database_name: str, collection_name: str):
+    def __init__(
+        self,
+        connection_string: str,
+        database_name: str,
+        collection_name: str,
+        vector_engine: BaseVectorEngine | None = None,
+        search_cache: VectorSearchCache | None = None,
+        dimension_reducer: DimensionReducer | None = None,
+        read_cache: ProductReadCache | None = None,
+        exact_engine: BaseVectorEngine | None = None,
+    ):
         super().__init__(connection_string, database_name, collection_name)
+        # 설정되면 vector_search 가 Atlas 대신 로컬(in-process) 벡터 엔진을 사용
+        self.vector_engine = vector_engine
+        # 설정되면 vector_search(exact=True) 가 Atlas ENN 대신 이 엔진(보통 mmap ExactVectorEngine)을 사용
+        self.exact_engine = exact_engine
+        # 설정되면 vector_search 결과를 Redis 에 캐싱
+        self.search_cache = search_cache
+        # 설정되면 find_by_id / get_product_description_info 를 L1(LRU) + L2(Redis) 로 캐싱
+        self.read_cache = read_cache
+        # two_stage_vector_search 의 쿼리 축소기 (None 이면 TWO_STAGE_SEARCH_SETTINGS 의 truncate)
+        self.dimension_reducer = dimension_reducer
+        # 상품 단위 collapse 시 oversampling 배수 학습
+        diversify_config = self.query_builder.config.get_diversify_config()
+        self.product_oversampler = ProductOversampler(
+            initial_ratio=diversify_config.get('INITIAL_SKUS_PER_PRODUCT'),
+            safety=diversify_config.get('OVERSAMPLE_SAFETY'),
+            max_factor=diversify_config.get('MAX_OVERSAMPLE'),
+            alpha=diversify_config.get('OVERSAMPLE_EMA_ALPHA'),
+        )
+        # 프로젝션 프로필별 반환 BSON 크기 집계
+        projection_stats_config = self.query_builder.config.get_projection_stats_config()
+        self.projection_stats = ProjectionSizeStats(
+            sample_rate=projection_stats_config.get('SAMPLE_RATE'), log_interval_seconds=projection_stats_config.get('LOG_INTERVAL_SECONDS')
+        )
+        # find_all 크기 샘플링 같은 fire-and-forget 태스크 참조 (GC 방지)
+        self._background_tasks: set[asyncio.Task] = set()
+        # 같은 tick 의 find_by_id 호출을 $in 한 번으로 병합 (프로세스 공유, 결과 보관 없음)
+        # request_scope() 안에서는 요청 전용 로더가 결과를 보관
+        self.batch_loader_config = self.query_builder.config.get_batch_loader_config()
+        self._shared_id_loader = self._new_id_loader(memoize=False)
+        self._request_id_loader: ContextVar[BatchLoader | None] = ContextVar(f'find_by_id_loader_{id(self)}', default=None)
+        # buffered_update_by_id 의 쓰기를 문서별로 병합해 bulk_write 로 전송
+        self.write_buffer_config = self.query_builder.config.get_write_buffer_config()
+        # LAYOUT='shared' 면 Atlas 벡터 검색이 상품 임베딩 컬렉션에서 SKU 문서로 $lookup
+        self.shared_embedding_config = self.query_builder.config.get_shared_embedding_config()
+        self.write_buffer = WriteBehindBuffer(
+            self._bulk_update_by_id,
+            max_batch_size=self.write_buffer_config.get('MAX_BATCH_SIZE'),
+            flush_interval_ms=self.write_buffer_config.get('FLUSH_INTERVAL_MS'),
+        )
+
+    def set_vector_engine(self, vector_engine: BaseVectorEngine | None) -> None:
+        """vector_search 백엔드를 로컬 벡터 엔진으로 교체합니다. None 이면 Atlas 로 복귀"""
+        self.vector_engine = vector_engine
+
+    def set_exact_engine(self, exact_engine: BaseVectorEngine | None) -> None:
+        """vector_search(exact=True) 백엔드를 설정합니다. (예: ExactVectorEngine.load(dir)) None 이면 exact 검색도 기본 경로를 따름"""
+        self.exact_engine = exact_engine
 
     @override
-    async def find_by_id(self, doc_id: str, projection: dict | None = None) -> dict:
-        """상품 ID로 비동기 조회"""
+    async def find_by_id(self, doc_id: str, projection: dict | None = None, profile: str | None = None) -> dict:
+        """
+        상품 ID로 비동기 조회
+
+        Args:
+            doc_id (str): 문서 _id
+            projection (dict, optional): 직접 지정하는 프로젝션 (profile 보다 우선)
+            profile (str, optional): 프로젝션 프로필 이름 (ids_only / rerank / card / detail)
+        """
+        if projection is not None:
+            return await self._find_by_id(doc_id, projection, profile)
+        if self.read_cache is not None:
+            # 임의 프로젝션은 무효화 대상 키를 알 수 없으므로 프로필 / 전체 문서 조회만 캐싱
+            return await self.read_cache.get_or_load(self.read_cache.document_key(doc_id, profile), lambda: self._load_by_id(doc_id, profile))
+        return await self._load_by_id(doc_id, profile)
+
+    async def _load_by_id(self, doc_id: str, profile: str | None) -> dict | None:
+        """요청 병합 로더를 통한 조회 (비활성화 시 find_one)"""
+        if not self.batch_loader_config.get('ENABLED'):
+            return await self._find_by_id(doc_id, get_projection(profile), profile)
+        loader = self._request_id_loader.get() or self._shared_id_loader
+        return await loader.load((doc_id, profile))
+
+    def _new_id_loader(self, memoize: bool) -> BatchLoader:
+        return BatchLoader(
+            self._find_many_by_id,
+            max_batch_size=self.batch_loader_config.get('MAX_BATCH_SIZE'),
+            window_ms=self.batch_loader_config.get('WINDOW_MS'),
+            memoize=memoize,
+        )
+
+    async def _find_many_by_id(self, keys: list[Hashable]) -> dict[Hashable, dict]:
+        """(doc_id, profile) 키들을 프로필별 $in 조회 한 번으로 가져옴"""
+        ids_by_profile: dict[str | None, list[str]] = {}
+        for doc_id, profile in keys:
+            ids_by_profile.setdefault(profile, []).append(doc_id)
+
+        results: dict[Hashable, dict] = {}
+        try:
+            for profile, doc_ids in ids_by_profile.items():
+                cursor = self.collection.find({'_id': {'$in': doc_ids}}, projection=get_projection(profile))
+                documents = [doc async for doc in cursor]
+                self.projection_stats.record(profile, documents, 'find_by_id')
+                results.update({(doc['_id'], profile): doc for doc in documents})
+        except Exception as e:
+            raise Exception(f'Error finding products by ID (async) {len(keys)} keys: {e}') from e
+        if len(keys) > 1:
+            logger.debug(f'find_by_id batched {len(keys)} lookups into {len(ids_by_profile)} query(s)')
+        return results
+
+    @asynccontextmanager
+    async def request_scope(self) -> AsyncIterator[BatchLoader]:
+        """
+        요청(에이전트 실행) 범위의 find_by_id 로더. 범위 안에서는 같은 문서를 다시 조회하지 않습니다.
+        contextvars 로 전달되므로 범위 안에서 생성된 태스크(asyncio.gather 등)에도 적용됩니다.
+
+        Usage:
+            async with repo.request_scope():
+                await asyncio.gather(*(repo.find_by_id(sku_id, profile='card') for sku_id in sku_ids))
+        """
+        loader = self._new_id_loader(memoize=True)
+        token = self._request_id_loader.set(loader)
+        try:
+            yield loader
+        finally:
+            self._request_id_loader.reset(token)
+
+    async def _find_by_id(self, doc_id: str, projection: dict | None, profile: str | None) -> dict:
         try:
-            return await self.collection.find_one({'_id': doc_id}, projection=projection)
+            document = await self.collection.find_one({'_id': doc_id}, projection=projection)
+            self.projection_stats.record(profile, [document], 'find_by_id')
+            return document
         except Exception as e:
             logger.error(f'Error finding product by ID (async) {doc_id}: {e}')
             raise Exception(f'Error finding product by ID (async) {doc_id}: {e}') from e
 
     @override
-    async def find_all(self, filter_dict: dict | None = None) -> AsyncIterator[dict]:
-        """조건에 맞는 모든 상품 비동기 조회"""
+    async def find_all(self, filter_dict: dict | None = None, profile: str | None = None) -> AsyncIterator[dict]:
+        """
+        조건에 맞는 모든 상품 비동기 조회 (profile 을 지정하면 해당 프로젝션만 조회)
+        항상 AsyncCursor 를 그대로 반환하며, 샘플링된 호출은 같은 조건의 앞쪽 문서 몇 개로 크기를 백그라운드에서 측정합니다.
+        """
         filter_dict = filter_dict or {}
-        return self.collection.find(filter_dict)
+        projection = get_projection(profile)
+        cursor = self.collection.find(filter_dict, projection=projection)
+        if profile is not None and self.projection_stats.should_sample():
+            task = asyncio.create_task(self._sample_projection_size(filter_dict, projection, profile, 'find_all'))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        return cursor
+
+    async def _sample_projection_size(self, filter_dict: dict, projection: dict | None, profile: str, operation: str) -> None:
+        """조건에 맞는 문서 최대 SAMPLE_DOCUMENTS 개의 BSON 크기를 집계 (호출자 커서와 별개)"""
+        sample_documents = self.query_builder.config.get_projection_stats_config().get('SAMPLE_DOCUMENTS')
+        try:
+            cursor = self.collection.find(filter_dict, projection=projection).limit(sample_documents)
+            sizes = [bson_size(doc) async for doc in cursor]
+        except Exception as e:
+            logger.debug(f'[projection] size sampling failed for {operation}: {e}')
+            return
+        self.projection_stats.add(profile, len(sizes), sum(sizes), operation)
 
     @override
     async def create(self, document: dict) -> str | None:
@@ -48,6 +218,8 @@ class AsyncFashionRepository(BaseAsyncRepository):
         """
         업데이트를 시도하고 (matched_count, modified_count)를 반환합니다.
         오류 발생 시 (-1, -1)을 반환합니다.
+        상품 조회 캐시만 무효화합니다. 벡터 검색 결과 캐시는 카탈로그 전체 버전이므로 쓰기를 모두 마친 뒤
+        invalidate_search_cache() 를 한 번 호출하세요. (쓰기 버퍼가 켜진 buffered_update_by_id 는 flush 배치마다 자동으로 호출)
         """
         if not update_data:
             # 업데이트 데이터가 없으면 매치/수정 모두 0
@@ -55,6 +227,9 @@ class AsyncFashionRepository(BaseAsyncRepository):
 
         try:
             result = await self.collection.update_one({'_id': doc_id}, {'$set': update_data}, upsert=upsert)
+            if result.modified_count or result.upserted_id is not None:
+                await self.invalidate_product_cache(doc_id)
+                await self.invalidate_description_cache({doc_id: update_data})
             return result.matched_count, result.modified_count
 
         except Exception as e:
@@ -62,11 +237,144 @@ class AsyncFashionRepository(BaseAsyncRepository):
             # 기술적 오류는 특수 값으로 표시
             return -1, -1
 
+    async def buffered_update_by_id(self, doc_id: str, update_data: dict, upsert: bool = False) -> tuple[int, int]:
+        """
+        update_by_id 의 write-behind 버전. 같은 시점의 쓰기들과 함께 bulk_write 로 전송되며,
+        flush 후 update_by_id 와 같은 의미의 (matched_count, modified_count) 를 반환합니다. (오류 시 (-1, -1))
+        같은 문서에 대한 여러 호출은 필드 단위로 병합되어 한 번만 쓰이고, 모두 같은 결과를 받습니다.
+        """
+        if not update_data:
+            return 0, 0
+        if not self.write_buffer_config.get('ENABLED'):
+            return await self.update_by_id(doc_id, update_data, upsert=upsert)
+        return await self.write_buffer.submit(doc_id, update_data, upsert=upsert)
+
+    async def flush_writes(self) -> None:
+        """버퍼에 남은 쓰기를 모두 전송 (워커 종료 시 호출)"""
+        await self.write_buffer.close()
+
+    async def _bulk_update_by_id(self, batch: dict[str, PendingWrite]) -> dict[str, tuple[int, int]]:
+        """
+        병합된 쓰기를 unordered bulk_write 한 번으로 실행하고 문서별 (matched, modified) 를 계산합니다.
+        bulk_write 는 연산별 modified 를 알려주지 않으므로 modified 는 배치 단위 modified_count 로 판단합니다.
+        0 이면 모두 0, 그 외에는 매치된 문서를 모두 수정된 것으로 봅니다. (추가 조회 없이 캐시 무효화가 누락되지 않는 쪽)
+        """
+        doc_ids = list(batch)
+        operations = [UpdateOne({'_id': doc_id}, {'$set': batch[doc_id].fields}, upsert=batch[doc_id].upsert) for doc_id in doc_ids]
+        failed: set[int] = set()
+        try:
+            result = await self.collection.bulk_write(operations, ordered=False)
+            matched_count, modified_count = result.matched_count, result.modified_count
+            upserted = set(result.upserted_ids)
+        except BulkWriteError as e:
+            # unordered 이므로 실패한 연산 외에는 적용됨
+            details = e.details
+            failed = {error['index'] for error in details.get('writeErrors', [])}
+            matched_count, modified_count = details.get('nMatched', 0), details.get('nModified', 0)
+            upserted = {item['index'] for item in details.get('upserted', [])}
+            logger.error(f'Bulk update partially failed: {len(failed)}/{len(operations)} operations: {details.get("writeErrors", [])[:3]}')
+        except Exception as e:
+            logger.error(f'Error bulk updating {len(operations)} docs: {e}')
+            return {doc_id: (-1, -1) for doc_id in doc_ids}
+
+        remaining = [doc_id for index, doc_id in enumerate(doc_ids) if index not in failed and index not in upserted]
+        # upsert=True 연산은 upsert 되지 않았다면 매치된 것. upsert=False 연산만 매치 여부가 불확실
+        upsert_matched = {doc_id for doc_id in remaining if batch[doc_id].upsert}
+        if matched_count == len(remaining):
+            matched_ids = set(remaining)
+        elif matched_count == len(upsert_matched):
+            matched_ids = upsert_matched
+        else:
+            # upsert=False 연산 중 일부만 매치된 드문 경우에만 존재 여부를 한 번 더 조회
+            try:
+                matched_ids = {doc['_id'] async for doc in self.collection.find({'_id': {'$in': remaining}}, projection={'_id': 1})}
+            except Exception as e:
+                logger.warning(f'Could not resolve matched documents after bulk update: {e}')
+                matched_ids = set(remaining)
+        results: dict[str, tuple[int, int]] = {}
+        changed: list[str] = []
+        for index, doc_id in enumerate(doc_ids):
+            if index in failed:
+                results[doc_id] = (-1, -1)
+            elif index in upserted:
+                # update_one(upsert=True) 로 새로 생성된 경우와 동일하게 (0, 0)
+                results[doc_id] = (0, 0)
+                changed.append(doc_id)
+            elif doc_id in matched_ids:
+                modified = 1 if modified_count else 0
+                results[doc_id] = (1, modified)
+                if modified:
+                    changed.append(doc_id)
+            else:
+                results[doc_id] = (0, 0)
+        await asyncio.gather(*(self.invalidate_product_cache(doc_id) for doc_id in changed))
+        await self.invalidate_description_cache({doc_id: batch[doc_id].fields for doc_id in changed})
+        # 검색 결과 캐시는 배치당 한 번만 무효화 (쓰기마다 버전을 올리면 가격 업데이트 폭주 시 캐시가 계속 비워짐)
+        if changed:
+            await self.invalidate_search_cache()
+
+        writes = sum(len(pending.futures) for pending in batch.values())
+        logger.info(
+            f'Bulk update: {writes} writes merged into {len(operations)} ops '
+            f'(matched={matched_count}, modified={modified_count}, upserted={len(upserted)}, failed={len(failed)})'
+        )
+        return results
+
+    async def invalidate_search_cache(self) -> None:
+        """카탈로그가 바뀐 경우 벡터 검색 결과 캐시를 무효화 (실패해도 쓰기 결과에는 영향 없음)"""
+        if self.search_cache is None:
+            return
+        try:
+            await self.search_cache.invalidate()
+        except Exception as e:
+            logger.warning(f'Vector search cache invalidation failed: {e}')
+
+    async def invalidate_product_cache(self, doc_id: str) -> None:
+        """문서가 바뀐 경우 요청 범위 로더와 read-through 캐시(L1 / L2)에서 해당 문서의 모든 프로젝션 변형을 제거"""
+        loader = self._request_id_loader.get()
+        if loader is not None:
+            for profile in (None, *PROJECTION_PROFILES):
+                loader.clear((doc_id, profile))
+        if self.read_cache is not None:
+            await self.read_cache.invalidate_document(doc_id)
+
+    async def invalidate_description_cache(self, updates: dict[str, dict]) -> None:
+        """
+        products.description_info 를 바꾼 쓰기에 대해 get_product_description_info 캐시(products.product_id 키)를 무효화
+
+        Args:
+            updates (dict): 문서 _id -> $set 한 필드
+        """
+        if self.read_cache is None:
+            return
+        touched = {doc_id: fields for doc_id, fields in updates.items() if any(_touches_path(path, DESCRIPTION_INFO_PATH) for path in fields)}
+        if not touched:
+            return
+
+        product_ids = set()
+        unresolved = []
+        for doc_id, fields in touched.items():
+            product_id = fields.get(PRODUCT_ID_PATH, get_path(fields, PRODUCT_ID_PATH))
+            if product_id is None:
+                unresolved.append(doc_id)
+            else:
+                product_ids.add(product_id)
+        if unresolved:
+            # $set 에 상품 ID 가 없으면 한 번의 $in 조회로 찾음 (description_info 변경은 드물어 가격 업데이트 경로에는 영향 없음)
+            try:
+                cursor = self.collection.find({'_id': {'$in': unresolved}}, projection={PRODUCT_ID_PATH: 1})
+                product_ids.update({product_id async for doc in cursor if (product_id := get_path(doc, PRODUCT_ID_PATH)) is not None})
+            except Exception as e:
+                logger.warning(f'Could not resolve product ids for description cache invalidation: {e}')
+        await asyncio.gather(*(self.read_cache.invalidate_description(product_id) for product_id in product_ids))
+
     @override
     async def delete_by_id(self, doc_id: str) -> bool:
         """상품 비동기 삭제"""
         try:
             result = await self.collection.delete_one({'_id': doc_id})
+            if result.deleted_count:
+                await self.invalidate_product_cache(doc_id)
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f'Error deleting product (async) {doc_id}: {e}')
@@ -85,23 +393,359 @@ class AsyncFashionRepository(BaseAsyncRepository):
         embedding: list[float],
         limit: int,
         pre_filter: dict | None = None,
+        exact: bool = False,
+        profile: str | None = None,
     ) -> list[dict]:
-        """비동기 벡터 검색"""
-        pipeline = self.query_builder.vector_search_pipeline(
+        """
+        비동기 벡터 검색 (vector_engine 이 설정되어 있으면 로컬 엔진 사용)
+
+        Args:
+            embedding (list[float]): 쿼리 임베딩
+            limit (int): 결과 개수
+            pre_filter (dict, optional): 사전 필터링 조건
+            exact (bool): True 면 exact 검색 (recall 기준값 측정용, 캐시 사용 안 함).
+                exact_engine 이 설정되어 있으면 그 엔진(mmap 행렬 전수 탐색), 없으면 로컬 엔진 또는 Atlas ENN
+            profile (str, optional): 프로젝션 프로필 이름. 기본값은 DEFAULT_PROJECTION_PROFILE
+        """
+        profile = profile or self.query_builder.vector_search_config.get('DEFAULT_PROJECTION_PROFILE')
+        if self.search_cache is None or exact:
+            return await self._execute_vector_search(embedding, limit, pre_filter, exact, profile)
+
+        index_name = self.query_builder.vector_search_config.get('DEFAULT_VECTOR_INDEX')
+        cache_key = await self.search_cache.make_key(embedding, limit, pre_filter, index_name, profile)
+        cached = await self.search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        results = await self._execute_vector_search(embedding, limit, pre_filter, exact, profile)
+        await self.search_cache.set(cache_key, results)
+        return results
+
+    async def vector_search_stream(
+        self,
+        embedding: list[float],
+        limit: int,
+        pre_filter: dict | None = None,
+        batch_size: int | None = None,
+        writer: Callable[[dict], None] | None = None,
+        event_type: str = 'product',
+        profile: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """
+        커서 배치가 도착하는 대로 문서를 하나씩 내보내는 벡터 검색
+        결과 전체를 모으지 않으므로 limit 이 클 때 첫 상품이 클라이언트에 도달하는 시간이 줄어듭니다.
+
+        Args:
+            embedding (list[float]): 쿼리 임베딩
+            limit (int): 결과 개수
+            pre_filter (dict, optional): 사전 필터링 조건
+            batch_size (int, optional): 커서 배치 크기 (로컬 엔진은 문서 조회 배치 크기). 기본값은 VECTOR_SEARCH_SETTINGS.STREAM_BATCH_SIZE
+            writer (Callable, optional): LangGraph custom stream writer (get_stream_writer()).
+                지정하면 문서마다 {'type': event_type, 'content': doc} 이벤트를 전송
+            event_type (str): writer 로 보낼 이벤트 타입
+            profile (str, optional): 프로젝션 프로필 이름
+
+        Yields:
+            dict: 검색 결과 문서 (유사도 점수 높은 순)
+        """
+        batch_size = batch_size or self.query_builder.vector_search_config.get('STREAM_BATCH_SIZE')
+        if self.vector_engine is not None:
+            documents = self._stream_local_vector_search(embedding, limit, pre_filter, batch_size, profile)
+        else:
+            collection, pipeline_fn = self._atlas_vector_search_target()
+            pipeline = pipeline_fn(
+                embedding=embedding,
+                limit=limit,
+                pre_filter=pre_filter,
+                profile=profile,
+            )
+            try:
+                documents = await collection.aggregate(pipeline, batchSize=batch_size)
+            except Exception as e:
+                logger.error(f'Error during vector search stream (async): {e}')
+                raise e
+
+        async for doc in _as_async_iterator(documents):
+            if writer is not None:
+                writer({'type': event_type, 'content': doc})
+            yield doc
+
+    async def _stream_local_vector_search(
+        self, embedding: list[float], limit: int, pre_filter: dict | None, batch_size: int, profile: str | None
+    ) -> AsyncIterator[dict]:
+        """로컬 엔진 히트를 batch_size 개씩 문서로 채워 내보냄 (문서 조회가 필요한 경우 배치마다 $in 한 번)"""
+        hits = await self._local_vector_hits(embedding, limit, pre_filter)
+        for start in range(0, len(hits), batch_size):
+            for doc in await self._hydrate_local_hits(hits[start : start + batch_size], profile):
+                yield doc
+
+    async def vector_search_many(
+        self,
+        queries: list[tuple[list[float], int, dict | None]],
+        max_concurrency: int | None = None,
+        profile: str | None = None,
+    ) -> list[list[dict]]:
+        """
+        여러 벡터 검색을 동시에 실행합니다. (예: 코디 아이템별 상의/하의/신발 검색)
+        동일한 쿼리는 한 번만 실행하고, 결과는 입력 순서대로 반환합니다.
+
+        Args:
+            queries (list[tuple]): (embedding, limit, pre_filter) 리스트
+            max_concurrency (int, optional): 동시 실행 상한. 기본값은 Mongo 연결 풀 크기
+            profile (str, optional): 모든 쿼리에 적용할 프로젝션 프로필 이름
+
+        Returns:
+            list[list[dict]]: 쿼리별 검색 결과 (입력 순서)
+        """
+        if not queries:
+            return []
+
+        unique_queries: dict[str, tuple[list[float], int, dict | None]] = {}
+        query_keys = []
+        for embedding, limit, pre_filter in queries:
+            key = vector_query_fingerprint(embedding, limit, pre_filter, precision=6)
+            unique_queries.setdefault(key, (embedding, limit, pre_filter))
+            query_keys.append(key)
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.db_manager.max_pool_size)
+
+        async def run(embedding: list[float], limit: int, pre_filter: dict | None) -> list[dict]:
+            async with semaphore:
+                return await self.vector_search(embedding, limit, pre_filter, profile=profile)
+
+        results = await asyncio.gather(*(run(*query) for query in unique_queries.values()))
+        results_by_key = dict(zip(unique_queries, results, strict=True))
+        logger.info(f'vector_search_many: {len(queries)} queries ({len(unique_queries)} unique)')
+        # 중복 쿼리끼리 같은 dict 를 공유하지 않도록 얕은 복사
+        return [[dict(doc) for doc in results_by_key[key]] for key in query_keys]
+
+    async def _execute_vector_search(
+        self,
+        embedding: list[float],
+        limit: int,
+        pre_filter: dict | None = None,
+        exact: bool = False,
+        profile: str | None = None,
+    ) -> list[dict]:
+        """캐시를 거치지 않는 벡터 검색 (로컬 엔진 또는 Atlas)"""
+        engine = self.exact_engine if exact and self.exact_engine is not None else self.vector_engine
+        if engine is not None:
+            results = await self._local_vector_search(embedding, limit, pre_filter, profile, engine=engine)
+            self.projection_stats.record(profile, results, 'vector_search')
+            return results
+
+        controller = self.query_builder.candidate_controller
+        adaptive = self.query_builder.num_candidates_config.get('MODE') == 'adaptive'
+        collection, pipeline_fn = self._atlas_vector_search_target()
+        if adaptive:
+            # 필터별 문서 수 추정치가 없거나 만료된 경우 백그라운드에서 count (이번 요청은 현재 추정치로 진행)
+            controller.schedule_refresh(collection, self.query_builder.vector_search_filter(pre_filter))
+
+        pipeline = pipeline_fn(
             embedding=embedding,
             limit=limit,
             pre_filter=pre_filter,
+            exact=exact,
+            profile=profile,
         )
         try:
             # TODO : 벡터 서치 간에 대응하는 색상이 없는 경우 처리 필요
             # logger.info(f"pipeline: {pipeline}")
-            cursor = await self.collection.aggregate(pipeline)
+            started = time.perf_counter()
+            cursor = await collection.aggregate(pipeline)
             # logger.info(f"cursor: {cursor}")
-            return [doc async for doc in cursor]
+            results = [doc async for doc in cursor]
         except Exception as e:
             logger.error(f'Error during vector search (async): {e}')
             raise e
 
+        if adaptive:
+            stage = pipeline[0]['$vectorSearch']
+            controller.observe(
+                limit=limit,
+                filter_expr=stage.get('filter'),
+                num_candidates=stage.get('numCandidates', limit),
+                exact=stage['exact'],
+                latency_ms=(time.perf_counter() - started) * 1000,
+                result_count=len(results),
+            )
+        self.projection_stats.record(profile, results, 'vector_search')
+        return results
+
+    @property
+    def embedding_collection(self) -> Collection:
+        """공유 임베딩 레이아웃의 상품 임베딩 컬렉션 (SKU 컬렉션과 같은 데이터베이스)"""
+        return self.collection.database[self.shared_embedding_config.get('COLLECTION_NAME')]
+
+    def _atlas_vector_search_target(self) -> tuple[Collection, Callable[..., list[dict]]]:
+        """임베딩 레이아웃에 따른 (aggregate 대상 컬렉션, 파이프라인 생성 함수)"""
+        if self.shared_embedding_config.get('LAYOUT') == 'shared':
+            return self.embedding_collection, partial(self.query_builder.shared_embedding_vector_search_pipeline, sku_collection=self.collection_name)
+        return self.collection, self.query_builder.vector_search_pipeline
+
+    async def sync_filter_fields_from_index(self, index_name: str | None = None) -> list[str]:
+        """
+        Atlas 벡터 인덱스 정의에서 filter 로 선언된 필드를 읽어 필터 컴파일러의 검증 대상으로 설정합니다.
+
+        Returns:
+            list[str]: 인덱스에 선언된 filter 필드 경로
+        """
+        collection, _ = self._atlas_vector_search_target()
+        if index_name is None and self.shared_embedding_config.get('LAYOUT') == 'shared':
+            index_name = self.shared_embedding_config.get('VECTOR_INDEX')
+        index_name = index_name or self.query_builder.vector_search_config.get('DEFAULT_VECTOR_INDEX')
+        cursor = await collection.list_search_indexes(index_name)
+        indexes = [index async for index in cursor]
+        if not indexes:
+            raise ValueError(f'Vector index not found: {index_name}')
+        definition = indexes[0].get('latestDefinition', {})
+        filter_fields = [field['path'] for field in definition.get('fields', []) if field.get('type') == 'filter']
+        self.query_builder.filter_compiler.set_declared_fields(filter_fields)
+        logger.info(f"Vector index '{index_name}' filter fields: {filter_fields}")
+        return filter_fields
+
+    async def sync_filter_vocabulary(self) -> dict[str, int]:
+        """
+        카탈로그의 distinct 서브 카테고리 코드 / 색상 이름으로 필터 컴파일러의 코드표와 색상 계열을 제한합니다.
+        (설정의 SUB_CATEGORY_CODES / COLOR_FAMILIES 는 샘플 데이터)
+
+        Returns:
+            dict[str, int]: 카탈로그의 서브 카테고리 코드 수 / 색상 수
+        """
+        compiler = self.query_builder.filter_compiler
+        sub_category_codes, color_names = await asyncio.gather(
+            self.collection.distinct(compiler.field_paths['sub_category']),
+            self.collection.distinct(compiler.field_paths['color']),
+        )
+        compiler.set_vocabulary(sub_category_codes, color_names)
+        logger.info(f'Filter vocabulary synced from catalog: {len(sub_category_codes)} sub categories, {len(color_names)} colors')
+        return {'sub_categories': len(sub_category_codes), 'colors': len(color_names)}
+
+    async def sync_search_metadata(self) -> None:
+        """
+        시작 시 필터 검증 대상을 실제 벡터 인덱스 정의 / 카탈로그 값으로 교체합니다.
+        실패하면 (Atlas Search 미지원 환경 등) 경고만 남기고 정적 설정을 그대로 사용합니다.
+        """
+        try:
+            filter_fields = await self.sync_filter_fields_from_index()
+            missing = sorted(set(self.query_builder.filter_compiler.field_paths.values()) - set(filter_fields))
+            if missing:
+                logger.warning(f'Vector index does not declare filter fields {missing}; filters on them are rejected until the index is rebuilt')
+        except Exception as e:
+            logger.warning(f'Could not read vector index filter fields, using VECTOR_SEARCH_SETTINGS.FILTER_FIELDS: {e}')
+        try:
+            await self.sync_filter_vocabulary()
+        except Exception as e:
+            logger.warning(f'Could not sync filter vocabulary from catalog, using FILTER_COMPILER_SETTINGS: {e}')
+
+    async def text_search(self, user_query: str, limit: int, pre_filter: dict | None = None) -> list[dict]:
+        """Atlas Search 어휘 검색"""
+        pipeline = self.query_builder.text_search_pipeline(user_query, limit, pre_filter)
+        try:
+            cursor = await self.collection.aggregate(pipeline)
+            return [doc async for doc in cursor]
+        except Exception as e:
+            logger.error(f'Error during text search (async): {e}')
+            raise e
+
+    async def hybrid_search(
+        self,
+        user_query: str,
+        embedding: list[float],
+        limit: int,
+        pre_filter: dict | None = None,
+        mode: str | None = None,
+    ) -> list[dict]:
+        """
+        어휘 검색($search) + 벡터 검색($vectorSearch) 을 reciprocal rank fusion 으로 결합한 하이브리드 검색
+
+        Args:
+            user_query (str): 사용자 쿼리 (브랜드명, 상품 코드 등 정확한 단어 매칭용)
+            embedding (list[float]): 사용자 쿼리 임베딩
+            limit (int): 결과 개수
+            pre_filter (dict, optional): 사전 필터링 조건 (두 검색에 동일하게 적용)
+            mode (str, optional): 'server' ($rankFusion 단일 aggregation) 또는 'client' (두 검색 동시 실행 후 앱에서 융합).
+                기본값은 HYBRID_SEARCH_SETTINGS.MODE
+
+        Returns:
+            list[dict]: RRF 점수 높은 순의 결과 (score 는 RRF 점수)
+        """
+        hybrid_config = self.query_builder.hybrid_search_config
+        mode = mode or hybrid_config.get('MODE')
+        if mode == 'server' and self.shared_embedding_config.get('LAYOUT') == 'shared':
+            # shared 레이아웃의 벡터 인덱스는 임베딩 컬렉션에 있어 SKU 컬렉션의 $rankFusion 으로 실행할 수 없음
+            logger.warning("Hybrid search 'server' mode is unavailable with the shared embedding layout; falling back to 'client' mode")
+            mode = 'client'
+
+        if mode == 'server':
+            pipeline = self.query_builder.hybrid_search_pipeline(user_query, embedding, limit=limit, pre_filter=pre_filter)
+            try:
+                cursor = await self.collection.aggregate(pipeline)
+                return [doc async for doc in cursor]
+            except Exception as e:
+                logger.error(f'Error during hybrid search (async): {e}')
+                raise e
+
+        if mode != 'client':
+            raise ValueError(f'Unsupported hybrid search mode: {mode}')
+
+        candidate_limit = max(hybrid_config.get('CANDIDATE_LIMIT'), limit)
+        try:
+            # 벡터 검색은 vector_search 와 같은 경로 (로컬 엔진 / 임베딩 레이아웃 / numCandidates 정책 / 결과 캐시)
+            vector_results, text_results = await asyncio.gather(
+                self.vector_search(embedding, candidate_limit, pre_filter), self.text_search(user_query, candidate_limit, pre_filter)
+            )
+        except Exception as e:
+            logger.error(f'Error during hybrid search (async): {e}')
+            raise e
+
+        return reciprocal_rank_fusion(
+            [vector_results, text_results],
+            limit=limit,
+            k=hybrid_config.get('RRF_K'),
+            weights=[hybrid_config.get('VECTOR_WEIGHT'), hybrid_config.get('TEXT_WEIGHT')],
+        )
+
+    async def _local_vector_search(
+        self, embedding: list[float], limit: int, pre_filter: dict | None = None, profile: str | None = None, engine: BaseVectorEngine | None = None
+    ) -> list[dict]:
+        """로컬 벡터 엔진(기본값 vector_engine)으로 검색하고 Atlas 와 동일한 형태(프로젝션 문서 + score)로 반환"""
+        engine = engine or self.vector_engine
+        return await self._hydrate_local_hits(await self._local_vector_hits(embedding, limit, pre_filter, engine), profile, engine)
+
+    async def _local_vector_hits(
+        self, embedding: list[float], limit: int, pre_filter: dict | None = None, engine: BaseVectorEngine | None = None
+    ) -> list[tuple[Any, float]]:
+        """
+        로컬 벡터 엔진의 (_id, score) 히트 (점수 높은 순)
+        HNSW 그래프 탐색(순수 파이썬)과 mmap 행렬 곱은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        """
+        self.query_builder.validate_embedding(embedding)
+        filter_expr = self.query_builder.vector_search_filter(pre_filter)
+        return await asyncio.to_thread((engine or self.vector_engine).search, embedding, limit, filter_expr)
+
+    async def _hydrate_local_hits(self, hits: list[tuple[Any, float]], profile: str | None = None, engine: BaseVectorEngine | None = None) -> list[dict]:
+        """로컬 엔진 히트를 프로젝션 문서 + score 로 변환"""
+        if not hits:
+            return []
+        if profile == 'ids_only':
+            return [{'_id': doc_id, 'score': score} for doc_id, score in hits]
+
+        documents = (engine or self.vector_engine).documents
+        default_profile = self.query_builder.vector_search_config.get('DEFAULT_PROJECTION_PROFILE')
+        if documents is None or (profile or default_profile) != default_profile:
+            # 엔진이 문서를 보관하지 않거나 다른 프로필을 요청한 경우 한 번의 $in 조회로 프로젝션 문서를 채움
+            cursor = self.collection.find({'_id': {'$in': [doc_id for doc_id, _ in hits]}}, projection=self.query_builder.projection(profile))
+            documents = {doc['_id']: doc async for doc in cursor}
+
+        results = []
+        for doc_id, score in hits:
+            document = documents.get(doc_id)
+            if document is None:
+                continue
+            results.append({**document, 'score': score})
+        return results
+
     @staticmethod
     def _generate_bson_vector(vector: list[float], vector_dtype: Any) -> Binary:
         """벡터값을 BSON 형태로 변환"""
@@ -115,49 +759,42 @@ class AsyncFashionRepository(BaseAsyncRepository):
             return BinaryVectorDtype.FLOAT32
         elif dtype_str.lower() == 'int8':
             return BinaryVectorDtype.INT8
+        elif dtype_str.lower() == 'packed_bit':
+            return BinaryVectorDtype.PACKED_BIT
         # 필요한 경우 다른 dtype에 대한 처리를 추가할 수 있습니다.
         else:
             raise ValueError(f'Unsupported vector dtype: {dtype_str}')
 
-    async def add_bson_vector_field(self, vector_dtype_str: str, source_field: str, target_field: str, batch_size: int = 500) -> int:
+    async def add_bson_vector_field(
+        self,
+        vector_dtype_str: str,
+        source_field: str,
+        target_field: str,
+        batch_size: int = 500,
+        partitions: int | None = None,
+        resume: bool = True,
+    ) -> int:
         """
         모든 문서에 대해 지정된 필드의 벡터를 BSON으로 변환하여 새 필드에 추가합니다.
-        BATCH_SIZE를 이용해 대량 쓰기 작업을 최적화합니다.
+        _id 범위 파티션별 커서를 동시에 실행하고, 변환은 BACKFILL_SETTINGS.EXECUTOR 풀에서 수행합니다. (PartitionedBackfill)
 
         Args:
             vector_dtype_str (str): 변환할 벡터의 타입 (예: 'float32').
             source_field (str): 소스 벡터 필드의 이름.
             target_field (str): BSON 벡터를 저장할 타겟 필드의 이름.
             batch_size (int): 한 번에 처리할 문서의 수.
+            partitions (int, optional): 동시 파티션 수. 기본값은 BACKFILL_SETTINGS.PARTITIONS
+            resume (bool): 중단된 같은 작업이 있으면 이어서 진행
 
         Returns:
             int: 업데이트된 문서의 수.
         """
         try:
             vector_dtype = self._get_vector_dtype(vector_dtype_str)
-            updates = []
-            total_modified_count = 0
-
-            cursor = self.collection.find({source_field: {'$exists': True}})
-            async for doc in cursor:
-                vector = doc.get(source_field)
-                if vector and isinstance(vector, list):
-                    bson_vector = self._generate_bson_vector(vector, vector_dtype)
-                    updates.append(UpdateOne({'_id': doc['_id']}, {'$set': {target_field: bson_vector}}))
-
-                if len(updates) >= batch_size:
-                    result = await self.collection.bulk_write(updates)
-                    total_modified_count += result.modified_count
-                    logger.info(f'Processed a batch of {len(updates)} documents. Modified {result.modified_count}.')
-                    updates = []
-
-            if updates:
-                result = await self.collection.bulk_write(updates)
-                total_modified_count += result.modified_count
-                logger.info(f'Processed the final batch of {len(updates)} documents. Modified {result.modified_count}.')
-
-            logger.info(f"Successfully updated {total_modified_count} documents in total with BSON vectors in field '{target_field}'.")
-            return total_modified_count
+            convert = partial(bson_vector_converter, target_field=target_field, vector_dtype=vector_dtype)
+            stats = await self._backfill(source_field, target_field, convert, batch_size, partitions, resume)
+            logger.info(f"Successfully updated {stats['modified']} documents in total with BSON vectors in field '{target_field}'.")
+            return stats['modified']
         except ValueError as ve:
             logger.error(f'Invalid vector dtype specified: {ve}')
             raise
@@ -165,29 +802,396 @@ class AsyncFashionRepository(BaseAsyncRepository):
             logger.error(f'Error adding BSON vector field: {e}')
             raise
 
-    async def remove_field(self, field_name: str) -> int:
+    async def _backfill(
+        self,
+        source_field: str,
+        target_field: str,
+        convert: Callable[[list[list[float]]], list[dict]],
+        batch_size: int | None = None,
+        partitions: int | None = None,
+        resume: bool = True,
+    ) -> dict[str, int]:
+        """source_field -> target_field 백필 (체크포인트 이름은 컬렉션 + 대상 필드)"""
+        checkpoint_collection = self.query_builder.config.get_migration_config().get('CHECKPOINT_COLLECTION')
+        backfill = PartitionedBackfill(
+            self.collection,
+            source_field,
+            convert,
+            name=f'backfill:{self.collection_name}:{target_field}',
+            checkpoint_store=CheckpointStore(self.collection.database[checkpoint_collection]),
+            partitions=partitions,
+            batch_size=batch_size,
+        )
+        return await backfill.run(resume=resume)
+
+    # ===========================================================================
+    # 벡터 양자화 (int8 / binary)
+    # ===========================================================================
+    async def sample_vectors(self, source_field: str, sample_size: int) -> np.ndarray:
+        """$sample 로 임의의 문서를 뽑아 source_field 벡터만 (n, dim) float32 행렬로 반환"""
+        pipeline = [
+            {'$match': {source_field: {'$exists': True}}},
+            {'$sample': {'size': sample_size}},
+            {'$project': {'_id': 0, source_field: 1}},
+        ]
+        cursor = await self.collection.aggregate(pipeline)
+        vectors = [vector async for doc in cursor if isinstance(vector := get_path(doc, source_field), list)]
+        return np.asarray(vectors, dtype=np.float32)
+
+    async def calibrate_quantizers(
+        self, source_field: str, sample_size: int = 5000, per_dimension: bool = False
+    ) -> tuple[ScalarQuantizer, BinaryQuantizer]:
+        """
+        카탈로그 샘플로 int8 scale/offset 과 binary 임계값을 보정합니다.
+
+        Args:
+            source_field (str): float32 소스 벡터 필드
+            sample_size (int): 보정에 사용할 샘플 수
+            per_dimension (bool): int8 차원별 보정 여부.
+                add_quantized_vector_fields 로 Atlas 에 인덱싱할 코드는 코드 공간 cosine 이 보존되도록 False (공통 scale, offset 0),
+                decode 후 애플리케이션에서 재정렬할 때만 True
+        """
+        vectors = await self.sample_vectors(source_field, sample_size)
+        if len(vectors) == 0:
+            raise ValueError(f"No vectors found in field '{source_field}' for calibration")
+        logger.info(f'Calibrating quantizers on {len(vectors)} vectors ({vectors.shape[1]} dims, per_dimension={per_dimension})')
+        return ScalarQuantizer().calibrate(vectors, per_dimension=per_dimension), BinaryQuantizer().calibrate(vectors)
+
+    async def add_quantized_vector_fields(
+        self,
+        source_field: str,
+        scalar_quantizer: ScalarQuantizer | None = None,
+        binary_quantizer: BinaryQuantizer | None = None,
+        int8_field: str | None = None,
+        binary_field: str | None = None,
+        batch_size: int = 500,
+    ) -> int:
+        """
+        보정된 양자화기로 int8 / packed bit BSON 벡터 필드를 추가합니다.
+
+        Args:
+            source_field (str): float32 소스 벡터 필드
+            scalar_quantizer (ScalarQuantizer, optional): int8 양자화기 (int8_field 와 함께 지정)
+            binary_quantizer (BinaryQuantizer, optional): binary 양자화기 (binary_field 와 함께 지정)
+            int8_field (str, optional): int8 BSON 벡터를 저장할 필드
+            binary_field (str, optional): packed bit BSON 벡터를 저장할 필드
+            batch_size (int): bulk_write 배치 크기
+
+        Returns:
+            int: 업데이트된 문서의 수
+        """
+        targets = []
+        if int8_field and scalar_quantizer:
+            targets.append((int8_field, scalar_quantizer))
+        if binary_field and binary_quantizer:
+            targets.append((binary_field, binary_quantizer))
+        if not targets:
+            raise ValueError('At least one of (int8_field, scalar_quantizer) or (binary_field, binary_quantizer) is required')
+
+        convert = partial(quantized_vector_converter, targets=targets)
+        stats = await self._backfill(source_field, '+'.join(field for field, _ in targets), convert, batch_size)
+        logger.info(f'Successfully wrote quantized vectors {[field for field, _ in targets]} to {stats["modified"]} documents.')
+        return stats['modified']
+
+    async def benchmark_quantization_recall(self, source_field: str, sample_size: int = 5000, num_queries: int = 100, k: int = 10) -> dict[str, Any]:
+        """
+        카탈로그 샘플 중 num_queries 개를 쿼리로 사용해 float32 대비 int8 / binary recall@k 를 측정합니다.
+
+        Returns:
+            dict[str, Any]: benchmark_quantization 결과
+        """
+        vectors = await self.sample_vectors(source_field, sample_size + num_queries)
+        queries, corpus = vectors[:num_queries], vectors[num_queries:]
+        report = benchmark_quantization(corpus, queries, k=k)
+        logger.info(
+            f'Quantization recall@{k}: int8={report["int8"]["recall"]:.3f}, binary={report["binary"]["recall"]:.3f}, '
+            f'binary_rescored={report["binary_rescored"]["recall"]:.3f} ({len(corpus)} vectors, {len(queries)} queries)'
+        )
+        return report
+
+    # ===========================================================================
+    # 상품 단위 collapse + MMR 다양화 검색
+    # ===========================================================================
+    async def diverse_vector_search(
+        self,
+        embedding: list[float],
+        limit: int,
+        pre_filter: dict | None = None,
+        mmr: bool = True,
+        mmr_lambda: float | None = None,
+        profile: str | None = None,
+    ) -> list[dict]:
+        """
+        서로 다른 상품 limit 개를 반환하는 벡터 검색
+        SKU 후보를 학습된 oversampling 배수만큼 가져와 상품 단위로 collapse 하고, mmr 이면 후보 상품 중 MMR 로 limit 개를 고릅니다.
+        후보가 모자라면(oversampling 배수가 부족했던 경우) 관측한 비율로 한 번만 다시 조회합니다.
+
+        Args:
+            embedding (list[float]): 쿼리 임베딩
+            limit (int): 반환할 상품 수
+            pre_filter (dict, optional): 사전 필터링 조건
+            mmr (bool): MMR 다양화 적용 여부
+            mmr_lambda (float, optional): MMR 관련도 가중치. 기본값은 DIVERSIFY_SETTINGS.MMR_LAMBDA
+            profile (str, optional): 프로젝션 프로필 이름
+
+        Returns:
+            list[dict]: 상품당 하나의 SKU 문서 (sku_hits: 해당 상품의 SKU 히트 수)
+        """
+        diversify_config = self.query_builder.config.get_diversify_config()
+        embedding_field = self.query_builder.vector_search_config.get('EMBEDDING_FIELD_PATH')
+        product_limit = limit * diversify_config.get('MMR_POOL_MULTIPLIER') if mmr else limit
+
+        products: list[dict] = []
+        for attempt in range(2):
+            candidate_limit = product_limit * self.product_oversampler.factor()
+            products = await self._collapsed_vector_search(embedding, candidate_limit, product_limit, pre_filter, profile, include_vector=mmr)
+            hits = sum(doc.get('sku_hits', 1) for doc in products)
+            self.product_oversampler.observe(hits, len(products))
+            # 상품 수가 모자라도 후보가 candidate_limit 에 못 미쳤다면 필터를 통과한 SKU 를 모두 본 것
+            if len(products) >= product_limit or hits < candidate_limit:
+                break
+            logger.info(f'diverse_vector_search: {len(products)}/{product_limit} products from {candidate_limit} candidates, retrying (attempt {attempt + 1})')
+
+        if mmr and products:
+            vectors = [get_path(doc, embedding_field) for doc in products]
+            if all(isinstance(vector, list) for vector in vectors):
+                order = mmr_select(np.asarray(embedding, dtype=np.float32), np.asarray(vectors, dtype=np.float32), limit, mmr_lambda or diversify_config.get('MMR_LAMBDA'))
+                products = [products[i] for i in order]
+            for doc in products:
+                _pop_path(doc, embedding_field)
+        results = products[:limit]
+        self.projection_stats.record(profile, results, 'diverse_vector_search')
+        return results
+
+    async def _collapsed_vector_search(
+        self,
+        embedding: list[float],
+        candidate_limit: int,
+        product_limit: int,
+        pre_filter: dict | None,
+        profile: str | None,
+        include_vector: bool,
+    ) -> list[dict]:
+        """candidate_limit 개 SKU 후보를 상품 단위로 collapse (Atlas 는 $group, 로컬 엔진은 $in 조회 후 collapse_by_key)"""
+        product_key = self.query_builder.config.get_diversify_config().get('PRODUCT_KEY_PATH')
+        if self.vector_engine is None:
+            pipeline = self.query_builder.collapsed_vector_search_pipeline(
+                embedding=embedding,
+                candidate_limit=candidate_limit,
+                product_limit=product_limit,
+                pre_filter=pre_filter,
+                profile=profile,
+                include_vector=include_vector,
+            )
+            try:
+                cursor = await self.collection.aggregate(pipeline)
+                return [doc async for doc in cursor]
+            except Exception as e:
+                logger.error(f'Error during collapsed vector search (async): {e}')
+                raise e
+
+        hits = await self._local_vector_hits(embedding, candidate_limit, pre_filter)
+        if not hits:
+            return []
+        projection = {**self.query_builder.projection(profile), product_key: 1}
+        if include_vector:
+            projection[self.query_builder.vector_search_config.get('EMBEDDING_FIELD_PATH')] = 1
+        cursor = self.collection.find({'_id': {'$in': [doc_id for doc_id, _ in hits]}}, projection=projection)
+        documents = {doc['_id']: doc async for doc in cursor}
+        ranked = [{**documents[doc_id], 'score': score} for doc_id, score in hits if doc_id in documents]
+
+        sku_hits: dict[Any, int] = {}
+        for doc in ranked:
+            key = get_path(doc, product_key)
+            sku_hits[key] = sku_hits.get(key, 0) + 1
+        return [{**doc, 'sku_hits': sku_hits[get_path(doc, product_key)]} for doc in collapse_by_key(ranked, product_limit, product_key)]
+
+    # ===========================================================================
+    # 2단계(축소 차원 -> 전체 차원) 벡터 검색
+    # ===========================================================================
+    def _default_reducer(self) -> DimensionReducer:
+        if self.dimension_reducer is not None:
+            return self.dimension_reducer
+        two_stage_config = self.query_builder.config.get_two_stage_search_config()
+        if two_stage_config.get('METHOD') != 'truncate':
+            raise ValueError('PCA reducer must be fitted offline and set via dimension_reducer (fit_dimension_reducer / DimensionReducer.load)')
+        return DimensionReducer('truncate', two_stage_config.get('REDUCED_DIMENSIONS'))
+
+    async def fit_dimension_reducer(
+        self,
+        source_field: str,
+        method: str | None = None,
+        dimensions: int | None = None,
+        sample_size: int = 5000,
+    ) -> DimensionReducer:
+        """카탈로그 샘플로 차원 축소기를 보정하고 two_stage_vector_search 에 사용하도록 설정합니다."""
+        two_stage_config = self.query_builder.config.get_two_stage_search_config()
+        vectors = await self.sample_vectors(source_field, sample_size)
+        if len(vectors) == 0:
+            raise ValueError(f"No vectors found in field '{source_field}' for dimension reduction")
+        reducer = DimensionReducer(method or two_stage_config.get('METHOD')).fit(vectors, dimensions or two_stage_config.get('REDUCED_DIMENSIONS'))
+        logger.info(
+            f'Fitted {reducer.method} reducer {vectors.shape[1]} -> {reducer.dimensions} dims on {len(vectors)} vectors '
+            f'(explained variance: {reducer.explained_variance_ratio})'
+        )
+        self.dimension_reducer = reducer
+        return reducer
+
+    async def add_reduced_vector_field(
+        self,
+        source_field: str,
+        reducer: DimensionReducer | None = None,
+        target_field: str | None = None,
+        batch_size: int = 500,
+    ) -> int:
+        """
+        축소 차원 float32 BSON 벡터 필드를 추가합니다. (REDUCED_VECTOR_INDEX 로 인덱싱)
+
+        Returns:
+            int: 업데이트된 문서의 수
+        """
+        reducer = reducer or self._default_reducer()
+        target_field = target_field or self.query_builder.config.get_two_stage_search_config().get('REDUCED_EMBEDDING_FIELD_PATH')
+
+        convert = partial(reduced_vector_converter, target_field=target_field, reducer=reducer)
+        stats = await self._backfill(source_field, target_field, convert, batch_size)
+        logger.info(f"Successfully wrote {reducer.dimensions}-dim reduced vectors to '{target_field}' for {stats['modified']} documents.")
+        return stats['modified']
+
+    async def two_stage_vector_search(
+        self,
+        embedding: list[float],
+        limit: int,
+        pre_filter: dict | None = None,
+        candidate_multiplier: int | None = None,
+        profile: str | None = None,
+    ) -> list[dict]:
+        """
+        축소 차원 인덱스로 limit * candidate_multiplier 개 후보를 뽑고 전체 차원 exact cosine 으로 재정렬합니다.
+        1단계 파이프라인이 후보의 전체 벡터를 함께 가져오므로 한 번의 aggregate 로 처리됩니다.
+
+        Args:
+            embedding (list[float]): 전체 차원 쿼리 임베딩
+            limit (int): 결과 개수
+            pre_filter (dict, optional): 사전 필터링 조건
+            candidate_multiplier (int, optional): 후보 배수. 기본값은 TWO_STAGE_SEARCH_SETTINGS.CANDIDATE_MULTIPLIER
+            profile (str, optional): 프로젝션 프로필 이름
+
+        Returns:
+            list[dict]: 전체 차원 점수 높은 순 결과 (score 는 vectorSearchScore 와 같은 (1 + cosine) / 2)
+        """
+        two_stage_config = self.query_builder.config.get_two_stage_search_config()
+        full_field = self.query_builder.vector_search_config.get('EMBEDDING_FIELD_PATH')
+        reducer = self._default_reducer()
+        candidate_multiplier = candidate_multiplier or two_stage_config.get('CANDIDATE_MULTIPLIER')
+        self.query_builder.validate_embedding(embedding)
+
+        pipeline = self.query_builder.vector_search_pipeline(
+            embedding=reducer.transform(embedding)[0].tolist(),
+            limit=limit * candidate_multiplier,
+            pre_filter=pre_filter,
+            index_name=two_stage_config.get('REDUCED_VECTOR_INDEX'),
+            embedding_field_path=two_stage_config.get('REDUCED_EMBEDDING_FIELD_PATH'),
+            profile=profile,
+            dimensions=reducer.dimensions,
+        )
+        pipeline[-1]['$project'][full_field] = 1
+        try:
+            cursor = await self.collection.aggregate(pipeline)
+            candidates = [doc async for doc in cursor]
+        except Exception as e:
+            logger.error(f'Error during two-stage vector search (async): {e}')
+            raise e
+
+        candidates = [doc for doc in candidates if isinstance(get_path(doc, full_field), list)]
+        if not candidates:
+            return []
+        vectors = normalize_rows(np.asarray([get_path(doc, full_field) for doc in candidates], dtype=np.float32))
+        sims = vectors @ normalize_rows(np.asarray(embedding, dtype=np.float32))
+        results = []
+        for i in top_k(sims, limit):
+            doc = candidates[i]
+            _pop_path(doc, full_field)
+            results.append({**doc, 'score': float(cosine_to_score(sims[i]))})
+        self.projection_stats.record(profile, results, 'two_stage_vector_search')
+        return results
+
+    async def benchmark_two_stage_recall(
+        self,
+        source_field: str,
+        reducer: DimensionReducer | None = None,
+        sample_size: int = 5000,
+        num_queries: int = 100,
+        k: int = 10,
+    ) -> dict[str, Any]:
+        """
+        카탈로그 샘플 중 num_queries 개를 쿼리로 사용해 전체 차원 대비 2단계 검색의 recall@k / 지연시간을 측정합니다.
+
+        Returns:
+            dict[str, Any]: benchmark_two_stage 결과
+        """
+        vectors = await self.sample_vectors(source_field, sample_size + num_queries)
+        queries, corpus = vectors[:num_queries], vectors[num_queries:]
+        reducer = reducer or self._default_reducer()
+        if not reducer.is_fitted:
+            reducer.fit(corpus)
+        report = benchmark_two_stage(corpus, queries, reducer, k=k)
+        summary = ', '.join(f'{name}={value["recall"]:.3f}/{value["ms_per_query"]:.2f}ms' for name, value in report.items() if name.startswith('x'))
+        logger.info(
+            f'Two-stage recall@{k} ({reducer.method} {report["dimensions"]} -> {reducer.dimensions}): {summary} '
+            f'(full {report["full"]["ms_per_query"]:.2f}ms, {len(corpus)} vectors, {len(queries)} queries)'
+        )
+        return report
+
+    async def remove_field(self, field_name: str, dry_run: bool = False, resume: bool = True) -> int:
         """
         컬렉션의 모든 문서에서 특정 필드를 제거합니다.
+        운영 트래픽에 영향을 주지 않도록 _id 범위 배치 + 스로틀링으로 적용합니다. (SchemaMigrationRunner)
 
         Args:
             field_name (str): 제거할 필드의 이름.
+            dry_run (bool): True 면 제거하지 않고 대상 문서 수만 반환
+            resume (bool): 중단된 같은 작업이 있으면 이어서 진행
 
         Returns:
-            int: 필드가 제거된 문서의 수.
+            int: 필드가 제거된 문서의 수. (dry_run 이면 대상 문서 수)
         """
         try:
-            result = await self.collection.update_many({field_name: {'$exists': True}}, {'$unset': {field_name: ''}})
-            logger.info(f"Successfully removed field '{field_name}' from {result.modified_count} documents.")
-            return result.modified_count
+            report = await self.apply_schema_migration(SchemaMigration.unset(self.collection_name, field_name), dry_run=dry_run, resume=resume)
+            if dry_run:
+                return report['matching']
+            logger.info(f"Successfully removed field '{field_name}' from {report['modified']} documents.")
+            return report['modified']
         except Exception as e:
             logger.error(f"Error removing field '{field_name}': {e}")
             raise
 
+    async def apply_schema_migration(self, migration: SchemaMigration, dry_run: bool = False, resume: bool = True) -> dict[str, Any]:
+        """
+        $set / $unset / $rename 스키마 변경을 스로틀링된 배치로 적용합니다.
+
+        Usage:
+            await repo.apply_schema_migration(SchemaMigration.rename(repo.collection_name, 'old', 'new'), dry_run=True)
+
+        Returns:
+            dict[str, Any]: dry_run 이면 SchemaMigrationRunner.dry_run, 아니면 SchemaMigrationRunner.run 결과
+        """
+        checkpoint_collection = self.query_builder.config.get_migration_config().get('CHECKPOINT_COLLECTION')
+        runner = SchemaMigrationRunner(self.collection, CheckpointStore(self.collection.database[checkpoint_collection]))
+        if dry_run:
+            return await runner.dry_run(migration)
+        return await runner.run(migration, resume=resume)
+
     async def get_product_description_info(self, product_id: str) -> str | None:
         """
         products.product_id를 사용하여 해당 상품의 description_info를 비동기적으로 조회합니다.
-
+        read_cache 가 설정되어 있으면 L1 / L2 캐시를 먼저 조회합니다.
         """
+        if self.read_cache is not None:
+            return await self.read_cache.get_or_load(self.read_cache.description_key(product_id), lambda: self._get_product_description_info(product_id))
+        return await self._get_product_description_info(product_id)
+
+    async def _get_product_description_info(self, product_id: str) -> str | None:
         try:
             # products.product_id로 문서를 찾고, products.description_info 필드만 프로젝션합니다.
             # find_one을 사용하여 하나의 문서만 가져옵니다.
@@ -201,3 +1205,33 @@ class AsyncFashionRepository(BaseAsyncRepository):
         except Exception as e:
             logger.error(f'Error getting description_info for product_id {product_id}: {e}')
             raise Exception(f'Error getting description_info for product_id {product_id}: {e}') from e
+
+
+def _touches_path(updated_path: str, path: str) -> bool:
+    """$set 경로 updated_path 가 path 의 값을 바꿀 수 있는지 (같은 경로이거나 상위 / 하위 경로)"""
+    return updated_path == path or path.startswith(f'{updated_path}.') or updated_path.startswith(f'{path}.')
+
+
+def _pop_path(document: dict, path: str) -> None:
+    """점(.) 경로의 값을 제거하고 비게 된 상위 dict 도 정리"""
+    keys = path.split('.')
+    parents = [document]
+    for key in keys[:-1]:
+        child = parents[-1].get(key)
+        if not isinstance(child, dict):
+            return
+        parents.append(child)
+    parents[-1].pop(keys[-1], None)
+    for parent, key in zip(reversed(parents[:-1]), reversed(keys[:-1]), strict=True):
+        if parent.get(key) == {}:
+            parent.pop(key)
+
+
+async def _as_async_iterator(documents: Any) -> AsyncIterator[dict]:
+    """리스트와 비동기 커서를 동일하게 순회"""
+    if isinstance(documents, list):
+        for doc in documents:
+            yield doc
+    else:
+        async for doc in documents:
+            yield doc
@@ -1,13 +1,19 @@
 from .base_sync import BaseRepository
-from typing import Dict, Any, Optional, List, override, Iterator
-from pymongo.errors import DuplicateKeyError, BulkWriteError, WriteError
+from typing import Dict, Any, Optional, List, override, Iterator, Iterable, Tuple
+from pymongo.errors import DuplicateKeyError, BulkWriteError, WriteError, ConnectionFailure, PyMongoError
 from pymongo.client_session import ClientSession
 from pymongo.operations import InsertOne
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+import bson
 import logging
+import time
 from embedding import JinaEmbedding
 
 logger = logging.getLogger(__name__)
 
+DUPLICATE_KEY_ERROR = 11000
+
 """
 어떻게 데이터를 가지고 올 것인지에 대한 작성 
 
@@ -114,13 +120,16 @@ class FashionRepository(BaseRepository):
     # ============================================================================
     # Bulk Write 기능
     # ============================================================================
-    def bulk_insert_documents(self, session: ClientSession, documents: List[Dict[str, Any]], ordered: bool = False) -> Dict[str, Any]:
+    def bulk_insert_documents(
+        self, session: ClientSession, documents: List[Dict[str, Any]], ordered: bool = False, chunked: bool = False
+    ) -> Dict[str, Any]:
         """
         MongoDB bulk write를 이용한 대량 문서 삽입
 
         Args:
             documents (List[Dict[str, Any]]): 삽입할 문서 리스트
             ordered (bool): 순서대로 처리할지 여부 (False면 병렬 처리)
+            chunked (bool): True 면 트랜잭션 하나 대신 청크 단위 병렬 삽입 (_bulk_insert_chunked, session 미사용)
 
         Returns:
             Dict[str, Any]: 삽입 결과 정보
@@ -133,7 +142,8 @@ class FashionRepository(BaseRepository):
                     "execution_time": float
                 }
         """
-        import time
+        if chunked:
+            return self._bulk_insert_chunked(documents)
 
         start_time = time.time()
         result_info = {'success': False, 'inserted_count': 0, 'error_count': 0, 'errors': [], 'inserted_ids': [], 'execution_time': 0.0}
@@ -188,6 +198,139 @@ class FashionRepository(BaseRepository):
 
         return result_info
 
+    def _bulk_insert_chunked(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        대량 문서를 크기 제한 청크로 나눠 여러 스레드에서 동시에 unordered bulk_write 로 삽입
+
+        - 청크는 문서 수(CHUNK_SIZE)와 BSON 크기 합(MAX_CHUNK_BYTES) 중 먼저 닿는 기준으로 자름
+        - 청크마다 일시적 오류(연결 끊김 / RetryableWriteError) 는 MAX_RETRIES 번까지 재시도
+        - 청크 간 원자성은 없음 (실패한 청크만 errors 에 기록되고 나머지는 반영됨)
+
+        Returns:
+            Dict[str, Any]: bulk_insert_documents 의 결과 + chunk_count / total_bytes / docs_per_second / mb_per_second
+                (inserted_ids 는 documents 순서대로 삽입에 성공한 문서의 _id)
+        """
+        bulk_insert_config = self.query_builder.config.get_bulk_insert_config()
+        start_time = time.time()
+        result_info = {
+            'success': False,
+            'inserted_count': 0,
+            'error_count': 0,
+            'errors': [],
+            'inserted_ids': [],
+            'execution_time': 0.0,
+            'chunk_count': 0,
+            'total_bytes': 0,
+            'docs_per_second': 0.0,
+            'mb_per_second': 0.0,
+        }
+
+        if not documents:
+            raise ValueError('No documents provided for bulk insert')
+
+        chunks = self._split_into_chunks(documents, bulk_insert_config.get('CHUNK_SIZE'), bulk_insert_config.get('MAX_CHUNK_BYTES'))
+        result_info['chunk_count'] = len(chunks)
+        result_info['total_bytes'] = sum(chunk_bytes for _, _, chunk_bytes in chunks)
+        logger.info(f'Starting chunked bulk insert for {len(documents)} documents in {len(chunks)} chunks')
+
+        max_retries = bulk_insert_config.get('MAX_RETRIES')
+        retry_backoff = bulk_insert_config.get('RETRY_BACKOFF_SECONDS')
+        with ThreadPoolExecutor(max_workers=bulk_insert_config.get('MAX_WORKERS')) as executor:
+            futures = {
+                executor.submit(self._insert_chunk, chunk, max_retries, retry_backoff): offset for offset, chunk, _ in chunks
+            }
+            inserted_ids_by_offset = {}
+            for future in as_completed(futures):
+                offset = futures[future]
+                inserted_ids, errors = future.result()
+                inserted_ids_by_offset[offset] = inserted_ids
+                result_info['inserted_count'] += len(inserted_ids)
+                for error_info in errors:
+                    # 청크 내 index -> 전체 documents 기준 index
+                    if error_info.get('index') is not None:
+                        error_info['index'] += offset
+                    result_info['errors'].append(error_info)
+                    result_info['error_count'] += error_info.pop('count', 1)
+        result_info['inserted_ids'] = [doc_id for offset in sorted(inserted_ids_by_offset) for doc_id in inserted_ids_by_offset[offset]]
+
+        result_info['success'] = result_info['error_count'] == 0
+        result_info['execution_time'] = time.time() - start_time
+        elapsed = max(result_info['execution_time'], 1e-9)
+        result_info['docs_per_second'] = result_info['inserted_count'] / elapsed
+        result_info['mb_per_second'] = result_info['total_bytes'] / (1024 * 1024) / elapsed
+
+        if result_info['success']:
+            logger.info(
+                f'Chunked bulk insert completed in {result_info["execution_time"]:.2f}s: {result_info["inserted_count"]} documents '
+                f'({result_info["docs_per_second"]:.0f} docs/s, {result_info["mb_per_second"]:.1f} MB/s)'
+            )
+        else:
+            logger.error(
+                f'Chunked bulk insert finished with {result_info["error_count"]} errors after {result_info["execution_time"]:.2f}s: '
+                f'{result_info["inserted_count"]} inserted'
+            )
+
+        return result_info
+
+    @staticmethod
+    def _split_into_chunks(documents: List[Dict[str, Any]], chunk_size: int, max_chunk_bytes: int) -> List[tuple]:
+        """문서 리스트를 (시작 offset, 청크, BSON 크기 합) 리스트로 분할"""
+        chunks = []
+        chunk, chunk_bytes, offset = [], 0, 0
+        for index, document in enumerate(documents):
+            document_bytes = len(bson.encode(document))
+            if chunk and (len(chunk) >= chunk_size or chunk_bytes + document_bytes > max_chunk_bytes):
+                chunks.append((offset, chunk, chunk_bytes))
+                chunk, chunk_bytes, offset = [], 0, index
+            chunk.append(document)
+            chunk_bytes += document_bytes
+        if chunk:
+            chunks.append((offset, chunk, chunk_bytes))
+        return chunks
+
+    def _insert_chunk(self, chunk: List[Dict[str, Any]], max_retries: int, retry_backoff: float) -> tuple:
+        """
+        청크 하나를 unordered bulk_write 로 삽입 (일시적 오류 시 지수 백오프 재시도)
+
+        재시도 시에는 이전 시도에서 이미 삽입된 문서가 중복 키(11000) 오류로 돌아오므로 삽입된 것으로 셉니다.
+        unordered 이므로 오류가 난 index 를 제외한 문서는 모두 삽입된 것이며, _id 는 InsertOne 이 문서에 채워 넣습니다.
+
+        Returns:
+            tuple: (삽입된 문서 _id 리스트, 오류 정보 리스트)
+        """
+        attempt = 0
+        while True:
+            try:
+                self.collection.bulk_write([InsertOne(doc) for doc in chunk], ordered=False)
+                return [doc['_id'] for doc in chunk], []
+            except BulkWriteError as bwe:
+                write_errors = bwe.details.get('writeErrors', [])
+                failed = set()
+                errors = []
+                for write_error in write_errors:
+                    if attempt > 0 and write_error.get('code') == DUPLICATE_KEY_ERROR:
+                        continue
+                    failed.add(write_error.get('index'))
+                    errors.append(
+                        {
+                            'type': 'bulk_write_error',
+                            'index': write_error.get('index'),
+                            'code': write_error.get('code'),
+                            'message': write_error.get('errmsg', 'Unknown bulk write error'),
+                            'document_id': write_error.get('op', {}).get('_id', 'Unknown'),
+                        }
+                    )
+                return [doc['_id'] for index, doc in enumerate(chunk) if index not in failed], errors
+            except PyMongoError as e:
+                transient = isinstance(e, ConnectionFailure) or e.has_error_label('RetryableWriteError')
+                if not transient or attempt >= max_retries:
+                    logger.error(f'Chunk insert failed after {attempt + 1} attempts: {e}')
+                    return [], [{'type': 'chunk_error', 'message': str(e), 'error_class': type(e).__name__, 'count': len(chunk)}]
+                delay = retry_backoff * (2**attempt)
+                attempt += 1
+                logger.warning(f'Transient error inserting chunk of {len(chunk)} documents, retry {attempt}/{max_retries} in {delay:.1f}s: {e}')
+                time.sleep(delay)
+
     def bulk_update_documents(
         self, session: ClientSession, document_ids: List[str], update_data: Dict[str, Any], ordered: bool = False
     ) -> Dict[str, Any]:
@@ -262,6 +405,103 @@ class FashionRepository(BaseRepository):
 
         return result_info
 
+    def bulk_update_document_payloads(self, updates: Iterable[Tuple[str, Dict[str, Any]]], ordered: bool = False) -> Dict[str, Any]:
+        """
+        문서마다 다른 $set 값을 적용하는 대량 업데이트 (가격 피드, 태그 재계산 등)
+
+        updates 는 리스트뿐 아니라 제너레이터도 받으며, 청크 크기만큼씩만 읽어 bulk_write 합니다.
+        청크 크기는 INITIAL_CHUNK_SIZE 에서 시작해 관측한 청크 지연에 맞춰 MIN ~ MAX_CHUNK_SIZE 사이에서 조절됩니다.
+
+        Args:
+            updates (Iterable[Tuple[str, Dict[str, Any]]]): (문서 ID, $set 할 필드 dict) 쌍
+            ordered (bool): 순서대로 처리할지 여부 (False면 병렬 처리)
+
+        Returns:
+            Dict[str, Any]: 업데이트 결과 정보
+                {
+                    "success": bool,
+                    "matched_count": int,
+                    "modified_count": int,
+                    "error_count": int,
+                    "errors": List[Dict],
+                    "chunks": List[Dict],  # 청크별 size / latency_ms / modified_count
+                    "execution_time": float
+                }
+        """
+        from pymongo.operations import UpdateOne
+
+        bulk_update_config = self.query_builder.config.get_bulk_update_config()
+        min_chunk_size = bulk_update_config.get('MIN_CHUNK_SIZE')
+        max_chunk_size = bulk_update_config.get('MAX_CHUNK_SIZE')
+        target_latency_ms = bulk_update_config.get('TARGET_CHUNK_LATENCY_MS')
+        chunk_size = bulk_update_config.get('INITIAL_CHUNK_SIZE')
+
+        start_time = time.time()
+        result_info = {'success': False, 'matched_count': 0, 'modified_count': 0, 'error_count': 0, 'errors': [], 'chunks': [], 'execution_time': 0.0}
+
+        iterator = iter(updates)
+        offset = 0
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            # 빈 payload 는 건너뛰되 오류 index 는 updates 기준으로 보고
+            positions = [position for position, (_, update_data) in enumerate(chunk) if update_data]
+            operations = [UpdateOne({'_id': chunk[position][0]}, {'$set': chunk[position][1]}) for position in positions]
+
+            chunk_start = time.perf_counter()
+            modified_count = 0
+            try:
+                if operations:
+                    bulk_result = self.collection.bulk_write(operations, ordered=ordered)
+                    result_info['matched_count'] += bulk_result.matched_count
+                    modified_count = bulk_result.modified_count
+            except BulkWriteError as bwe:
+                result_info['matched_count'] += bwe.details.get('nMatched', 0)
+                modified_count = bwe.details.get('nModified', 0)
+                for write_error in bwe.details.get('writeErrors', []):
+                    result_info['errors'].append(
+                        {
+                            'type': 'bulk_write_error',
+                            'index': offset + positions[write_error.get('index', 0)],
+                            'code': write_error.get('code'),
+                            'message': write_error.get('errmsg', 'Unknown bulk write error'),
+                            'document_id': chunk[positions[write_error.get('index', 0)]][0],
+                        }
+                    )
+                    result_info['error_count'] += 1
+            except Exception as e:
+                result_info['error_count'] += len(operations)
+                result_info['errors'].append({'type': 'unexpected_error', 'index': offset, 'message': str(e), 'error_class': type(e).__name__})
+                logger.error(f'Unexpected error during bulk update of chunk at {offset}: {e}')
+            latency_ms = (time.perf_counter() - chunk_start) * 1000
+
+            result_info['modified_count'] += modified_count
+            result_info['chunks'].append({'offset': offset, 'size': len(chunk), 'latency_ms': round(latency_ms, 1), 'modified_count': modified_count})
+            offset += len(chunk)
+
+            # 지연이 목표를 넘으면 절반, 여유가 크면 두 배
+            if latency_ms > target_latency_ms:
+                chunk_size = max(min_chunk_size, chunk_size // 2)
+            elif latency_ms < target_latency_ms / 2:
+                chunk_size = min(max_chunk_size, chunk_size * 2)
+
+        if not result_info['chunks']:
+            raise ValueError('No updates provided for bulk update')
+
+        result_info['success'] = result_info['error_count'] == 0
+        result_info['execution_time'] = time.time() - start_time
+
+        if result_info['success']:
+            logger.info(
+                f'Bulk payload update completed in {result_info["execution_time"]:.2f}s: {result_info["modified_count"]} of {offset} documents modified '
+                f'in {len(result_info["chunks"])} chunks'
+            )
+        else:
+            logger.error(f'Bulk payload update finished with {result_info["error_count"]} errors after {result_info["execution_time"]:.2f}s')
+
+        return result_info
+
     # def bulk_insert_with_validation(self, documents: List[Dict[str, Any]],
     #                                validation_rules: Optional[Dict] = None) -> Dict[str, Any]:
     #     """
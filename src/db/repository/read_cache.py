@@ -0,0 +1,165 @@
+"""
+상품 조회용 2단계 read-through 캐시
+
+- L1 : 프로세스 내 LRU + TTL (마이크로초 단위 조회, 워커마다 독립)
+- L2 : RedisCacheClient (프로세스 / 워커 간 공유)
+- 미스 시 loader(Mongo 조회) 결과로 L2, L1 을 채우며, 같은 키의 동시 미스는 한 번의 조회로 합침
+- 문서가 바뀌면 invalidate_document 로 모든 프로젝션 변형을, description_info 가 바뀌면 invalidate_description 으로 상품 설명을 L1 / L2 에서 삭제
+  (다른 프로세스의 L1 은 L1_TTL 이내로만 오래된 값을 보여줌)
+- 조회 도중 같은 키가 무효화되면 그 조회 결과로 L1 / L2 를 채우지 않음 (무효화 이전 값이 다시 캐싱되는 것을 방지)
+"""
+
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from bson import json_util
+from loguru import logger
+
+from db.config.config import Config
+from db.query_builders.projections import PROJECTION_PROFILES
+
+if TYPE_CHECKING:
+    from redis_cache.client import RedisCacheClient
+
+FULL_DOCUMENT = 'full'
+
+
+class LRUTTLCache:
+    """크기 제한 LRU + 항목별 TTL 캐시"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class ProductReadCache:
+    """find_by_id / get_product_description_info 용 L1(LRU) + L2(Redis) read-through 캐시"""
+
+    def __init__(self, redis_client: 'RedisCacheClient | None' = None, l1_maxsize: int | None = None, l1_ttl: float | None = None, l2_ttl: int | None = None):
+        """
+        Args:
+            redis_client (RedisCacheClient, optional): 연결된 Redis 캐시 클라이언트. None 이면 L1 만 사용
+            l1_maxsize (int, optional): L1 최대 항목 수. 기본값은 READ_CACHE_SETTINGS.L1_MAXSIZE
+            l1_ttl (float, optional): L1 TTL(초)
+            l2_ttl (int, optional): L2 TTL(초)
+        """
+        cache_config = Config().get_read_cache_config()
+        self.redis_client = redis_client
+        self.l1 = LRUTTLCache(l1_maxsize or cache_config.get('L1_MAXSIZE'), l1_ttl or cache_config.get('L1_TTL'))
+        self.l2_ttl = l2_ttl or cache_config.get('L2_TTL')
+        self.key_prefix = cache_config.get('KEY_PREFIX')
+        self._inflight: dict[str, asyncio.Future] = {}
+        # 조회 중에 무효화된 키 (해당 조회 결과는 캐시에 쓰지 않음)
+        self._invalidated_inflight: set[str] = set()
+
+    def document_key(self, doc_id: str, profile: str | None = None) -> str:
+        return f'{self.key_prefix}:doc:{doc_id}:{profile or FULL_DOCUMENT}'
+
+    def description_key(self, product_id: str) -> str:
+        return f'{self.key_prefix}:desc:{product_id}'
+
+    async def _l2_get(self, key: str) -> Any | None:
+        if self.redis_client is None:
+            return None
+        try:
+            value = await self.redis_client.get(key, deserialize=False)
+            return json_util.loads(value) if value is not None else None
+        except Exception as e:
+            logger.warning(f'Product cache L2 lookup failed: {e}')
+            return None
+
+    async def _l2_set(self, key: str, value: Any) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            # ObjectId / datetime 등을 보존하기 위해 Extended JSON 으로 저장
+            await self.redis_client.set(key, json_util.dumps(value), ttl=self.l2_ttl, serialize=False)
+        except Exception as e:
+            logger.warning(f'Product cache L2 store failed: {e}')
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any | None:
+        """
+        L1 -> L2 -> loader 순서로 조회합니다. None 결과는 캐싱하지 않습니다.
+        반환값은 사본이므로 호출자가 수정해도 캐시에 영향을 주지 않습니다.
+        """
+        value = self.l1.get(key)
+        if value is not None:
+            return copy.deepcopy(value)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return copy.deepcopy(await asyncio.shield(inflight))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._l2_get(key)
+            from_l2 = value is not None
+            if value is None:
+                value = await loader()
+            # 조회 중에 invalidate 된 경우 무효화 이전에 읽은 값일 수 있으므로 캐시에 쓰지 않고 반환만 함
+            if value is not None and key not in self._invalidated_inflight:
+                if not from_l2:
+                    await self._l2_set(key, value)
+                if key not in self._invalidated_inflight:
+                    self.l1.set(key, value)
+            future.set_result(value)
+        except Exception as e:
+            future.set_exception(e)
+            # 대기 중인 호출자가 없을 때 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            self._invalidated_inflight.discard(key)
+        return copy.deepcopy(value)
+
+    async def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self.l1.delete(key)
+            if key in self._inflight:
+                self._invalidated_inflight.add(key)
+        if self.redis_client is None:
+            return
+        results = await asyncio.gather(*(self.redis_client.delete(key) for key in keys), return_exceptions=True)
+        for key, result in zip(keys, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f'Product cache L2 invalidation failed for {key}: {result}')
+
+    async def invalidate_document(self, doc_id: str) -> None:
+        """문서의 모든 프로젝션 변형(전체 문서 + 프로필) 캐시 삭제"""
+        await self.invalidate(*(self.document_key(doc_id, profile) for profile in (FULL_DOCUMENT, *PROJECTION_PROFILES)))
+
+    async def invalidate_description(self, product_id: str) -> None:
+        await self.invalidate(self.description_key(product_id))
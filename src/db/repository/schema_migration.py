@@ -0,0 +1,177 @@
+"""
+스로틀링되는 배치 스키마 마이그레이션 실행기
+
+필드 제거 / 이름 변경 / 값 재작성 같은 스키마 변경을 컬렉션 전체 update_many 한 번이 아니라
+_id 순서의 작은 범위 배치로 나눠 적용합니다.
+- 초당 문서 수 예산(ops/sec)을 토큰 버킷으로 지키고, 쓰기 지연이 목표를 넘으면 예산을 줄였다가 (곱셈 감소)
+  지연이 회복되면 조금씩 늘림 (덧셈 증가) -> 운영 트래픽(vector_search)의 지연을 보호
+- 배치마다 마지막 _id 를 CheckpointStore 에 저장하므로 중단된 마이그레이션은 이어서 진행
+- dry_run 은 대상 문서 수와 예상 소요 시간만 계산
+"""
+
+import asyncio
+import math
+import time
+from typing import Any
+
+from loguru import logger
+from pymongo.collection import Collection
+
+from db.config.config import Config
+
+from .checkpoint import CheckpointStore
+
+ALLOWED_OPERATORS = ('$set', '$unset', '$rename')
+
+
+class SchemaMigration:
+    """이름이 붙은 스키마 변경 정의 (filter 에 맞는 문서에 update 적용)"""
+
+    def __init__(self, name: str, filter_dict: dict, update: dict):
+        """
+        Args:
+            name (str): 마이그레이션 이름 (체크포인트 키)
+            filter_dict (dict): 대상 문서 조건 (예: {'old_field': {'$exists': True}})
+            update (dict): $set / $unset / $rename 업데이트 문서
+
+        Raises:
+            ValueError: 허용되지 않은 업데이트 연산자
+        """
+        unsupported = [operator for operator in update if operator not in ALLOWED_OPERATORS]
+        if not update or unsupported:
+            raise ValueError(f'update 는 {ALLOWED_OPERATORS} 연산자만 사용할 수 있습니다. : {unsupported or update}')
+        self.name = name
+        self.filter = filter_dict
+        self.update = update
+
+    @classmethod
+    def unset(cls, collection_name: str, field: str) -> 'SchemaMigration':
+        return cls(f'unset:{collection_name}:{field}', {field: {'$exists': True}}, {'$unset': {field: ''}})
+
+    @classmethod
+    def rename(cls, collection_name: str, field: str, new_field: str) -> 'SchemaMigration':
+        return cls(f'rename:{collection_name}:{field}:{new_field}', {field: {'$exists': True}}, {'$rename': {field: new_field}})
+
+
+class WriteThrottle:
+    """초당 문서 수 토큰 버킷 + 쓰기 지연 기반 AIMD 조절"""
+
+    def __init__(
+        self,
+        ops_per_second: float,
+        min_ops_per_second: float,
+        target_latency_ms: float,
+        backoff_factor: float = 0.5,
+        recovery_step: float = 0.1,
+    ):
+        """
+        Args:
+            ops_per_second (float): 최대(초기) 초당 문서 수 예산
+            min_ops_per_second (float): 조절 하한
+            target_latency_ms (float): 배치 쓰기 지연 목표. 넘으면 예산을 backoff_factor 배로 줄임
+            backoff_factor (float): 곱셈 감소 비율
+            recovery_step (float): 지연이 목표 이하일 때 늘릴 예산 (최대 예산 대비 비율)
+        """
+        self.max_rate = ops_per_second
+        self.min_rate = min_ops_per_second
+        self.rate = ops_per_second
+        self.target_latency_ms = target_latency_ms
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self._next_slot = 0.0
+
+    async def acquire(self, ops: int) -> None:
+        """ops 개 문서를 쓸 수 있을 때까지 대기"""
+        now = time.monotonic()
+        start = max(now, self._next_slot)
+        self._next_slot = start + ops / self.rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def observe(self, latency_ms: float) -> None:
+        if latency_ms > self.target_latency_ms:
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+        else:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery_step)
+
+
+class SchemaMigrationRunner:
+    """SchemaMigration 을 _id 범위 배치로 스로틀링하며 적용"""
+
+    def __init__(self, collection: Collection, checkpoint_store: CheckpointStore | None = None, batch_size: int | None = None, throttle: WriteThrottle | None = None):
+        """
+        Args:
+            collection (Collection): 대상 컬렉션
+            checkpoint_store (CheckpointStore, optional): None 이면 이어하기 없이 실행
+            batch_size (int, optional): 배치당 문서 수. 기본값은 SCHEMA_MIGRATION_SETTINGS.BATCH_SIZE
+            throttle (WriteThrottle, optional): 기본값은 SCHEMA_MIGRATION_SETTINGS 로 생성
+        """
+        migration_config = Config().get_schema_migration_config()
+        self.collection = collection
+        self.checkpoint_store = checkpoint_store
+        self.batch_size = batch_size or migration_config.get('BATCH_SIZE')
+        self.throttle = throttle or WriteThrottle(
+            ops_per_second=migration_config.get('OPS_PER_SECOND'),
+            min_ops_per_second=migration_config.get('MIN_OPS_PER_SECOND'),
+            target_latency_ms=migration_config.get('TARGET_WRITE_LATENCY_MS'),
+            backoff_factor=migration_config.get('BACKOFF_FACTOR'),
+            recovery_step=migration_config.get('RECOVERY_STEP'),
+        )
+
+    async def dry_run(self, migration: SchemaMigration) -> dict[str, Any]:
+        """대상 문서 수 / 배치 수 / 최대 예산 기준 예상 소요 시간"""
+        matching = await self.collection.count_documents(migration.filter)
+        report = {
+            'migration': migration.name,
+            'matching': matching,
+            'batches': math.ceil(matching / self.batch_size),
+            'estimated_seconds': round(matching / self.throttle.max_rate, 1),
+        }
+        logger.info(f'Schema migration dry run: {report}')
+        return report
+
+    async def run(self, migration: SchemaMigration, resume: bool = True) -> dict[str, Any]:
+        """
+        마이그레이션 실행
+
+        filter 에 맞는 문서의 _id 를 batch_size 개씩 오름차순으로 읽고, 그 범위에만 update_many 를 적용합니다.
+        진행은 _id 로만 전진하므로 업데이트 후에도 filter 에 맞는 문서($set 재작성 등)가 있어도 종료됩니다.
+
+        Returns:
+            dict[str, Any]: matched / modified / batches / resumed_after / ops_per_second(최종 예산)
+        """
+        checkpoint = await self.checkpoint_store.load(migration.name) if self.checkpoint_store is not None and resume else None
+        if checkpoint is not None and checkpoint.get('status') == 'completed':
+            checkpoint = None
+        resume_after = checkpoint.get('last_id') if checkpoint else None
+        last_id = resume_after
+        stats = {'matched': 0, 'modified': 0, 'batches': 0}
+        logger.info(f"Starting schema migration '{migration.name}' (batch_size={self.batch_size}, ops/s<={self.throttle.max_rate}, resume_after={resume_after})")
+
+        started = time.perf_counter()
+        while True:
+            query = {**migration.filter, '_id': {'$gt': last_id}} if last_id is not None else dict(migration.filter)
+            cursor = self.collection.find(query, projection={'_id': 1}).sort('_id', 1).limit(self.batch_size)
+            ids = [doc['_id'] async for doc in cursor]
+            if not ids:
+                break
+
+            await self.throttle.acquire(len(ids))
+            write_started = time.perf_counter()
+            result = await self.collection.update_many({**migration.filter, '_id': {'$gte': ids[0], '$lte': ids[-1]}}, migration.update)
+            latency_ms = (time.perf_counter() - write_started) * 1000
+            self.throttle.observe(latency_ms)
+
+            last_id = ids[-1]
+            stats['matched'] += result.matched_count
+            stats['modified'] += result.modified_count
+            stats['batches'] += 1
+            if self.checkpoint_store is not None:
+                await self.checkpoint_store.save(migration.name, last_id=last_id, status='running')
+            logger.debug(f"Schema migration '{migration.name}' batch {stats['batches']}: {result.modified_count} modified in {latency_ms:.0f}ms (budget {self.throttle.rate:.0f} ops/s)")
+
+        if self.checkpoint_store is not None:
+            await self.checkpoint_store.save(migration.name, status='completed', stats=stats)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Schema migration '{migration.name}' completed: {stats} in {elapsed:.1f}s")
+        return {**stats, 'resumed_after': resume_after, 'ops_per_second': round(self.throttle.rate, 1)}
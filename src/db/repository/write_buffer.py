@@ -0,0 +1,109 @@
+"""
+update_by_id 용 write-behind 버퍼
+
+가격 갱신처럼 짧은 시간에 몰리는 update_one 호출을 모아 bulk_write 한 번으로 보냅니다.
+- 같은 _id 에 대한 $set 은 필드 단위 last-write-wins 로 병합 (upsert 는 하나라도 True 면 True)
+- 문서 수가 max_batch_size 에 도달하거나 flush_interval_ms 가 지나면 flush
+- 배치는 순서대로 하나씩 실행되므로 같은 _id 의 이전 배치 쓰기가 나중 배치를 덮어쓰지 않음
+- 호출자는 자신의 쓰기가 포함된 배치의 연산별 결과 (matched, modified) 를 받음
+- close() 로 남은 쓰기를 모두 flush (워커 종료 시)
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+
+class PendingWrite:
+    """한 문서에 대해 병합된 $set"""
+
+    __slots__ = ('fields', 'upsert', 'futures')
+
+    def __init__(self):
+        self.fields: dict[str, Any] = {}
+        self.upsert = False
+        self.futures: list[asyncio.Future] = []
+
+
+class WriteBehindBuffer:
+    """문서별 $set 병합 후 크기 / 시간 기준으로 일괄 쓰기"""
+
+    def __init__(
+        self,
+        flush_fn: Callable[[dict[str, PendingWrite]], Awaitable[dict[str, tuple[int, int]]]],
+        max_batch_size: int = 500,
+        flush_interval_ms: float = 50.0,
+    ):
+        """
+        Args:
+            flush_fn (Callable): {_id: PendingWrite} -> {_id: (matched, modified)} 를 반환하는 비동기 함수 (예외를 던지지 않아야 함)
+            max_batch_size (int): 한 번에 쓸 최대 문서 수 (도달하면 즉시 flush)
+            flush_interval_ms (float): 첫 쓰기 이후 flush 까지 최대 대기 시간
+        """
+        self.flush_fn = flush_fn
+        self.max_batch_size = max_batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self._pending: dict[str, PendingWrite] = {}
+        self._scheduled: asyncio.Handle | None = None
+        self._last_flush: asyncio.Task | None = None
+        self.submitted = 0
+        self.flushed_batches = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, doc_id: str, fields: dict[str, Any], upsert: bool = False) -> tuple[int, int]:
+        """쓰기를 버퍼에 넣고, 포함된 배치가 실행되면 해당 문서의 (matched, modified) 를 반환"""
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(doc_id)
+        if pending is None:
+            pending = self._pending[doc_id] = PendingWrite()
+        pending.fields.update(fields)
+        pending.upsert = pending.upsert or upsert
+        future = loop.create_future()
+        pending.futures.append(future)
+        self.submitted += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._scheduled is None:
+            self._scheduled = loop.call_later(self.flush_interval_ms / 1000, self._dispatch)
+        # 호출자가 취소되어도 쓰기 자체는 진행
+        return await asyncio.shield(future)
+
+    async def flush(self) -> None:
+        """버퍼의 쓰기를 즉시 실행하고, 진행 중인 배치까지 모두 끝날 때를 기다림"""
+        self._dispatch()
+        if self._last_flush is not None:
+            await asyncio.shield(self._last_flush)
+
+    async def close(self) -> None:
+        await self.flush()
+        if self.submitted:
+            logger.info(f'Write-behind buffer closed: {self.submitted} writes sent in {self.flushed_batches} bulk_write batch(es)')
+
+    def _dispatch(self) -> None:
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._last_flush = asyncio.get_running_loop().create_task(self._run_batch(batch, self._last_flush))
+
+    async def _run_batch(self, batch: dict[str, PendingWrite], previous: asyncio.Task | None) -> None:
+        if previous is not None:
+            await previous
+        try:
+            results = await self.flush_fn(batch)
+        except Exception as e:
+            logger.error(f'Write-behind flush of {len(batch)} documents failed: {e}')
+            results = {}
+        self.flushed_batches += 1
+        for doc_id, pending in batch.items():
+            result = results.get(doc_id, (-1, -1))
+            for future in pending.futures:
+                if not future.done():
+                    future.set_result(result)
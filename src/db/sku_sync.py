@@ -0,0 +1,228 @@
+"""
+products -> products_by_sku 증분 동기화 데몬
+
+products 컬렉션의 change stream 을 구독하여 바뀐 상품만 SKU 문서로 다시 변환해 반영합니다.
+- insert / update / replace : transform_product_to_sku_documents 결과를 ReplaceOne(upsert=True) 로 반영
+- 상품에서 사라진 SKU (및 삭제된 상품의 SKU) 는 source_product_id 로 찾아 삭제
+- 이벤트는 SKU_SYNC_SETTINGS.BATCH_SIZE 개 또는 MAX_AWAIT_MS 동안 모아 bulk_write 한 번으로 반영
+- 반영이 끝난 뒤 resume token 을 체크포인트에 저장하므로 재시작 시 이어서 진행 (반영은 멱등)
+
+실행:
+    python -m db.sku_sync
+"""
+
+import asyncio
+import signal
+import time
+from typing import Any
+
+from loguru import logger
+from pymongo import ASCENDING, DeleteMany, ReplaceOne
+from pymongo.errors import OperationFailure, PyMongoError
+
+from db.config.client_registry import shutdown_mongo
+from db.denormalization import CONTENT_HASH_FIELD, DenormalizationService
+from db.repository.fashion_async import PRODUCT_ID_PATH
+from db.vector.base import get_path
+from db.vector.cache import VectorSearchCache
+
+# resume token 이 oplog 범위를 벗어난 경우 (전체 마이그레이션 필요)
+CHANGE_STREAM_HISTORY_LOST = 286
+RETRY_DELAY_SECONDS = 5
+
+
+class SkuSyncService:
+    """change stream 기반 products_by_sku 증분 동기화"""
+
+    def __init__(self, denormalization_service: DenormalizationService | None = None, search_cache: VectorSearchCache | None = None):
+        """
+        Args:
+            denormalization_service (DenormalizationService, optional): 소스 / 타겟 repository 와 변환 로직을 공유
+            search_cache (VectorSearchCache, optional): SKU 문서가 바뀌면 무효화할 벡터 검색 캐시
+        """
+        self.denormalization = denormalization_service or DenormalizationService(search_cache=search_cache)
+        self.search_cache = search_cache or self.denormalization.search_cache
+        self.sync_config = self.denormalization.config.get_sku_sync_config()
+        self.checkpoint_name = self.sync_config.get('CHECKPOINT_NAME')
+        self.batch_size = self.sync_config.get('BATCH_SIZE')
+        self.max_await_ms = self.sync_config.get('MAX_AWAIT_MS')
+        self.max_lag_seconds = self.sync_config.get('MAX_LAG_SECONDS')
+        self.applied_events = 0
+
+    @property
+    def source_collection(self):
+        return self.denormalization.source_repo.collection
+
+    @property
+    def target_collection(self):
+        return self.denormalization.target_repo.collection
+
+    async def connect(self) -> None:
+        await self.denormalization.connect()
+        # 상품별 SKU 조회 (사라진 SKU 탐지) 용 인덱스
+        await self.target_collection.create_index([('source_product_id', ASCENDING)])
+
+    async def close(self) -> None:
+        await self.denormalization.close()
+
+    async def apply_changes(self, changes: dict[Any, dict | None]) -> dict[str, int]:
+        """
+        상품 단위 변경을 SKU 컬렉션에 반영합니다.
+
+        Args:
+            changes (dict): 상품 _id -> 최신 상품 문서 (삭제된 경우 None)
+
+        Returns:
+            dict[str, int]: upserted / replaced / deleted 문서 수
+        """
+        if not changes:
+            return {'upserted': 0, 'replaced': 0, 'deleted': 0}
+
+        existing: dict[Any, set[str]] = {}
+        existing_hashes: dict[str, str | None] = {}
+        # description_info 캐시 키(products.product_id) -> 변경된 상품의 이전 / 새 상품 ID 모두 무효화
+        description_ids: dict[Any, set] = {}
+        cursor = self.target_collection.find(
+            {'source_product_id': {'$in': list(changes)}}, projection={'source_product_id': 1, CONTENT_HASH_FIELD: 1, PRODUCT_ID_PATH: 1}
+        )
+        async for doc in cursor:
+            existing.setdefault(doc['source_product_id'], set()).add(doc['_id'])
+            existing_hashes[doc['_id']] = doc.get(CONTENT_HASH_FIELD)
+            description_ids.setdefault(doc['source_product_id'], set()).add(get_path(doc, PRODUCT_ID_PATH))
+
+        operations: list[ReplaceOne | DeleteMany] = []
+        written: set[str] = set()
+        rewritten: set[str] = set()
+        stale: set[str] = set()
+        changed_products: set[Any] = set()
+        embedding_documents: list[dict] = []
+        removed_products: list[Any] = []
+        for product_id, product_doc in changes.items():
+            sku_documents = self.denormalization.transform_product_to_sku_documents(product_doc) if product_doc else []
+            if self.denormalization.embedding_layout == 'shared':
+                if sku_documents:
+                    embedding_documents.append(self.denormalization.transform_product_to_embedding_document(product_doc, sku_documents))
+                else:
+                    removed_products.append(product_id)
+            written.update(sku['_id'] for sku in sku_documents)
+            # 내용이 같은 SKU (상품의 다른 색상만 바뀐 경우 등) 는 다시 쓰지 않음
+            changed = [sku for sku in sku_documents if existing_hashes.get(sku['_id']) != sku[CONTENT_HASH_FIELD]]
+            operations.extend(ReplaceOne({'_id': sku['_id']}, sku, upsert=True) for sku in changed)
+            rewritten.update(sku['_id'] for sku in changed)
+            stale |= existing.get(product_id, set())
+            if changed or existing.get(product_id, set()) - {sku['_id'] for sku in sku_documents}:
+                changed_products.add(product_id)
+                if product_doc:
+                    description_ids.setdefault(product_id, set()).add(get_path(product_doc, PRODUCT_ID_PATH))
+        # 같은 배치에서 다른 상품으로 옮겨진 SKU 는 삭제하지 않음
+        stale -= written
+        if stale:
+            operations.append(DeleteMany({'_id': {'$in': sorted(stale)}}))
+
+        # shared 레이아웃: 상품 임베딩 문서도 함께 반영 (SKU 가 없어진 상품은 삭제)
+        if embedding_documents:
+            await self.denormalization.process_embedding_batch(embedding_documents)
+        if removed_products:
+            await self.denormalization.target_repo.embedding_collection.delete_many({'_id': {'$in': removed_products}})
+        if not operations:
+            return {'upserted': 0, 'replaced': 0, 'deleted': 0}
+
+        result = await self.target_collection.bulk_write(operations, ordered=False)
+        stats = {'upserted': result.upserted_count, 'replaced': result.modified_count, 'deleted': result.deleted_count}
+
+        target_repo = self.denormalization.target_repo
+        if target_repo.read_cache is not None:
+            product_ids = {product_id for product in changed_products for product_id in description_ids.get(product, ()) if product_id is not None}
+            await asyncio.gather(
+                *(target_repo.invalidate_product_cache(sku_id) for sku_id in rewritten | stale),
+                *(target_repo.read_cache.invalidate_description(product_id) for product_id in product_ids),
+            )
+        if self.search_cache is not None and (stats['upserted'] or stats['replaced'] or stats['deleted']):
+            await self.search_cache.invalidate()
+        return stats
+
+    async def _flush(self, changes: dict[Any, dict | None], resume_token: dict | None, events: int) -> None:
+        stats = await self.apply_changes(changes)
+        if resume_token is not None:
+            await self.denormalization.checkpoint_store.save(self.checkpoint_name, resume_token=resume_token, status='running')
+        self.applied_events += events
+        logger.info(f'SKU sync applied {events} events for {len(changes)} products: {stats}')
+
+    async def sync_once(self, stop_event: asyncio.Event) -> None:
+        """저장된 resume token 부터 change stream 을 열어 stop_event 가 설정될 때까지 반영"""
+        checkpoint = await self.denormalization.checkpoint_store.load(self.checkpoint_name)
+        resume_token = checkpoint.get('resume_token') if checkpoint else None
+        if resume_token is None:
+            logger.warning('No SKU sync resume token found; starting from now (run DenormalizationService.migrate_data for a full rebuild)')
+
+        pipeline = [{'$match': {'operationType': {'$in': ['insert', 'update', 'replace', 'delete', 'invalidate']}}}]
+        async with await self.source_collection.watch(
+            pipeline, full_document='updateLookup', resume_after=resume_token, max_await_time_ms=self.max_await_ms, batch_size=self.batch_size
+        ) as stream:
+            logger.info(f'SKU sync listening on {self.denormalization.source_repo.collection_name} change stream')
+            # 같은 상품의 여러 이벤트는 마지막 상태만 반영
+            changes: dict[Any, dict | None] = {}
+            events = 0
+            # 첫 미반영 이벤트를 받은 시각. 이벤트가 끊이지 않아 try_next 가 None 을 돌려주지 않아도 MAX_LAG_SECONDS 안에 반영
+            first_pending = 0.0
+            while not stop_event.is_set() and stream.alive:
+                change = await stream.try_next()
+                if change is not None:
+                    operation = change['operationType']
+                    if operation == 'invalidate':
+                        logger.error('SKU sync change stream invalidated (source collection dropped or renamed)')
+                        stop_event.set()
+                        break
+                    if not changes:
+                        first_pending = time.monotonic()
+                    # update 의 fullDocument 가 None 이면 조회 시점에 이미 삭제된 상품
+                    changes[change['documentKey']['_id']] = None if operation == 'delete' else change.get('fullDocument')
+                    events += 1
+                    if len(changes) < self.batch_size and time.monotonic() - first_pending < self.max_lag_seconds:
+                        continue
+                if changes:
+                    await self._flush(changes, stream.resume_token, events)
+                    changes, events = {}, 0
+            if changes:
+                await self._flush(changes, stream.resume_token, events)
+
+    async def run(self, stop_event: asyncio.Event | None = None) -> None:
+        """오류 시 저장된 resume token 부터 다시 연결하며 stop_event 까지 동기화"""
+        stop_event = stop_event or asyncio.Event()
+        while not stop_event.is_set():
+            try:
+                await self.sync_once(stop_event)
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    logger.error('SKU sync resume token is no longer in the oplog; rerun migrate_data and clear the checkpoint')
+                    raise
+                logger.error(f'SKU sync failed, retrying in {RETRY_DELAY_SECONDS}s: {e}')
+            except PyMongoError as e:
+                logger.error(f'SKU sync failed, retrying in {RETRY_DELAY_SECONDS}s: {e}')
+            else:
+                continue
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=RETRY_DELAY_SECONDS)
+            except TimeoutError:
+                pass
+        logger.info(f'SKU sync stopped after applying {self.applied_events} events')
+
+
+async def main():
+    """메인 실행 함수"""
+    sync_service = SkuSyncService()
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await sync_service.connect()
+        await sync_service.run(stop_event)
+    finally:
+        await sync_service.close()
+        await shutdown_mongo()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+from .base import BaseVectorEngine
+from .diversify import ProductOversampler, collapse_by_key, mmr_select
+from .exact import ExactVectorEngine, export_embedding_matrix
+from .hnsw import HNSWIndex, HNSWVectorEngine
+from .quantization import BinaryQuantizer, ScalarQuantizer, benchmark_quantization
+from .reduction import DimensionReducer, TwoStageVectorEngine, benchmark_two_stage
+
+__all__ = [
+    'BaseVectorEngine',
+    'BinaryQuantizer',
+    'DimensionReducer',
+    'ExactVectorEngine',
+    'export_embedding_matrix',
+    'HNSWIndex',
+    'HNSWVectorEngine',
+    'ProductOversampler',
+    'ScalarQuantizer',
+    'TwoStageVectorEngine',
+    'benchmark_quantization',
+    'benchmark_two_stage',
+    'collapse_by_key',
+    'mmr_select',
+]
@@ -0,0 +1,292 @@
+"""
+로컬(in-process) 벡터 검색 엔진 공통 모듈
+
+Atlas $vectorSearch 와 동일한 계약(embedding / limit / filter)을 메모리 내에서 처리하기 위한
+공통 추상 클래스와 유틸리티를 제공합니다.
+- 필터 표현식은 FashionQueryBuilder.vector_search_filter 가 생성하는 $vectorSearch.filter 형식을 그대로 사용
+- 점수는 Atlas cosine 점수와 동일하게 (1 + cosine) / 2 로 정규화
+"""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+# 필터별 마스크 캐시 최대 항목 수 (항목 하나가 전체 코퍼스 크기의 bool 배열, 가격 범위처럼 값이 다양한 필터로 무한히 늘지 않도록 LRU)
+MASK_CACHE_SIZE = 128
+
+# ===========================================================================
+# 문서/필터 유틸리티
+# ===========================================================================
+
+
+def get_path(document: dict, path: str) -> Any:
+    """점(.)으로 구분된 경로의 값을 조회합니다. 경로가 없으면 None"""
+    value: Any = document
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def project_document(document: dict, fields: dict) -> dict:
+    """
+    MongoDB 포함(inclusion) 프로젝션을 파이썬 dict 에 적용합니다.
+    _id 는 명시적으로 0 이 아닌 이상 항상 포함됩니다.
+
+    Args:
+        document (dict): 원본 문서
+        fields (dict): {"a.b": 1, ...} 형태의 프로젝션
+
+    Returns:
+        dict: 프로젝션된 문서
+    """
+    projected: dict = {}
+    if fields.get('_id', 1) and '_id' in document:
+        projected['_id'] = document['_id']
+    for path, include in fields.items():
+        if path == '_id' or not include or isinstance(include, dict):
+            continue
+        value = get_path(document, path)
+        if value is None:
+            continue
+        keys = path.split('.')
+        target = projected
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = value
+    return projected
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (cosine 유사도를 내적으로 계산하기 위함)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def cosine_to_score(similarity: np.ndarray | float) -> np.ndarray | float:
+    """cosine 유사도를 Atlas vectorSearchScore 스케일 (0~1) 로 변환"""
+    return (1.0 + similarity) / 2.0
+
+
+def top_k(sims: np.ndarray, k: int) -> np.ndarray:
+    """유사도 배열의 마지막 축에서 상위 k 개 인덱스 (유사도 높은 순으로 정렬)"""
+    k = min(k, sims.shape[-1])
+    if k <= 0:
+        return np.zeros(sims.shape[:-1] + (0,), dtype=np.int64)
+    part = np.argpartition(-sims, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(sims, part, axis=-1), axis=-1)
+    return np.take_along_axis(part, order, axis=-1)
+
+
+def filter_cache_key(filter_expr: dict | None) -> str:
+    """필터 표현식의 정규화된 문자열 키"""
+    return json.dumps(filter_expr or {}, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def vector_query_fingerprint(
+    embedding: list[float] | np.ndarray,
+    limit: int,
+    pre_filter: dict | None = None,
+    index_name: str | None = None,
+    precision: int = 3,
+) -> str:
+    """
+    벡터 검색 요청의 안정적인 해시
+
+    임베딩은 정규화 후 소수점 이하 precision 자리로 양자화하므로
+    부동소수점 잡음만 다른 거의 동일한 쿼리는 같은 값을 가집니다.
+    """
+    if hasattr(pre_filter, 'model_dump'):
+        pre_filter = pre_filter.model_dump(exclude_none=True)
+    query = normalize_rows(np.asarray(embedding, dtype=np.float32))
+    quantized = np.rint(query * 10**precision).astype(np.int32)
+    digest = hashlib.blake2b(quantized.tobytes(), digest_size=16)
+    digest.update(json.dumps([limit, pre_filter or {}, index_name], sort_keys=True, ensure_ascii=False, default=str).encode())
+    return digest.hexdigest()
+
+
+def _match_value(value: Any, condition: Any) -> bool:
+    """단일 필드 값이 조건과 일치하는지 검사 (배열 필드는 원소 중 하나라도 일치하면 True)"""
+    if isinstance(value, list):
+        if isinstance(condition, dict) and any(op in condition for op in ('$ne', '$nin')):
+            return all(_match_value(v, condition) for v in value) if value else _match_value(None, condition)
+        return any(_match_value(v, condition) for v in value)
+
+    if not isinstance(condition, dict):
+        return value == condition
+
+    for op, operand in condition.items():
+        if op == '$eq':
+            matched = value == operand
+        elif op == '$ne':
+            matched = value != operand
+        elif op == '$in':
+            matched = value in operand
+        elif op == '$nin':
+            matched = value not in operand
+        elif op in ('$gt', '$gte', '$lt', '$lte'):
+            if value is None:
+                return False
+            try:
+                matched = {
+                    '$gt': value > operand,
+                    '$gte': value >= operand,
+                    '$lt': value < operand,
+                    '$lte': value <= operand,
+                }[op]
+            except TypeError:
+                return False
+        else:
+            raise ValueError(f'지원하지 않는 필터 연산자입니다. : {op}')
+        if not matched:
+            return False
+    return True
+
+
+def evaluate_filter(filter_expr: dict | None, columns: dict[str, np.ndarray], size: int) -> np.ndarray:
+    """
+    $vectorSearch.filter 표현식을 컬럼 배열에 적용해 boolean 마스크를 생성합니다.
+
+    Args:
+        filter_expr (Optional[dict]): 필터 표현식 ($and / $or / 필드 조건)
+        columns (dict[str, np.ndarray]): 필드 경로별 값 배열 (dtype=object)
+        size (int): 전체 문서 수
+
+    Returns:
+        np.ndarray: shape (size,) 의 boolean 마스크
+    """
+    mask = np.ones(size, dtype=bool)
+    if not filter_expr:
+        return mask
+
+    for key, condition in filter_expr.items():
+        if key == '$and':
+            for sub in condition:
+                mask &= evaluate_filter(sub, columns, size)
+        elif key == '$or':
+            any_mask = np.zeros(size, dtype=bool)
+            for sub in condition:
+                any_mask |= evaluate_filter(sub, columns, size)
+            mask &= any_mask
+        else:
+            if key not in columns:
+                raise ValueError(f'필터 필드가 로컬 엔진에 적재되지 않았습니다. : {key}')
+            column = columns[key]
+            if not isinstance(condition, dict) and not any(isinstance(v, list) for v in column):
+                mask &= column == condition
+            else:
+                mask &= np.fromiter((_match_value(v, condition) for v in column), dtype=bool, count=size)
+    return mask
+
+
+# ===========================================================================
+# 벡터 엔진 추상 클래스
+# ===========================================================================
+
+
+class BaseVectorEngine(ABC):
+    """로컬 벡터 검색 엔진 추상 클래스"""
+
+    def __init__(self, ids: np.ndarray, columns: dict[str, np.ndarray] | None = None, documents: dict[Any, dict] | None = None):
+        """
+        Args:
+            ids (np.ndarray): 행 번호 -> 문서 _id
+            columns (dict[str, np.ndarray], optional): 필터 필드 경로별 값 배열
+            documents (dict, optional): _id -> 프로젝션된 문서. None 이면 repository 가 DB 에서 채움
+        """
+        self.ids = np.asarray(ids, dtype=object)
+        self.columns = {path: np.asarray(values, dtype=object) for path, values in (columns or {}).items()}
+        self.documents = documents
+        self._mask_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def filter_mask(self, filter_expr: dict | None) -> np.ndarray | None:
+        """필터 표현식에 대한 boolean 마스크 (최근 MASK_CACHE_SIZE 개 필터를 LRU 로 캐싱)"""
+        if not filter_expr:
+            return None
+        key = filter_cache_key(filter_expr)
+        mask = self._mask_cache.get(key)
+        if mask is not None:
+            self._mask_cache.move_to_end(key)
+            return mask
+        mask = evaluate_filter(filter_expr, self.columns, len(self))
+        self._mask_cache[key] = mask
+        if len(self._mask_cache) > MASK_CACHE_SIZE:
+            self._mask_cache.popitem(last=False)
+        return mask
+
+    @abstractmethod
+    def search(self, embedding: list[float] | np.ndarray, limit: int, filter_expr: dict | None = None) -> list[tuple[Any, float]]:
+        """
+        벡터 검색
+
+        Returns:
+            list[tuple[Any, float]]: (_id, score) 리스트 (점수 높은 순)
+        """
+        pass
+
+
+async def load_vector_corpus(
+    collection: Any,
+    embedding_field_path: str,
+    filter_fields: list[str],
+    project_fields: dict | None = None,
+    query: dict | None = None,
+    batch_size: int = 1000,
+) -> tuple[np.ndarray, np.ndarray, dict[str, np.ndarray], dict[Any, dict] | None]:
+    """
+    컬렉션에서 임베딩, 필터 필드, 프로젝션 문서를 한 번의 커서 순회로 적재합니다.
+
+    Args:
+        collection: AsyncCollection
+        embedding_field_path (str): 임베딩 필드 경로
+        filter_fields (list[str]): 메모리에 적재할 필터 필드 경로
+        project_fields (dict, optional): 검색 결과로 반환할 프로젝션. None 이면 문서를 적재하지 않음
+        query (dict, optional): 적재 대상 문서 조건
+        batch_size (int): 커서 배치 크기
+
+    Returns:
+        tuple: (ids, 정규화된 float32 행렬, 필터 컬럼, 프로젝션 문서)
+    """
+    projection = {embedding_field_path: 1, **{field: 1 for field in filter_fields}}
+    if project_fields:
+        projection.update({path: 1 for path, include in project_fields.items() if include and not isinstance(include, dict)})
+
+    query = {embedding_field_path: {'$exists': True}, **(query or {})}
+    ids: list[Any] = []
+    vectors: list[list[float]] = []
+    columns: dict[str, list[Any]] = {field: [] for field in filter_fields}
+    documents: dict[Any, dict] | None = {} if project_fields else None
+
+    cursor = collection.find(query, projection=projection, batch_size=batch_size)
+    async for doc in cursor:
+        vector = get_path(doc, embedding_field_path)
+        if not vector or not isinstance(vector, list):
+            continue
+        ids.append(doc['_id'])
+        vectors.append(vector)
+        for field in filter_fields:
+            columns[field].append(get_path(doc, field))
+        if documents is not None:
+            documents[doc['_id']] = project_document(doc, project_fields)
+
+    logger.info(f'Loaded {len(ids)} vectors from {collection.name} for local vector engine')
+    matrix = normalize_rows(np.asarray(vectors, dtype=np.float32)) if vectors else np.zeros((0, 0), dtype=np.float32)
+    id_array = np.empty(len(ids), dtype=object)
+    id_array[:] = ids
+    column_arrays = {}
+    for field, values in columns.items():
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        column_arrays[field] = column
+    return id_array, matrix, column_arrays, documents
@@ -0,0 +1,81 @@
+"""
+Redis 기반 벡터 검색 결과 캐시
+
+키 = {KEY_PREFIX}:v{카탈로그 버전}:{index}:{프로젝션 프로필}:{쿼리 지문}
+- 쿼리 지문은 양자화된 임베딩 / limit / pre_filter / index 이름의 해시 (vector_query_fingerprint)
+- 카탈로그가 바뀌면 (비정규화, 가격 업데이트) 버전을 올려 이전 키를 모두 무효화하고, 남은 키는 TTL 로 만료
+"""
+
+import time
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from db.config.config import Config
+
+from .base import vector_query_fingerprint
+
+if TYPE_CHECKING:
+    from redis_cache.client import RedisCacheClient
+
+
+class VectorSearchCache:
+    """vector_search 결과를 RedisCacheClient.json_set / json_get 으로 캐싱"""
+
+    def __init__(self, redis_client: 'RedisCacheClient', ttl: int | None = None, precision: int | None = None):
+        """
+        Args:
+            redis_client (RedisCacheClient): 연결된 Redis 캐시 클라이언트
+            ttl (int, optional): 결과 TTL(초). 기본값은 VECTOR_SEARCH_CACHE_SETTINGS.TTL
+            precision (int, optional): 임베딩 양자화 자릿수
+        """
+        cache_config = Config().get_vector_search_cache_config()
+        self.redis_client = redis_client
+        self.ttl = ttl or cache_config.get('TTL')
+        self.precision = precision if precision is not None else cache_config.get('PRECISION')
+        self.key_prefix = cache_config.get('KEY_PREFIX')
+        self.version_refresh_seconds = cache_config.get('VERSION_REFRESH_SECONDS')
+        self.version_key = f'{self.key_prefix}:catalog_version'
+
+        self._version: int | None = None
+        self._version_checked_at = 0.0
+
+    async def catalog_version(self) -> int:
+        """현재 카탈로그 버전 (VERSION_REFRESH_SECONDS 동안 로컬에 보관)"""
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at > self.version_refresh_seconds:
+            value = await self.redis_client.get(self.version_key, deserialize=False)
+            self._version = int(value) if value is not None else 0
+            self._version_checked_at = now
+        return self._version
+
+    async def make_key(self, embedding: list[float], limit: int, pre_filter: dict | None, index_name: str | None, profile: str | None = None) -> str:
+        fingerprint = vector_query_fingerprint(embedding, limit, pre_filter, index_name, precision=self.precision)
+        version = await self.catalog_version()
+        return f'{self.key_prefix}:v{version}:{index_name}:{profile or "default"}:{fingerprint}'
+
+    async def get(self, key: str) -> list[dict] | None:
+        """캐시된 검색 결과. 없거나 Redis 오류 시 None"""
+        try:
+            return await self.redis_client.json_get(key)
+        except Exception as e:
+            logger.warning(f'Vector search cache lookup failed: {e}')
+            return None
+
+    async def set(self, key: str, results: list[dict]) -> bool:
+        """검색 결과 저장. 실패해도 검색 흐름에는 영향을 주지 않음"""
+        try:
+            return await self.redis_client.json_set(key, results, ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f'Vector search cache store failed: {e}')
+            return False
+
+    async def invalidate(self) -> int | None:
+        """카탈로그 버전을 올려 기존 캐시 키를 모두 무효화합니다."""
+        version = await self.redis_client.incr(self.version_key)
+        if version is not None:
+            self._version = version
+            self._version_checked_at = time.monotonic()
+            logger.info(f'Vector search cache invalidated: catalog version -> {version}')
+        return version
+
@@ -0,0 +1,100 @@
+"""
+벡터 검색 결과 후처리: 상품 단위 collapse 와 MMR 다양화
+
+- collapse_by_key : SKU 결과를 상품(products.product_id) 단위로 묶어 상품당 최고 점수 SKU 만 남김
+- ProductOversampler : 관측한 "상품당 SKU 히트 수" 의 지수이동평균으로 oversampling 배수를 조정해
+  한 번의 조회로 limit 개의 서로 다른 상품을 채우도록 함
+- mmr_select : 후보 임베딩의 유사도 행렬을 한 번에 계산한 뒤 maximal marginal relevance 로 선택
+"""
+
+import math
+from typing import Any
+
+import numpy as np
+
+from .base import get_path, normalize_rows
+
+
+def collapse_by_key(documents: list[dict], limit: int, key_path: str) -> list[dict]:
+    """
+    점수 높은 순 문서 리스트에서 key_path 값별 첫 문서만 남깁니다. (키가 없는 문서는 각각 별도 그룹)
+
+    Args:
+        documents (list[dict]): 점수 높은 순 문서
+        limit (int): 반환할 그룹 수
+        key_path (str): 그룹 키 경로 (예: products.product_id)
+    """
+    seen: set[Any] = set()
+    collapsed = []
+    for doc in documents:
+        key = get_path(doc, key_path)
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        collapsed.append(doc)
+        if len(collapsed) >= limit:
+            break
+    return collapsed
+
+
+class ProductOversampler:
+    """상품당 SKU 히트 수를 학습해 collapse 전 후보 배수를 결정"""
+
+    def __init__(self, initial_ratio: float, safety: float = 1.5, max_factor: int = 20, alpha: float = 0.2):
+        """
+        Args:
+            initial_ratio (float): 초기 상품당 SKU 히트 수 추정치
+            safety (float): 추정치에 곱하는 여유 배수
+            max_factor (int): 배수 상한
+            alpha (float): 지수이동평균 가중치
+        """
+        self.ratio = initial_ratio
+        self.safety = safety
+        self.max_factor = max_factor
+        self.alpha = alpha
+
+    def factor(self) -> int:
+        return max(1, min(self.max_factor, math.ceil(self.ratio * self.safety)))
+
+    def observe(self, hits: int, groups: int) -> None:
+        """한 번의 조회에서 관측한 SKU 히트 수 / 상품 수 반영"""
+        if groups <= 0 or hits <= 0:
+            return
+        self.ratio = (1 - self.alpha) * self.ratio + self.alpha * (hits / groups)
+
+
+def mmr_select(query: np.ndarray, vectors: np.ndarray, limit: int, lambda_: float = 0.7) -> np.ndarray:
+    """
+    Maximal marginal relevance 선택
+
+    score_i = lambda * sim(q, d_i) - (1 - lambda) * max_{j in selected} sim(d_i, d_j)
+    후보 간 유사도 행렬 (n, n) 을 한 번의 행렬곱으로 계산하고, 선택마다 최대 유사도 벡터만 갱신합니다.
+
+    Args:
+        query (np.ndarray): (dim,) 쿼리 벡터
+        vectors (np.ndarray): (n, dim) 후보 벡터
+        limit (int): 선택 개수
+        lambda_ (float): 1 이면 관련도만, 0 이면 다양성만 고려
+
+    Returns:
+        np.ndarray: 선택된 후보 인덱스 (선택 순서)
+    """
+    vectors = normalize_rows(vectors)
+    relevance = vectors @ normalize_rows(np.asarray(query, dtype=np.float32))
+    limit = min(limit, len(vectors))
+    if limit <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    pairwise = vectors @ vectors.T
+    max_similarity = np.full(len(vectors), -np.inf, dtype=np.float32)
+    available = np.ones(len(vectors), dtype=bool)
+    selected = np.empty(limit, dtype=np.int64)
+    for step in range(limit):
+        redundancy = np.where(np.isfinite(max_similarity), max_similarity, 0.0)
+        scores = np.where(available, lambda_ * relevance - (1 - lambda_) * redundancy, -np.inf)
+        choice = int(np.argmax(scores))
+        selected[step] = choice
+        available[choice] = False
+        max_similarity = np.maximum(max_similarity, pairwise[choice])
+    return selected
@@ -0,0 +1,231 @@
+"""
+메모리 매핑된 float32 임베딩 행렬 기반 exact(brute-force) cosine 검색 엔진
+
+- export_embedding_matrix 로 SKU 임베딩을 .npy 행렬 + 병렬 _id 배열로 내보냄
+- ExactVectorEngine.load 는 mmap_mode='r' 로 열어 여러 uvicorn 워커가 같은 페이지 캐시를 공유
+- 블록 단위 행렬-벡터 곱 + argpartition 으로 top-k 를 계산 (ANN recall 측정용 기준값 / 소규모 필터 집합의 빠른 경로)
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from bson import json_util
+from loguru import logger
+
+from db.config.config import Config
+
+from .base import BaseVectorEngine, cosine_to_score, get_path, normalize_rows, top_k
+
+EMBEDDINGS_FILE = 'embeddings.npy'
+# _id 원래 타입(ObjectId / int / str)을 보존하는 Extended JSON 사이드카. 없으면 이전 형식인 문자열 ids.npy 를 읽음
+IDS_FILE = 'ids.json'
+LEGACY_IDS_FILE = 'ids.npy'
+COLUMNS_FILE = 'columns.json'
+
+
+class ExactVectorEngine(BaseVectorEngine):
+    """정규화된 float32 행렬에 대한 exact cosine top-k 엔진"""
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        matrix: np.ndarray,
+        columns: dict[str, np.ndarray] | None = None,
+        documents: dict[Any, dict] | None = None,
+        block_size: int | None = None,
+    ):
+        """
+        Args:
+            ids (np.ndarray): 행 번호 -> 문서 _id
+            matrix (np.ndarray): 정규화된 (n, dim) float32 행렬 (np.memmap 가능)
+            columns (dict[str, np.ndarray], optional): 필터 필드 값 배열
+            documents (dict, optional): _id -> 프로젝션 문서
+            block_size (int, optional): 블록당 행 수
+        """
+        super().__init__(ids, columns, documents)
+        self.matrix = matrix
+        self.block_size = block_size or Config().get_local_vector_engine_config().get('EXACT_SEARCH_BLOCK_SIZE')
+        # 필드 값별 boolean 마스크를 미리 계산해 등호/$in 필터를 비트 연산으로 처리
+        self._value_masks = self._build_value_masks()
+
+    def _build_value_masks(self) -> dict[str, dict[Any, np.ndarray]]:
+        value_masks: dict[str, dict[Any, np.ndarray]] = {}
+        for path, column in self.columns.items():
+            if any(isinstance(v, list) for v in column):
+                continue
+            codes, uniques = _factorize(column)
+            value_masks[path] = {value: codes == code for code, value in enumerate(uniques)}
+        return value_masks
+
+    def filter_mask(self, filter_expr: dict | None) -> np.ndarray | None:
+        if not filter_expr:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        for path, condition in filter_expr.items():
+            masks = self._value_masks.get(path)
+            if masks is None:
+                return super().filter_mask(filter_expr)
+            if not isinstance(condition, dict):
+                values = [condition]
+            elif set(condition) <= {'$eq', '$in'}:
+                values = [condition['$eq']] if '$eq' in condition else list(condition['$in'])
+            else:
+                return super().filter_mask(filter_expr)
+            field_mask = np.zeros(len(self), dtype=bool)
+            for value in values:
+                if value in masks:
+                    field_mask |= masks[value]
+            mask &= field_mask
+        return mask
+
+    def knn(self, queries: np.ndarray, k: int, mask: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        블록 단위 exact top-k (다중 쿼리 지원)
+
+        Args:
+            queries (np.ndarray): (dim,) 또는 (q, dim) 쿼리 벡터
+            k (int): 반환 개수
+            mask (np.ndarray, optional): 후보 행 boolean 마스크
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (행 인덱스, cosine 유사도) shape (q, k') 유사도 높은 순
+        """
+        queries = normalize_rows(np.atleast_2d(queries))
+        candidates = np.flatnonzero(mask) if mask is not None else None
+
+        # 필터 통과 행이 한 블록 이내면 해당 행만 읽어 한 번의 BLAS 호출로 처리
+        if candidates is not None and len(candidates) <= self.block_size:
+            sims = queries @ np.asarray(self.matrix[candidates]).T
+            top = top_k(sims, k)
+            return candidates[top], np.take_along_axis(sims, top, axis=-1)
+
+        best_idx = np.zeros((len(queries), 0), dtype=np.int64)
+        best_sims = np.zeros((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self.matrix), self.block_size):
+            end = min(start + self.block_size, len(self.matrix))
+            sims = queries @ np.asarray(self.matrix[start:end]).T
+            if mask is not None:
+                sims = np.where(mask[start:end], sims, -np.inf)
+            top = top_k(sims, k)
+            best_idx = np.concatenate([best_idx, top + start], axis=1)
+            best_sims = np.concatenate([best_sims, np.take_along_axis(sims, top, axis=-1)], axis=1)
+            merged = top_k(best_sims, k)
+            best_idx = np.take_along_axis(best_idx, merged, axis=-1)
+            best_sims = np.take_along_axis(best_sims, merged, axis=-1)
+
+        if mask is not None:
+            # 필터 통과 행이 k 개 미만인 경우 -inf 로 채워진 자리 제거
+            valid = np.isfinite(best_sims).all(axis=0)
+            best_idx, best_sims = best_idx[:, valid], best_sims[:, valid]
+        return best_idx, best_sims
+
+    def search(self, embedding: list[float] | np.ndarray, limit: int, filter_expr: dict | None = None) -> list[tuple[Any, float]]:
+        mask = self.filter_mask(filter_expr)
+        if mask is not None and not mask.any():
+            return []
+        nodes, sims = self.knn(np.asarray(embedding, dtype=np.float32), limit, mask=mask)
+        scores = cosine_to_score(sims[0])
+        return [(self.ids[node], float(score)) for node, score in zip(nodes[0], scores, strict=True)]
+
+    @classmethod
+    def load(cls, directory: str | Path, block_size: int | None = None) -> 'ExactVectorEngine':
+        """export_embedding_matrix 로 내보낸 디렉토리를 메모리 매핑으로 엽니다."""
+        directory = Path(directory)
+        matrix = np.load(directory / EMBEDDINGS_FILE, mmap_mode='r')
+        ids_path = directory / IDS_FILE
+        if ids_path.exists():
+            raw_ids = json_util.loads(ids_path.read_text(encoding='utf-8'))
+            ids = np.empty(len(raw_ids), dtype=object)
+            ids[:] = raw_ids
+        else:
+            ids = np.load(directory / LEGACY_IDS_FILE).astype(object)
+        columns = {}
+        columns_path = directory / COLUMNS_FILE
+        if columns_path.exists():
+            raw_columns = json.loads(columns_path.read_text(encoding='utf-8'))
+            for path, values in raw_columns.items():
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+                columns[path] = column
+        logger.info(f'Loaded memory-mapped embedding matrix {matrix.shape} from {directory}')
+        return cls(ids, matrix, columns, block_size=block_size)
+
+
+def _factorize(column: np.ndarray) -> tuple[np.ndarray, list[Any]]:
+    """object 배열을 (코드 배열, 고유값 리스트) 로 변환 (None 등 비교 불가 값 포함 가능)"""
+    lookup: dict[Any, int] = {}
+    codes = np.empty(len(column), dtype=np.int64)
+    for i, value in enumerate(column):
+        codes[i] = lookup.setdefault(value, len(lookup))
+    return codes, list(lookup)
+
+
+async def export_embedding_matrix(
+    collection: Any,
+    directory: str | Path,
+    embedding_field_path: str | None = None,
+    filter_fields: list[str] | None = None,
+    batch_size: int = 1000,
+    dimensions: int | None = None,
+) -> int:
+    """
+    컬렉션의 임베딩을 메모리 매핑 가능한 float32 .npy 행렬과 병렬 _id 목록(Extended JSON)으로 내보냅니다.
+    행렬은 open_memmap 으로 커서를 순회하며 직접 기록하므로 전체 카탈로그를 메모리에 올리지 않습니다.
+
+    Args:
+        collection: AsyncCollection
+        directory (str | Path): 출력 디렉토리
+        embedding_field_path (str, optional): 임베딩 필드 경로
+        filter_fields (list[str], optional): 함께 저장할 필터 필드
+        batch_size (int): 커서 배치 크기
+        dimensions (int, optional): 임베딩 차원. 기본값은 VECTOR_SEARCH_SETTINGS.EMBEDDING_DIMENSIONS
+
+    Returns:
+        int: 내보낸 벡터 수
+    """
+    vector_search_config = Config().get_vector_search_config()
+    embedding_field_path = embedding_field_path or vector_search_config.get('EMBEDDING_FIELD_PATH')
+    filter_fields = filter_fields if filter_fields is not None else vector_search_config.get('FILTER_FIELDS')
+    dimensions = dimensions or vector_search_config.get('EMBEDDING_DIMENSIONS')
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    query = {embedding_field_path: {'$exists': True}}
+    expected = await collection.count_documents(query)
+
+    tmp_path = directory / f'{EMBEDDINGS_FILE}.tmp'
+    matrix = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(expected, dimensions))
+    ids: list[Any] = []
+    columns: dict[str, list[Any]] = {field: [] for field in filter_fields}
+
+    projection = {embedding_field_path: 1, **{field: 1 for field in filter_fields}}
+    cursor = collection.find(query, projection=projection, batch_size=batch_size).sort('_id', 1)
+    async for doc in cursor:
+        vector = get_path(doc, embedding_field_path)
+        if not vector or len(vector) != dimensions or len(ids) >= expected:
+            continue
+        matrix[len(ids)] = normalize_rows(np.asarray(vector, dtype=np.float32))
+        ids.append(doc['_id'])
+        for field in filter_fields:
+            columns[field].append(get_path(doc, field))
+
+    matrix.flush()
+    count = len(ids)
+    if count != expected:
+        # 내보내는 도중 문서 수가 달라진 경우 실제 개수만큼 잘라서 다시 기록
+        trimmed = np.lib.format.open_memmap(directory / EMBEDDINGS_FILE, mode='w+', dtype=np.float32, shape=(count, dimensions))
+        trimmed[:] = matrix[:count]
+        trimmed.flush()
+        del matrix, trimmed
+        tmp_path.unlink()
+    else:
+        del matrix
+        tmp_path.replace(directory / EMBEDDINGS_FILE)
+
+    # $in 조회가 원본 _id 와 일치하도록 타입을 보존해 저장 (str() 변환 시 ObjectId / int _id 가 매칭되지 않음)
+    (directory / IDS_FILE).write_text(json_util.dumps(ids), encoding='utf-8')
+    (directory / COLUMNS_FILE).write_text(json.dumps(columns, ensure_ascii=False, default=str), encoding='utf-8')
+    logger.info(f'Exported {count} embeddings ({dimensions} dims) to {directory}')
+    return count
@@ -0,0 +1,43 @@
+"""
+여러 검색 결과 리스트의 순위 융합 (reciprocal rank fusion)
+"""
+
+from typing import Any
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: list[list[dict]],
+    limit: int,
+    k: int = 60,
+    weights: list[float] | None = None,
+) -> list[dict]:
+    """
+    RRF 점수 = Σ weight_i / (k + rank_i) 로 여러 순위 리스트를 융합합니다. (rank 는 1부터)
+    같은 _id 의 문서는 먼저 등장한 리스트의 필드를 기준으로 병합되고, score 는 RRF 점수로 대체됩니다.
+
+    Args:
+        ranked_lists (list[list[dict]]): 점수 높은 순으로 정렬된 결과 리스트들
+        limit (int): 반환 개수
+        k (int): 순위 감쇠 상수 (클수록 하위 순위의 영향이 커짐)
+        weights (list[float], optional): 리스트별 가중치. 기본값은 모두 1
+
+    Returns:
+        list[dict]: RRF 점수 높은 순의 문서 리스트
+    """
+    weights = weights or [1.0] * len(ranked_lists)
+    if len(weights) != len(ranked_lists):
+        raise ValueError(f'weights 길이가 검색 결과 수와 다릅니다. : {len(weights)} != {len(ranked_lists)}')
+
+    scores: dict[Any, float] = {}
+    documents: dict[Any, dict] = {}
+    for ranked, weight in zip(ranked_lists, weights, strict=True):
+        for rank, doc in enumerate(ranked, start=1):
+            doc_id = doc['_id']
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+            if doc_id in documents:
+                documents[doc_id] = {**doc, **documents[doc_id]}
+            else:
+                documents[doc_id] = doc
+
+    fused = sorted(scores, key=scores.__getitem__, reverse=True)[:limit]
+    return [{**documents[doc_id], 'score': scores[doc_id]} for doc_id in fused]
@@ -0,0 +1,240 @@
+"""
+HNSW(Hierarchical Navigable Small World) 기반 in-process ANN 벡터 엔진
+
+products_by_sku 의 임베딩을 메모리에 적재해 그래프 인덱스를 만들고,
+AsyncFashionRepository.vector_search 의 로컬 백엔드로 사용합니다.
+
+그래프 구축/탐색은 순수 파이썬(heapq) 구현이므로 수만 개 이하의 코퍼스(필터된 카테고리, 개발용 샘플)에 적합합니다.
+전체 카탈로그(10만 x 3072) 규모는 구축에 수 시간이 걸리므로 LOCAL_VECTOR_ENGINE_SETTINGS.HNSW_MAX_VECTORS 를 넘으면 구축을 거부합니다.
+"""
+
+import asyncio
+import heapq
+import math
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+from db.config.config import Config
+from db.query_builders.projections import get_projection
+
+from .base import BaseVectorEngine, cosine_to_score, load_vector_corpus, normalize_rows
+
+
+class HNSWIndex:
+    """cosine(내적) 기반 HNSW 그래프 인덱스 (입력 벡터는 정규화되어 있어야 함)"""
+
+    def __init__(self, dim: int, m: int = 16, ef_construction: int = 100, ef_search: int = 64, seed: int = 42):
+        """
+        Args:
+            dim (int): 벡터 차원
+            m (int): 노드당 최대 이웃 수 (layer 0 은 2 * m)
+            ef_construction (int): 인덱스 구축 시 후보 리스트 크기
+            ef_search (int): 검색 시 기본 후보 리스트 크기
+            seed (int): 레벨 샘플링 난수 시드
+        """
+        self.dim = dim
+        self.m = m
+        self.m0 = 2 * m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._level_mult = 1 / math.log(m)
+        self._rng = np.random.default_rng(seed)
+
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.graph: list[dict[int, list[int]]] = []
+        self.entry_point: int | None = None
+        self.max_level = -1
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def _random_level(self) -> int:
+        return int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+
+    def _search_layer(self, query: np.ndarray, entry_points: list[int], ef: int, layer: int, mask: np.ndarray | None = None) -> list[tuple[float, int]]:
+        """
+        단일 레이어 탐색. mask 가 주어지면 탐색은 전체 그래프로 하되 결과에는 mask 통과 노드만 포함합니다.
+
+        Returns:
+            list[tuple[float, int]]: (유사도, 노드) 최소 힙 (heap[0] 이 가장 낮은 유사도)
+        """
+        visited = set(entry_points)
+        entry_sims = self.vectors[entry_points] @ query
+        candidates = [(-float(sim), node) for sim, node in zip(entry_sims, entry_points, strict=True)]
+        heapq.heapify(candidates)
+        results: list[tuple[float, int]] = []
+        for sim, node in zip(entry_sims, entry_points, strict=True):
+            if mask is None or mask[node]:
+                heapq.heappush(results, (float(sim), node))
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        neighbors_of = self.graph[layer]
+        while candidates:
+            neg_sim, node = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_sim < results[0][0]:
+                break
+            neighbors = [n for n in neighbors_of.get(node, ()) if n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+            sims = self.vectors[neighbors] @ query
+            for sim, neighbor in zip(sims.tolist(), neighbors, strict=True):
+                if len(results) < ef or sim > results[0][0]:
+                    heapq.heappush(candidates, (-sim, neighbor))
+                    if mask is None or mask[neighbor]:
+                        heapq.heappush(results, (sim, neighbor))
+                        if len(results) > ef:
+                            heapq.heappop(results)
+        return results
+
+    def _select_neighbors(self, candidates: list[tuple[float, int]], max_neighbors: int) -> list[int]:
+        return [node for _, node in heapq.nlargest(max_neighbors, candidates)]
+
+    def _prune(self, node: int, layer: int) -> None:
+        max_neighbors = self.m0 if layer == 0 else self.m
+        neighbors = self.graph[layer][node]
+        if len(neighbors) <= max_neighbors:
+            return
+        sims = self.vectors[neighbors] @ self.vectors[node]
+        keep = np.argpartition(-sims, max_neighbors - 1)[:max_neighbors]
+        self.graph[layer][node] = [neighbors[i] for i in keep]
+
+    def add_items(self, matrix: np.ndarray) -> None:
+        """정규화된 벡터 행렬을 인덱스에 추가합니다."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+            raise ValueError(f'벡터 차원이 올바르지 않습니다. : {matrix.shape} (기대 차원 : {self.dim})')
+        start = len(self.vectors)
+        self.vectors = np.vstack([self.vectors, matrix])
+        for node in range(start, len(self.vectors)):
+            self._insert(node)
+
+    def _insert(self, node: int) -> None:
+        level = self._random_level()
+        while len(self.graph) <= level:
+            self.graph.append({})
+        for layer in range(level + 1):
+            self.graph[layer][node] = []
+
+        if self.entry_point is None:
+            self.entry_point = node
+            self.max_level = level
+            return
+
+        query = self.vectors[node]
+        entry = self.entry_point
+        for layer in range(self.max_level, level, -1):
+            entry = max(self._search_layer(query, [entry], 1, layer))[1]
+
+        entry_points = [entry]
+        for layer in range(min(level, self.max_level), -1, -1):
+            candidates = self._search_layer(query, entry_points, self.ef_construction, layer)
+            neighbors = self._select_neighbors(candidates, self.m)
+            self.graph[layer][node] = neighbors
+            for neighbor in neighbors:
+                self.graph[layer][neighbor].append(node)
+                self._prune(neighbor, layer)
+            entry_points = [n for _, n in candidates]
+
+        if level > self.max_level:
+            self.entry_point = node
+            self.max_level = level
+
+    def knn(self, query: np.ndarray, k: int, ef: int | None = None, mask: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        k-최근접 이웃 검색
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (노드 인덱스, cosine 유사도) 유사도 높은 순
+        """
+        if self.entry_point is None or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        ef = max(ef or self.ef_search, k)
+        entry = self.entry_point
+        for layer in range(self.max_level, 0, -1):
+            entry = max(self._search_layer(query, [entry], 1, layer))[1]
+        results = heapq.nlargest(k, self._search_layer(query, [entry], ef, 0, mask=mask))
+        return np.array([n for _, n in results], dtype=np.int64), np.array([s for s, _ in results], dtype=np.float32)
+
+
+class HNSWVectorEngine(BaseVectorEngine):
+    """HNSW 그래프를 사용하는 로컬 벡터 엔진 (최대 HNSW_MAX_VECTORS 개)"""
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        matrix: np.ndarray,
+        columns: dict[str, np.ndarray] | None = None,
+        documents: dict[Any, dict] | None = None,
+        m: int | None = None,
+        ef_construction: int | None = None,
+        ef_search: int | None = None,
+        brute_force_threshold: int | None = None,
+    ):
+        super().__init__(ids, columns, documents)
+        engine_config = Config().get_local_vector_engine_config()
+        self.brute_force_threshold = brute_force_threshold if brute_force_threshold is not None else engine_config.get('BRUTE_FORCE_THRESHOLD')
+
+        max_vectors = engine_config.get('HNSW_MAX_VECTORS')
+        if max_vectors is not None and len(matrix) > max_vectors:
+            raise ValueError(
+                f'HNSW 인덱스를 in-process 로 구축하기에는 벡터가 너무 많습니다. : {len(matrix)} > {max_vectors} '
+                '(ExactVectorEngine 또는 Atlas 벡터 검색을 사용하세요)'
+            )
+
+        matrix = normalize_rows(matrix)
+        self.index = HNSWIndex(
+            dim=matrix.shape[1],
+            m=m or engine_config.get('HNSW_M'),
+            ef_construction=ef_construction or engine_config.get('HNSW_EF_CONSTRUCTION'),
+            ef_search=ef_search or engine_config.get('HNSW_EF_SEARCH'),
+        )
+        self.index.add_items(matrix)
+        logger.info(f'HNSW index built: {len(self.index)} vectors, max_level={self.index.max_level}')
+
+    @classmethod
+    async def from_collection(
+        cls,
+        collection: Any,
+        embedding_field_path: str | None = None,
+        filter_fields: list[str] | None = None,
+        project_fields: dict | None = None,
+        query: dict | None = None,
+        **index_kwargs: Any,
+    ) -> 'HNSWVectorEngine':
+        """
+        컬렉션의 임베딩으로 HNSW 엔진을 구축합니다. (그래프 구축은 이벤트 루프를 막지 않도록 스레드에서 실행)
+        기본값은 VECTOR_SEARCH_SETTINGS (EMBEDDING_FIELD_PATH, FILTER_FIELDS, DEFAULT_PROJECTION_PROFILE) 를 따릅니다.
+        """
+        vector_search_config = Config().get_vector_search_config()
+        ids, matrix, columns, documents = await load_vector_corpus(
+            collection,
+            embedding_field_path=embedding_field_path or vector_search_config.get('EMBEDDING_FIELD_PATH'),
+            filter_fields=filter_fields if filter_fields is not None else vector_search_config.get('FILTER_FIELDS'),
+            project_fields=project_fields if project_fields is not None else get_projection(vector_search_config.get('DEFAULT_PROJECTION_PROFILE')),
+            query=query,
+        )
+        if len(ids) == 0:
+            raise ValueError(f'벡터 엔진을 구축할 임베딩이 없습니다. : {collection.name}')
+        return await asyncio.to_thread(cls, ids, matrix, columns, documents, **index_kwargs)
+
+    def search(self, embedding: list[float] | np.ndarray, limit: int, filter_expr: dict | None = None) -> list[tuple[Any, float]]:
+        query = normalize_rows(np.asarray(embedding, dtype=np.float32))
+        mask = self.filter_mask(filter_expr)
+
+        # 필터 통과 문서가 적으면 그래프 탐색보다 전수 탐색이 빠르고 정확함
+        if mask is not None and mask.sum() <= self.brute_force_threshold:
+            candidates = np.flatnonzero(mask)
+            if len(candidates) == 0:
+                return []
+            sims = self.index.vectors[candidates] @ query
+            top = np.argsort(-sims)[:limit]
+            nodes, sims = candidates[top], sims[top]
+        else:
+            nodes, sims = self.index.knn(query, limit, mask=mask)
+
+        scores = cosine_to_score(sims)
+        return [(self.ids[node], float(score)) for node, score in zip(nodes, scores, strict=True)]
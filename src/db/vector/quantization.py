@@ -0,0 +1,221 @@
+"""
+SKU 임베딩 양자화 (int8 scalar / 1-bit binary) 및 recall 벤치마크
+
+- ScalarQuantizer : 카탈로그로 차원별 scale/offset 을 보정해 float32 -> int8 (4배 절감)
+- BinaryQuantizer : 차원별 임계값 기준 부호 비트를 packbits 로 압축 (32배 절감)
+- benchmark_quantization : float32 exact top-k 대비 recall@k 측정
+"""
+
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype
+
+from .base import normalize_rows, top_k
+
+
+class ScalarQuantizer:
+    """차원별 affine(scale/offset) int8 양자화"""
+
+    def __init__(self, scale: np.ndarray | None = None, offset: np.ndarray | None = None):
+        """
+        Args:
+            scale (np.ndarray, optional): 차원별 스케일 (code 1 당 실수 값)
+            offset (np.ndarray, optional): 차원별 중심값 (code 0 에 대응)
+        """
+        self.scale = scale
+        self.offset = offset
+
+    @property
+    def is_calibrated(self) -> bool:
+        return self.scale is not None and self.offset is not None
+
+    def calibrate(self, matrix: np.ndarray, clip_percentile: float = 0.5, per_dimension: bool = True) -> 'ScalarQuantizer':
+        """
+        카탈로그 벡터로 범위를 보정합니다. 극단값은 percentile 로 잘라 해상도를 확보합니다.
+
+        per_dimension=True 는 차원별 scale/offset 으로 복원 오차를 최소화합니다 (decode 후 재정렬용).
+        Atlas 는 int8 코드 자체의 cosine 으로 순위를 매기므로, 코드를 그대로 인덱싱할 때는
+        per_dimension=False (공통 scale, offset 0) 가 원래 벡터 공간의 기하를 보존합니다.
+
+        Args:
+            matrix (np.ndarray): (n, dim) 보정용 벡터
+            clip_percentile (float): 양끝에서 잘라낼 백분위 (0 이면 min/max)
+            per_dimension (bool): 차원별 보정 여부
+        """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        dim = matrix.shape[1]
+        if per_dimension:
+            low = np.percentile(matrix, clip_percentile, axis=0)
+            high = np.percentile(matrix, 100 - clip_percentile, axis=0)
+            span = np.maximum(high - low, 1e-12)
+            self.offset = ((high + low) / 2).astype(np.float32)
+            self.scale = (span / 254).astype(np.float32)
+        else:
+            bound = max(float(np.percentile(np.abs(matrix), 100 - clip_percentile)), 1e-12)
+            self.offset = np.zeros(dim, dtype=np.float32)
+            self.scale = np.full(dim, bound / 127, dtype=np.float32)
+        return self
+
+    def _check(self) -> None:
+        if not self.is_calibrated:
+            raise RuntimeError('ScalarQuantizer is not calibrated. Call calibrate() first.')
+
+    def encode(self, matrix: np.ndarray) -> np.ndarray:
+        """float32 -> int8 코드 ([-127, 127])"""
+        self._check()
+        codes = np.rint((np.asarray(matrix, dtype=np.float32) - self.offset) / self.scale)
+        return np.clip(codes, -127, 127).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """int8 코드 -> 근사 float32"""
+        self._check()
+        return codes.astype(np.float32) * self.scale + self.offset
+
+    def to_bson(self, vector: list[float] | np.ndarray) -> Binary:
+        """단일 벡터를 BSON int8 벡터로 변환"""
+        return Binary.from_vector(self.encode(vector).tolist(), BinaryVectorDtype.INT8)
+
+    def save(self, path: str | Path) -> None:
+        self._check()
+        np.savez(path, scale=self.scale, offset=self.offset)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'ScalarQuantizer':
+        data = np.load(path)
+        return cls(scale=data['scale'], offset=data['offset'])
+
+
+class BinaryQuantizer:
+    """차원별 임계값 기준 1-bit 양자화 (packed bit)"""
+
+    def __init__(self, threshold: np.ndarray | None = None):
+        """
+        Args:
+            threshold (np.ndarray, optional): 차원별 임계값. None 이면 0 (부호 비트)
+        """
+        self.threshold = threshold
+
+    def calibrate(self, matrix: np.ndarray) -> 'BinaryQuantizer':
+        """차원별 평균을 임계값으로 사용해 비트가 고르게 분포하도록 보정"""
+        self.threshold = np.asarray(matrix, dtype=np.float32).mean(axis=0)
+        return self
+
+    def encode(self, matrix: np.ndarray) -> np.ndarray:
+        """float32 -> packed bit (uint8, 차원 / 8 바이트)"""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        threshold = self.threshold if self.threshold is not None else 0.0
+        return np.packbits(matrix > threshold, axis=-1)
+
+    def to_bson(self, vector: list[float] | np.ndarray) -> Binary:
+        """단일 벡터를 BSON packed bit 벡터로 변환"""
+        vector = np.asarray(vector, dtype=np.float32)
+        padding = (-vector.shape[-1]) % 8
+        return Binary.from_vector(self.encode(vector).tolist(), BinaryVectorDtype.PACKED_BIT, padding)
+
+    def save(self, path: str | Path) -> None:
+        np.savez(path, threshold=self.threshold if self.threshold is not None else np.zeros(0, dtype=np.float32))
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'BinaryQuantizer':
+        threshold = np.load(path)['threshold']
+        return cls(threshold=threshold if threshold.size else None)
+
+
+# ===========================================================================
+# recall 벤치마크
+# ===========================================================================
+
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint16)
+
+
+def hamming_distances(query_bits: np.ndarray, corpus_bits: np.ndarray, block_size: int = 4096) -> np.ndarray:
+    """packed bit 쿼리 (q, b) 와 코퍼스 (n, b) 사이의 해밍 거리 (q, n). 메모리 사용량을 위해 코퍼스를 블록 단위로 계산"""
+    distances = np.empty((len(query_bits), len(corpus_bits)), dtype=np.uint16)
+    for start in range(0, len(corpus_bits), block_size):
+        block = corpus_bits[start : start + block_size]
+        xor = np.bitwise_xor(query_bits[:, None, :], block[None, :, :])
+        distances[:, start : start + len(block)] = _POPCOUNT[xor].sum(axis=-1)
+    return distances
+
+
+def recall_at_k(approx_indices: np.ndarray, exact_indices: np.ndarray) -> float:
+    """쿼리별 |approx ∩ exact| / k 의 평균"""
+    k = exact_indices.shape[1]
+    hits = [len(set(a[:k].tolist()) & set(e.tolist())) for a, e in zip(approx_indices, exact_indices, strict=True)]
+    return float(np.mean(hits) / k) if hits else 0.0
+
+
+def benchmark_quantization(
+    matrix: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    scalar_quantizer: ScalarQuantizer | None = None,
+    binary_quantizer: BinaryQuantizer | None = None,
+    rescore_factor: int = 10,
+) -> dict[str, Any]:
+    """
+    float32 exact top-k 대비 양자화 방식별 recall@k 와 저장 용량을 측정합니다.
+
+    Args:
+        matrix (np.ndarray): (n, dim) 카탈로그 벡터
+        queries (np.ndarray): (q, dim) 샘플 쿼리 벡터
+        k (int): recall@k 의 k
+        scalar_quantizer (ScalarQuantizer, optional): 보정된 int8 양자화기.
+            None 이면 int8 은 공통 scale(per_dimension=False, 인덱싱용), int8_decoded 는 차원별 보정으로 측정
+        binary_quantizer (BinaryQuantizer, optional): 보정된 binary 양자화기. None 이면 matrix 로 보정
+        rescore_factor (int): binary 후보를 k * rescore_factor 개 뽑아 float32 로 재정렬
+
+    Returns:
+        dict[str, Any]: 방식별 recall, 벡터당 바이트, 소요 시간
+            - int8 : int8 코드의 cosine (Atlas 가 int8 인덱스에서 계산하는 값)
+            - int8_decoded : decode 한 근사 벡터의 cosine (애플리케이션 재정렬 시)
+            - binary / binary_rescored : 해밍 거리 / 해밍 후보의 float32 재정렬
+    """
+    matrix = normalize_rows(matrix)
+    queries = normalize_rows(queries)
+    dim = matrix.shape[1]
+    index_quantizer = scalar_quantizer or ScalarQuantizer().calibrate(matrix, per_dimension=False)
+    decode_quantizer = scalar_quantizer or ScalarQuantizer().calibrate(matrix)
+    binary_quantizer = binary_quantizer or BinaryQuantizer().calibrate(matrix)
+
+    report: dict[str, Any] = {'num_vectors': len(matrix), 'num_queries': len(queries), 'dimensions': dim, 'k': k}
+
+    start = time.perf_counter()
+    exact = top_k(queries @ matrix.T, k)
+    report['float32'] = {'recall': 1.0, 'bytes_per_vector': dim * 4, 'seconds': time.perf_counter() - start}
+
+    # Atlas 가 int8 인덱스에서 계산하는 것과 동일하게 코드 공간의 cosine 으로 순위 산출
+    start = time.perf_counter()
+    corpus_codes = normalize_rows(index_quantizer.encode(matrix).astype(np.float32))
+    query_codes = normalize_rows(index_quantizer.encode(queries).astype(np.float32))
+    int8_top = top_k(query_codes @ corpus_codes.T, k)
+    report['int8'] = {'recall': recall_at_k(int8_top, exact), 'bytes_per_vector': dim, 'seconds': time.perf_counter() - start}
+
+    start = time.perf_counter()
+    decoded = normalize_rows(decode_quantizer.decode(decode_quantizer.encode(matrix)))
+    decoded_top = top_k(queries @ decoded.T, k)
+    report['int8_decoded'] = {'recall': recall_at_k(decoded_top, exact), 'bytes_per_vector': dim, 'seconds': time.perf_counter() - start}
+
+    start = time.perf_counter()
+    distances = hamming_distances(binary_quantizer.encode(queries), binary_quantizer.encode(matrix))
+    binary_top = top_k(-distances.astype(np.float32), k)
+    report['binary'] = {
+        'recall': recall_at_k(binary_top, exact),
+        'bytes_per_vector': (dim + 7) // 8,
+        'seconds': time.perf_counter() - start,
+    }
+
+    # binary 로 넓게 뽑은 뒤 float32 로 재정렬 (Atlas 의 rescoring 과 동일한 구조)
+    start = time.perf_counter()
+    candidates = top_k(-distances.astype(np.float32), k * rescore_factor)
+    rescored = np.einsum('qd,qcd->qc', queries, matrix[candidates])
+    rescore_top = np.take_along_axis(candidates, top_k(rescored, k), axis=-1)
+    report['binary_rescored'] = {
+        'recall': recall_at_k(rescore_top, exact),
+        'bytes_per_vector': (dim + 7) // 8,
+        'seconds': time.perf_counter() - start + report['binary']['seconds'],
+    }
+    return report
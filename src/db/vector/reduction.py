@@ -0,0 +1,203 @@
+"""
+차원 축소 기반 2단계 벡터 검색
+
+- DimensionReducer : 3072 차원 임베딩을 Matryoshka 방식 앞부분 절단(truncate) 또는 오프라인 PCA 투영으로 축소
+  (text-embedding-3 계열은 앞쪽 차원에 정보가 몰려 있어 절단만으로도 순위가 크게 유지됨)
+- TwoStageVectorEngine : 축소 차원 엔진으로 후보를 넓게 뽑고 전체 차원 exact cosine 으로 재정렬
+- benchmark_two_stage : 전체 차원 exact top-k 대비 후보 배수별 recall / 지연시간 / 벡터당 바이트 측정
+"""
+
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .base import BaseVectorEngine, cosine_to_score, normalize_rows, top_k
+from .quantization import recall_at_k
+
+
+class DimensionReducer:
+    """truncate / pca 차원 축소기 (출력은 L2 정규화된 float32)"""
+
+    METHODS = ('truncate', 'pca')
+
+    def __init__(self, method: str = 'truncate', dimensions: int | None = None, mean: np.ndarray | None = None, components: np.ndarray | None = None):
+        """
+        Args:
+            method (str): 'truncate' (앞쪽 dimensions 개 차원 사용) 또는 'pca'
+            dimensions (int, optional): 축소 차원
+            mean (np.ndarray, optional): PCA 중심 벡터 (dim,)
+            components (np.ndarray, optional): PCA 주성분 (dimensions, dim)
+        """
+        if method not in self.METHODS:
+            raise ValueError(f'method 의 값이 올바르지 않습니다. : {method} \n 허용된 값 : {self.METHODS}')
+        self.method = method
+        self.dimensions = dimensions if dimensions is not None else (len(components) if components is not None else None)
+        self.mean = mean
+        self.components = components
+        self.explained_variance_ratio: float | None = None
+
+    @property
+    def is_fitted(self) -> bool:
+        if self.method == 'truncate':
+            return self.dimensions is not None
+        return self.mean is not None and self.components is not None
+
+    def fit(self, matrix: np.ndarray, dimensions: int | None = None) -> 'DimensionReducer':
+        """
+        카탈로그 샘플로 축소기를 보정합니다. (truncate 는 차원만 설정)
+
+        Args:
+            matrix (np.ndarray): (n, dim) 보정용 벡터. PCA 는 n >= dimensions 권장
+            dimensions (int, optional): 축소 차원
+        """
+        self.dimensions = dimensions or self.dimensions
+        if self.dimensions is None:
+            raise ValueError('dimensions is required')
+        if self.method == 'truncate':
+            return self
+
+        matrix = normalize_rows(matrix)
+        self.mean = matrix.mean(axis=0)
+        _, singular_values, vt = np.linalg.svd(matrix - self.mean, full_matrices=False)
+        self.components = vt[: self.dimensions].astype(np.float32)
+        variance = singular_values**2
+        self.explained_variance_ratio = float(variance[: self.dimensions].sum() / variance.sum()) if variance.sum() else 0.0
+        return self
+
+    def transform(self, matrix: np.ndarray | list[float]) -> np.ndarray:
+        """(dim,) 또는 (n, dim) -> 정규화된 (n, dimensions)"""
+        if not self.is_fitted:
+            raise RuntimeError('DimensionReducer is not fitted. Call fit() first.')
+        matrix = normalize_rows(np.atleast_2d(np.asarray(matrix, dtype=np.float32)))
+        if self.method == 'truncate':
+            return normalize_rows(matrix[:, : self.dimensions])
+        return normalize_rows((matrix - self.mean) @ self.components.T)
+
+    def save(self, path: str | Path) -> None:
+        if not self.is_fitted:
+            raise RuntimeError('DimensionReducer is not fitted. Call fit() first.')
+        empty = np.zeros(0, dtype=np.float32)
+        np.savez(
+            path,
+            method=np.array(self.method),
+            dimensions=np.array(self.dimensions),
+            mean=self.mean if self.mean is not None else empty,
+            components=self.components if self.components is not None else empty,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'DimensionReducer':
+        data = np.load(path)
+        return cls(
+            method=str(data['method']),
+            dimensions=int(data['dimensions']),
+            mean=data['mean'] if data['mean'].size else None,
+            components=data['components'] if data['components'].size else None,
+        )
+
+
+class TwoStageVectorEngine(BaseVectorEngine):
+    """축소 차원 후보 검색 + 전체 차원 exact 재정렬 엔진"""
+
+    def __init__(self, candidate_engine: BaseVectorEngine, full_matrix: np.ndarray, reducer: DimensionReducer, candidate_multiplier: int = 10):
+        """
+        Args:
+            candidate_engine (BaseVectorEngine): 축소 차원 행렬로 구축한 엔진 (HNSW / Exact)
+            full_matrix (np.ndarray): 정규화된 전체 차원 행렬 (candidate_engine.ids 와 같은 행 순서, np.memmap 가능)
+            reducer (DimensionReducer): candidate_engine 구축에 사용한 축소기
+            candidate_multiplier (int): 1단계에서 limit * candidate_multiplier 개 후보를 뽑음
+        """
+        super().__init__(candidate_engine.ids, documents=candidate_engine.documents)
+        self.columns = candidate_engine.columns
+        self.candidate_engine = candidate_engine
+        self.full_matrix = full_matrix
+        self.reducer = reducer
+        self.candidate_multiplier = candidate_multiplier
+        self._rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+
+    @classmethod
+    def build(
+        cls,
+        ids: np.ndarray,
+        matrix: np.ndarray,
+        reducer: DimensionReducer,
+        engine_cls: type[BaseVectorEngine],
+        columns: dict[str, np.ndarray] | None = None,
+        documents: dict[Any, dict] | None = None,
+        candidate_multiplier: int = 10,
+        **engine_kwargs: Any,
+    ) -> 'TwoStageVectorEngine':
+        """전체 차원 행렬을 축소해 engine_cls 로 1단계 엔진을 구축합니다."""
+        full_matrix = normalize_rows(matrix)
+        candidate_engine = engine_cls(ids, reducer.transform(full_matrix), columns, documents, **engine_kwargs)
+        return cls(candidate_engine, full_matrix, reducer, candidate_multiplier)
+
+    def filter_mask(self, filter_expr: dict | None) -> np.ndarray | None:
+        return self.candidate_engine.filter_mask(filter_expr)
+
+    def search(self, embedding: list[float] | np.ndarray, limit: int, filter_expr: dict | None = None) -> list[tuple[Any, float]]:
+        query = normalize_rows(np.asarray(embedding, dtype=np.float32))
+        candidates = self.candidate_engine.search(self.reducer.transform(query)[0], limit * self.candidate_multiplier, filter_expr)
+        if not candidates:
+            return []
+        # 행 번호 순으로 읽어 memmap 행렬의 순차 접근을 유도
+        rows = np.sort(np.fromiter((self._rows[doc_id] for doc_id, _ in candidates), dtype=np.int64, count=len(candidates)))
+        sims = np.asarray(self.full_matrix[rows]) @ query
+        top = top_k(sims, limit)
+        return [(self.ids[rows[i]], float(cosine_to_score(sims[i]))) for i in top]
+
+
+def benchmark_two_stage(
+    matrix: np.ndarray,
+    queries: np.ndarray,
+    reducer: DimensionReducer,
+    k: int = 10,
+    candidate_multipliers: tuple[int, ...] = (1, 2, 5, 10),
+) -> dict[str, Any]:
+    """
+    전체 차원 exact top-k 대비 2단계 검색의 recall@k / 쿼리당 지연시간을 측정합니다.
+    1단계는 축소 차원 exact 검색으로 계산하므로 ANN 그래프 오차를 제외한 차원 축소 자체의 손실을 보여줍니다.
+
+    Args:
+        matrix (np.ndarray): (n, dim) 카탈로그 벡터
+        queries (np.ndarray): (q, dim) 샘플 쿼리 벡터
+        reducer (DimensionReducer): 보정된 축소기
+        k (int): recall@k 의 k
+        candidate_multipliers (tuple[int, ...]): 1단계 후보 수 = k * multiplier
+
+    Returns:
+        dict[str, Any]: full / 후보 배수별 recall, 쿼리당 ms, 벡터당 바이트
+    """
+    matrix = normalize_rows(matrix)
+    queries = normalize_rows(queries)
+    dim = matrix.shape[1]
+    report: dict[str, Any] = {
+        'num_vectors': len(matrix),
+        'num_queries': len(queries),
+        'dimensions': dim,
+        'reduced_dimensions': reducer.dimensions,
+        'method': reducer.method,
+        'explained_variance_ratio': reducer.explained_variance_ratio,
+        'k': k,
+    }
+
+    start = time.perf_counter()
+    exact = top_k(queries @ matrix.T, k)
+    report['full'] = {'recall': 1.0, 'ms_per_query': (time.perf_counter() - start) * 1000 / len(queries), 'bytes_per_vector': dim * 4}
+
+    reduced_matrix = reducer.transform(matrix)
+    for multiplier in candidate_multipliers:
+        start = time.perf_counter()
+        reduced_queries = reducer.transform(queries)
+        candidates = top_k(reduced_queries @ reduced_matrix.T, k * multiplier)
+        rescored = np.einsum('qd,qcd->qc', queries, matrix[candidates])
+        reranked = np.take_along_axis(candidates, top_k(rescored, k), axis=-1)
+        report[f'x{multiplier}'] = {
+            'candidates': k * multiplier,
+            'recall': recall_at_k(reranked, exact),
+            'ms_per_query': (time.perf_counter() - start) * 1000 / len(queries),
+            'bytes_per_vector': reducer.dimensions * 4,
+        }
+    return report
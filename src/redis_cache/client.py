@@ -188,6 +188,25 @@ class RedisCacheClient:
             logger.error(f'Failed to set expiration for cache key {key}: {e}')
             return False
 
+    async def incr(self, key: str, amount: int = 1) -> int | None:
+        """Atomically increment an integer counter.
+
+        Args:
+            key: Cache key
+            amount: Increment amount
+
+        Returns:
+            Value after increment, or None on error
+        """
+        if not self._client:
+            raise RuntimeError('Redis client not connected. Call connect() first.')
+
+        try:
+            return await self._client.incrby(key, amount)
+        except RedisError as e:
+            logger.error(f'Failed to increment cache key {key}: {e}')
+            return None
+
     # async def ttl(self, key: str) -> int:
     #     """Get remaining time to live for a key.(key에 대한 만료시간 조회)
 
@@ -10,7 +10,7 @@ from typing import Any
 
 from loguru import logger
 
-from db import get_async_fashion_sku_repo
+from db import get_async_fashion_sku_repo, set_cache_client, shutdown_mongo, startup_mongo
 from db.repository.fashion_async import AsyncFashionRepository
 from redis_cache.client import RedisCacheClient
 from redis_cache.config import redis_settings
@@ -131,7 +131,8 @@ async def update_cache_and_db_task(
         update_data = {k: v for k, v in update_data.items() if v is not None}
 
         if update_data:
-            matched, modified = await repository.update_by_id(product_sku_id, update_data, upsert=True)
+            # Concurrent price refreshes are merged into one bulk_write by the repository's write-behind buffer
+            matched, modified = await repository.buffered_update_by_id(product_sku_id, update_data, upsert=True)
             if matched == -1:
                 # 기술적 오류 발생
                 logger.error(f'[TaskQueue] Database error updating product {product_sku_id}: matched={matched}, modified={modified}')
@@ -139,6 +140,7 @@ async def update_cache_and_db_task(
             elif matched > 0:
                 # 문서가 존재하고 업데이트 시도됨
                 if modified > 0:
+                    # 벡터 검색 결과 캐시는 repository 가 flush 된 배치당 한 번 무효화
                     logger.info(f'[TaskQueue] Successfully updated DB for product {product_sku_id} (modified {modified} fields)')
                 else:
                     logger.info(f'[TaskQueue] DB update completed for product {product_sku_id} (no changes needed)')
@@ -293,7 +295,11 @@ async def startup(ctx: dict[str, Any]) -> None:
     await redis_client.connect()
     ctx['redis_client'] = redis_client
 
-    # Initialize MongoDB repository for reuse across tasks
+    # Create the process-wide shared MongoDB client, then a repository view over it
+    await startup_mongo(ctx)
+    # Repositories created from here on get the Redis-backed search and product read caches attached
+    # (update_by_id invalidates the shared L2 product entries when a document changes)
+    set_cache_client(redis_client)
     mongodb_repo = await get_async_fashion_sku_repo()
     ctx['mongodb_repo'] = mongodb_repo
 
@@ -309,15 +315,20 @@ async def shutdown(ctx: dict[str, Any]) -> None:
     logger.info('ARQ worker shutting down...')
     # Cleanup resources
 
-    # Close Redis connection
+    # Flush buffered price updates first: the flush invalidates caches through Redis
+    # and writes through the MongoDB client, so both must still be open
+    if 'mongodb_repo' in ctx:
+        await ctx['mongodb_repo'].flush_writes()
+
+    # Close Redis connection (detach it from the repositories first)
     if 'redis_client' in ctx:
+        set_cache_client(None)
         await ctx['redis_client'].close()
         logger.info('Redis connection closed')
 
-    # Close MongoDB connection
-    if 'mongodb_repo' in ctx:
-        await ctx['mongodb_repo'].close()
-        logger.info('MongoDB connection closed')
+    # Close the shared MongoDB client (repositories are views over it)
+    await shutdown_mongo(ctx)
+    logger.info('MongoDB connection closed')
 
     logger.info('ARQ worker shutdown completed')
 
@@ -0,0 +1,5 @@
+import sys
+import types
+
+# db.repository.fashion_sync 는 사용하지 않는 embedding 패키지를 import 하므로, 설치되지 않은 환경에서도 모듈을 불러올 수 있게 합니다.
+sys.modules.setdefault('embedding', types.SimpleNamespace(JinaEmbedding=object))
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+from bson.binary import Binary, BinaryVectorDtype
+from pymongo.results import BulkWriteResult
+
+from db.repository.backfill import PartitionedBackfill, bson_vector_converter
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        self.documents = sorted(self.documents, key=lambda doc: doc[key])
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = {doc['_id']: doc for doc in documents}
+        self.writes: dict[int, int] = {}
+        self.fail_after = None
+
+    async def aggregate(self, pipeline):
+        return FakeCursor([{'_id': doc_id} for doc_id in self.documents])
+
+    async def estimated_document_count(self):
+        return len(self.documents)
+
+    def find(self, query, projection=None):
+        id_range = query.get('_id', {})
+
+        def in_range(doc_id):
+            return (
+                doc_id > id_range.get('$gt', -1) and doc_id >= id_range.get('$gte', -1) and doc_id < id_range.get('$lt', float('inf'))
+            )
+
+        return FakeCursor([{'_id': doc['_id'], 'vec': doc['vec']} for doc in self.documents.values() if 'vec' in doc and in_range(doc['_id'])])
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail_after is not None and sum(self.writes.values()) >= self.fail_after:
+            raise ConnectionError('network down')
+        for op in operations:
+            doc_id = op._filter['_id']
+            self.documents[doc_id].update(op._doc['$set'])
+            self.writes[doc_id] = self.writes.get(doc_id, 0) + 1
+        return BulkWriteResult({'nMatched': len(operations), 'nModified': len(operations)}, acknowledged=True)
+
+
+class FakeCheckpointStore:
+    def __init__(self):
+        self.state = {}
+
+    async def load(self, name):
+        return self.state.get(name)
+
+    async def clear(self, name):
+        self.state.pop(name, None)
+
+    async def save(self, name, **state):
+        document = self.state.setdefault(name, {'_id': name})
+        for path, value in state.items():
+            *parents, leaf = path.split('.')
+            target = document
+            for key in parents:
+                target = target.setdefault(key, {})
+            target[leaf] = value
+
+
+def make_backfill(collection, store):
+    convert = partial(bson_vector_converter, target_field='vec_bson', vector_dtype=BinaryVectorDtype.FLOAT32)
+    return PartitionedBackfill(collection, 'vec', convert, name='test', checkpoint_store=store, partitions=4, batch_size=5, executor=ThreadPoolExecutor(2))
+
+
+@pytest.mark.asyncio
+async def test_partitions_cover_every_document_once_and_resume():
+    documents = [{'_id': i, 'vec': [float(i), 1.0]} for i in range(200)] + [{'_id': 200, 'other': 1}]
+    collection = FakeCollection(documents)
+    store = FakeCheckpointStore()
+
+    collection.fail_after = 60
+    with pytest.raises(ConnectionError):
+        await make_backfill(collection, store).run()
+    assert store.state['test']['status'] == 'running'
+
+    collection.fail_after = None
+    stats = await make_backfill(collection, store).run()
+
+    assert all(collection.writes.get(i) == 1 for i in range(200))
+    assert isinstance(collection.documents[7]['vec_bson'], Binary)
+    assert collection.documents[7]['vec_bson'].as_vector().data == [7.0, 1.0]
+    assert stats['processed'] == 200 - 60
+    assert store.state['test']['status'] == 'completed'
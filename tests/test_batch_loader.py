@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from db.repository.batch_loader import BatchLoader
+from db.repository.fashion_async import AsyncFashionRepository
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = {doc['_id']: doc for doc in documents}
+        self.find_calls = []
+
+    def find(self, query, projection=None):
+        ids = query['_id']['$in']
+        self.find_calls.append(ids)
+        return FakeCursor([self.documents[doc_id] for doc_id in ids if doc_id in self.documents])
+
+
+@pytest.mark.asyncio
+async def test_loader_coalesces_same_tick_calls():
+    batches = []
+
+    async def batch_fn(keys):
+        batches.append(keys)
+        return {key: key * 10 for key in keys if key != 3}
+
+    loader = BatchLoader(batch_fn, max_batch_size=3)
+    results = await asyncio.gather(*(loader.load(key) for key in [1, 2, 2, 3, 4]))
+    assert results == [10, 20, 20, None, 40]
+    assert batches == [[1, 2, 3], [4]]
+
+    # memoize: 다시 조회하지 않음
+    assert await loader.load(1) == 10
+    assert len(batches) == 2
+
+
+@pytest.mark.asyncio
+async def test_loader_failure_is_not_memoized():
+    calls = 0
+
+    async def batch_fn(keys):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError('boom')
+        return {key: key for key in keys}
+
+    loader = BatchLoader(batch_fn)
+    with pytest.raises(RuntimeError):
+        await asyncio.gather(loader.load('a'), loader.load('b'))
+    assert await loader.load('a') == 'a'
+
+
+@pytest.mark.asyncio
+async def test_find_by_id_fan_out_uses_one_query():
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    repo.collection = FakeCollection([{'_id': f'sku-{i}', 'products': {'product_id': i}} for i in range(5)])
+
+    async with repo.request_scope():
+        documents = await asyncio.gather(*(repo.find_by_id(f'sku-{i}', profile='card') for i in [0, 1, 2, 2, 9]))
+        assert [doc['_id'] if doc else None for doc in documents] == ['sku-0', 'sku-1', 'sku-2', 'sku-2', None]
+        await repo.find_by_id('sku-1', profile='card')
+    assert repo.collection.find_calls == [['sku-0', 'sku-1', 'sku-2', 'sku-9']]
@@ -0,0 +1,96 @@
+import bson
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError, OperationFailure
+from pymongo.results import BulkWriteResult
+
+from db.config.config import Config
+from db.repository.fashion_sync import FashionRepository
+
+
+class FakeCollection:
+    def __init__(self, responses=()):
+        # bulk_write 호출마다 순서대로 꺼낼 예외 (없으면 성공)
+        self.responses = list(responses)
+        self.calls = []
+
+    def bulk_write(self, operations, ordered=True):
+        documents = [op._doc for op in operations]
+        for document in documents:
+            document.setdefault('_id', bson.ObjectId())
+        self.calls.append([document['_id'] for document in documents])
+        if self.responses and (error := self.responses.pop(0)) is not None:
+            raise error
+        return BulkWriteResult({'nInserted': len(documents)}, acknowledged=True)
+
+
+def make_repo(collection):
+    # DatabaseManager 연결 없이 청크 로직만 검사
+    repo = FashionRepository.__new__(FashionRepository)
+    repo.collection = collection
+    repo.query_builder = type('QueryBuilder', (), {'config': Config()})()
+    return repo
+
+
+def bulk_write_error(*errors):
+    write_errors = [{'index': index, 'code': code, 'errmsg': 'error', 'op': {'_id': f'doc-{index}'}} for index, code in errors]
+    return BulkWriteError({'writeErrors': write_errors, 'nInserted': 0})
+
+
+def test_split_into_chunks_respects_count_and_bytes():
+    documents = [{'_id': index, 'payload': 'x' * 100} for index in range(7)]
+    document_bytes = len(bson.encode(documents[0]))
+
+    chunks = FashionRepository._split_into_chunks(documents, chunk_size=3, max_chunk_bytes=10**6)
+    assert [(offset, len(chunk)) for offset, chunk, _ in chunks] == [(0, 3), (3, 3), (6, 1)]
+    assert chunks[0][2] == 3 * document_bytes
+
+    chunks = FashionRepository._split_into_chunks(documents, chunk_size=10, max_chunk_bytes=2 * document_bytes + 1)
+    assert [(offset, len(chunk)) for offset, chunk, _ in chunks] == [(0, 2), (2, 2), (4, 2), (6, 1)]
+
+
+def test_split_into_chunks_keeps_oversized_document_alone():
+    documents = [{'_id': 0, 'payload': 'x' * 1000}, {'_id': 1}]
+    chunks = FashionRepository._split_into_chunks(documents, chunk_size=10, max_chunk_bytes=100)
+    assert [[doc['_id'] for doc in chunk] for _, chunk, _ in chunks] == [[0], [1]]
+
+
+def test_insert_chunk_reports_failed_indexes():
+    repo = make_repo(FakeCollection([bulk_write_error((1, 121))]))
+    chunk = [{'_id': f'doc-{index}'} for index in range(3)]
+
+    inserted_ids, errors = repo._insert_chunk(chunk, max_retries=2, retry_backoff=0)
+    assert inserted_ids == ['doc-0', 'doc-2']
+    assert [(error['index'], error['code']) for error in errors] == [(1, 121)]
+
+
+def test_insert_chunk_counts_duplicates_after_retry_as_inserted():
+    # 첫 시도는 연결 끊김, 재시도에서는 이미 들어간 doc-0 이 중복 키로 돌아옴
+    repo = make_repo(FakeCollection([AutoReconnect('connection reset'), bulk_write_error((0, 11000), (2, 121))]))
+    chunk = [{'_id': f'doc-{index}'} for index in range(3)]
+
+    inserted_ids, errors = repo._insert_chunk(chunk, max_retries=2, retry_backoff=0)
+    assert len(repo.collection.calls) == 2
+    assert inserted_ids == ['doc-0', 'doc-1']
+    assert [error['index'] for error in errors] == [2]
+
+
+def test_insert_chunk_gives_up_on_non_transient_error():
+    repo = make_repo(FakeCollection([OperationFailure('unauthorized')]))
+    inserted_ids, errors = repo._insert_chunk([{'_id': 1}, {'_id': 2}], max_retries=3, retry_backoff=0)
+    assert inserted_ids == []
+    assert errors[0]['type'] == 'chunk_error' and errors[0]['count'] == 2
+    assert len(repo.collection.calls) == 1
+
+
+def test_chunked_bulk_insert_returns_inserted_ids_in_document_order(monkeypatch):
+    monkeypatch.setitem(Config().get_bulk_insert_config(), 'CHUNK_SIZE', 2)
+    # 워커 하나면 청크가 offset 순서대로 실행되어 두 번째 청크가 오류 응답을 받음
+    monkeypatch.setitem(Config().get_bulk_insert_config(), 'MAX_WORKERS', 1)
+    repo = make_repo(FakeCollection([None, bulk_write_error((0, 121))]))
+    documents = [{'_id': index} for index in range(5)]
+
+    result = repo.bulk_insert_documents(None, documents, chunked=True)
+    assert result['chunk_count'] == 3
+    assert result['inserted_count'] == 4 and result['error_count'] == 1
+    assert result['inserted_ids'] == [0, 1, 3, 4]
+    assert result['errors'][0]['index'] == 2
@@ -0,0 +1,106 @@
+import pytest
+from pymongo.errors import BulkWriteError
+from pymongo.results import BulkWriteResult
+
+from db.config.config import Config
+from db.repository import fashion_sync
+from db.repository.fashion_sync import FashionRepository
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+class FakeCollection:
+    def __init__(self, clock, latencies_ms=(), errors=None):
+        # latencies_ms: 청크(bulk_write 호출)마다 흘려보낼 시간, errors: 호출 번호 -> 실패시킬 연산 index 리스트
+        self.clock = clock
+        self.latencies_ms = list(latencies_ms)
+        self.errors = errors or {}
+        self.calls = []
+
+    def bulk_write(self, operations, ordered=True):
+        self.calls.append([op._filter['_id'] for op in operations])
+        if self.latencies_ms:
+            self.clock.now += self.latencies_ms.pop(0) / 1000
+        failed = self.errors.get(len(self.calls) - 1, [])
+        succeeded = len(operations) - len(failed)
+        if failed:
+            write_errors = [{'index': index, 'code': 121, 'errmsg': 'Document failed validation'} for index in failed]
+            raise BulkWriteError({'writeErrors': write_errors, 'nMatched': succeeded, 'nModified': succeeded})
+        return BulkWriteResult({'nMatched': succeeded, 'nModified': succeeded}, acknowledged=True)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(fashion_sync, 'time', clock)
+    settings = Config().get_bulk_update_config()
+    for key, value in {'INITIAL_CHUNK_SIZE': 4, 'MIN_CHUNK_SIZE': 2, 'MAX_CHUNK_SIZE': 8, 'TARGET_CHUNK_LATENCY_MS': 500}.items():
+        monkeypatch.setitem(settings, key, value)
+    return clock
+
+
+def make_repo(collection):
+    # DatabaseManager 연결 없이 청크 로직만 검사
+    repo = FashionRepository.__new__(FashionRepository)
+    repo.collection = collection
+    repo.query_builder = type('QueryBuilder', (), {'config': Config()})()
+    return repo
+
+
+def test_chunk_size_adapts_to_latency(clock):
+    # 느림 -> 절반, 빠름 -> 두 배 (MAX 에서 멈춤), 목표 근처 -> 유지
+    repo = make_repo(FakeCollection(clock, latencies_ms=[1000, 10, 10, 10, 300, 10]))
+    updates = [(f'doc-{index}', {'price': index}) for index in range(30)]
+
+    result = repo.bulk_update_document_payloads(updates)
+    assert [chunk['size'] for chunk in result['chunks']] == [4, 2, 4, 8, 8, 4]
+    assert [chunk['offset'] for chunk in result['chunks']] == [0, 4, 6, 10, 18, 26]
+    assert result['success'] and result['modified_count'] == 30
+
+
+def test_errors_are_reported_against_update_positions(clock):
+    # 두 번째 청크 (doc-4..7) 에서 doc-5 는 빈 payload 라 건너뛰므로 연산 index 1 은 doc-6
+    repo = make_repo(FakeCollection(clock, latencies_ms=[300, 300], errors={1: [1]}))
+    updates = [(f'doc-{index}', {} if index == 5 else {'price': index}) for index in range(8)]
+
+    result = repo.bulk_update_document_payloads(updates)
+    assert repo.collection.calls[1] == ['doc-4', 'doc-6', 'doc-7']
+    assert result['error_count'] == 1
+    assert (result['errors'][0]['index'], result['errors'][0]['document_id']) == (6, 'doc-6')
+    assert result['modified_count'] == 6 and not result['success']
+
+
+def test_generator_input_is_consumed_per_chunk(clock):
+    consumed = []
+
+    def updates():
+        for index in range(10):
+            consumed.append(index)
+            yield f'doc-{index}', {'price': index}
+
+    collection = FakeCollection(clock, latencies_ms=[300, 300, 300])
+    collection_write = collection.bulk_write
+
+    def bulk_write(operations, ordered=True):
+        # 청크를 쓸 때까지 제너레이터는 그 청크만큼만 읽혀 있어야 함
+        assert len(consumed) == len(sum(collection.calls, [])) + len(operations)
+        return collection_write(operations, ordered)
+
+    collection.bulk_write = bulk_write
+    result = make_repo(collection).bulk_update_document_payloads(updates())
+    assert [chunk['size'] for chunk in result['chunks']] == [4, 4, 2]
+    assert result['matched_count'] == 10
+
+
+def test_empty_updates_raise(clock):
+    with pytest.raises(ValueError):
+        make_repo(FakeCollection(clock)).bulk_update_document_payloads(iter([]))
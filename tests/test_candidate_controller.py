@@ -0,0 +1,81 @@
+import pytest
+
+from db.query_builders.candidate_controller import AdaptiveNumCandidates
+from db.query_builders.fashion_queries import FashionQueryBuilder
+
+
+class FakeCollection:
+    def __init__(self, total: int, matching: int):
+        self.total = total
+        self.matching = matching
+        self.count_calls = 0
+
+    async def estimated_document_count(self):
+        return self.total
+
+    async def count_documents(self, filter_expr):
+        self.count_calls += 1
+        return self.matching
+
+
+@pytest.mark.asyncio
+async def test_selective_filter_widens_candidates():
+    controller = AdaptiveNumCandidates(recall_target=0.95)
+    broad, _ = controller.choose(10)
+
+    collection = FakeCollection(total=100_000, matching=1_000)
+    narrow_filter = {'product_skus.gender': '여성'}
+    await controller.refresh(collection, narrow_filter)
+    await controller.refresh(collection, narrow_filter)
+    narrow, exact = controller.choose(10, narrow_filter)
+
+    assert collection.count_calls == 1
+    assert not exact
+    assert broad < narrow <= 1_000
+
+
+@pytest.mark.asyncio
+async def test_tiny_filter_switches_to_exact():
+    builder = FashionQueryBuilder()
+    dim = builder.vector_search_config.get('EMBEDDING_DIMENSIONS')
+    pre_filter = {'main_category': '상의', 'color': '블랙'}
+    compiled = builder.vector_search_filter(pre_filter)
+    await builder.candidate_controller.refresh(FakeCollection(total=100_000, matching=50), compiled)
+
+    stage = builder.vector_search_pipeline([0.1] * dim, limit=10, pre_filter=pre_filter, num_candidates='auto')[0]['$vectorSearch']
+    assert stage['exact'] is True
+    assert 'numCandidates' not in stage
+
+
+def test_higher_recall_target_uses_more_candidates():
+    low, _ = AdaptiveNumCandidates(recall_target=0.9).choose(10)
+    high, _ = AdaptiveNumCandidates(recall_target=0.99).choose(10)
+    assert 10 < low < high
+
+
+@pytest.mark.asyncio
+async def test_refresh_runs_in_background_and_estimates_are_bounded():
+    controller = AdaptiveNumCandidates(recall_target=0.95)
+    controller.max_estimates = 3
+    collection = FakeCollection(total=100_000, matching=1_000)
+
+    first = controller.schedule_refresh(collection, {'products.current_price': {'$lte': 0}})
+    # 같은 필터의 갱신은 하나만 실행되고, 호출자는 count 를 기다리지 않음
+    assert controller.schedule_refresh(collection, {'products.current_price': {'$lte': 0}}) is first
+    assert collection.count_calls == 0
+    await first
+    assert collection.count_calls == 1
+    assert controller.schedule_refresh(collection, {'products.current_price': {'$lte': 0}}) is None
+
+    for price in range(1, 6):
+        await controller.schedule_refresh(collection, {'products.current_price': {'$lte': price}})
+    assert len(controller._estimates) == 3
+    assert controller.matching_count({'products.current_price': {'$lte': 0}}) is None
+    assert controller.matching_count({'products.current_price': {'$lte': 5}}) == 1_000
+
+
+def test_fixed_mode_is_default():
+    builder = FashionQueryBuilder()
+    dim = builder.vector_search_config.get('EMBEDDING_DIMENSIONS')
+    stage = builder.vector_search_pipeline([0.1] * dim, limit=10)[0]['$vectorSearch']
+    assert stage['numCandidates'] == builder.vector_search_config.get('DEFAULT_NUM_CANDIDATES')
@@ -0,0 +1,371 @@
+import asyncio
+
+import numpy as np
+import pytest
+from pymongo import ReplaceOne
+from pymongo.results import BulkWriteResult, InsertManyResult
+
+from db.denormalization import DenormalizationService
+from db.sku_sync import SkuSyncService
+from db.vector.base import evaluate_filter, get_path
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        self.documents = sorted(self.documents, key=lambda doc: doc[key])
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def limit(self, limit):
+        self.documents = self.documents[:limit]
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+
+class FakeSource:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query):
+        after = query.get('_id', {}).get('$gt')
+        return FakeCursor([doc for doc in self.documents if after is None or doc['_id'] > after])
+
+
+class FakeTarget:
+    def __init__(self, fail_on_call=None):
+        self.documents = {}
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+
+    async def insert_many(self, documents, ordered=True):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise ConnectionError('network down')
+        self.documents.update({doc['_id']: doc for doc in documents})
+        return InsertManyResult([doc['_id'] for doc in documents], acknowledged=True)
+
+
+class FakeCheckpointStore:
+    def __init__(self):
+        self.state = {}
+
+    async def load(self, name):
+        return self.state.get(name)
+
+    async def save(self, name, **state):
+        self.state.setdefault(name, {'_id': name}).update(state)
+
+
+def make_product(index):
+    return {'_id': index, 'products': {'product_id': index}, 'product_skus': {'sku_id': [f'{index}_a', f'{index}_b']}}
+
+
+@pytest.mark.asyncio
+async def test_migration_resumes_from_checkpoint_after_crash():
+    service = DenormalizationService()
+    service.source_repo.collection = FakeSource([make_product(i) for i in range(20)])
+    service.target_repo.collection = FakeTarget(fail_on_call=3)
+    service.checkpoint_store = FakeCheckpointStore()
+
+    with pytest.raises(ConnectionError):
+        await service.migrate_data(batch_size=4, concurrency=1, write_mode='insert')
+    checkpoint = await service.checkpoint_store.load('denormalize_products_by_sku')
+    assert checkpoint['last_source_id'] == 3
+
+    service.target_repo.collection.fail_on_call = None
+    stats = await service.migrate_data(batch_size=4, concurrency=3, write_mode='insert')
+    assert stats['resumed_after'] == 3
+    assert stats['total_products_processed'] == 16
+    assert len(service.target_repo.collection.documents) == 40
+    assert (await service.checkpoint_store.load('denormalize_products_by_sku'))['status'] == 'completed'
+
+
+class FakeUpsertTarget:
+    def __init__(self):
+        self.documents = {}
+        self.replaced = 0
+
+    def find(self, query, projection=None):
+        return FakeCursor([self.documents[sku_id] for sku_id in query['_id']['$in'] if sku_id in self.documents])
+
+    async def bulk_write(self, operations, ordered=True):
+        upserted = [{'index': index, '_id': op._filter['_id']} for index, op in enumerate(operations) if op._filter['_id'] not in self.documents]
+        self.documents.update({op._filter['_id']: op._doc for op in operations})
+        self.replaced += len(operations)
+        matched = len(operations) - len(upserted)
+        return BulkWriteResult({'nUpserted': len(upserted), 'upserted': upserted, 'nMatched': matched, 'nModified': matched}, acknowledged=True)
+
+
+@pytest.mark.asyncio
+async def test_upsert_rerun_writes_only_changed_documents():
+    service = DenormalizationService()
+    products = [make_product(i) for i in range(6)]
+    service.source_repo.collection = FakeSource(products)
+    service.target_repo.collection = FakeUpsertTarget()
+    service.checkpoint_store = FakeCheckpointStore()
+
+    first = await service.migrate_data(batch_size=4, write_mode='upsert')
+    assert first['total_sku_documents_created'] == 12
+
+    products[2]['products'] = {'product_id': 2, 'current_price': 1000}
+    second = await service.migrate_data(batch_size=4, resume=False, write_mode='upsert')
+    assert (second['total_sku_documents_created'], second['total_sku_documents_updated'], second['total_skipped_existing']) == (0, 2, 10)
+    assert service.target_repo.collection.replaced == 14
+    assert service.target_repo.collection.documents['2_a']['products']['current_price'] == 1000
+
+
+class FakeSyncTarget:
+    def __init__(self, documents):
+        self.documents = {doc['_id']: doc for doc in documents}
+
+    def find(self, query, projection=None):
+        product_ids = query['source_product_id']['$in']
+        return FakeCursor([doc for doc in self.documents.values() if doc['source_product_id'] in product_ids])
+
+    async def bulk_write(self, operations, ordered=True):
+        upserted, deleted = [], 0
+        for index, op in enumerate(operations):
+            if isinstance(op, ReplaceOne):
+                if op._filter['_id'] not in self.documents:
+                    upserted.append({'index': index, '_id': op._filter['_id']})
+                self.documents[op._filter['_id']] = op._doc
+            else:
+                for sku_id in op._filter['_id']['$in']:
+                    deleted += self.documents.pop(sku_id, None) is not None
+        return BulkWriteResult({'nUpserted': len(upserted), 'upserted': upserted, 'nModified': len(operations) - len(upserted), 'nRemoved': deleted}, acknowledged=True)
+
+
+@pytest.mark.asyncio
+async def test_sku_sync_replaces_current_and_deletes_vanished_skus():
+    service = SkuSyncService()
+    service.denormalization.target_repo.collection = FakeSyncTarget(
+        [{'_id': sku_id, 'source_product_id': product_id} for product_id, sku_id in [(1, '1_a'), (1, '1_b'), (2, '2_a')]]
+    )
+
+    product = {'_id': 1, 'products': {'product_id': 1}, 'product_skus': {'sku_id': ['1_a', '1_c']}}
+    stats = await service.apply_changes({1: product, 2: None})
+
+    assert sorted(service.target_collection.documents) == ['1_a', '1_c']
+    assert service.target_collection.documents['1_c']['source_product_id'] == 1
+    assert stats['deleted'] == 2 and stats['upserted'] == 1
+
+
+class FakeVerifyTarget:
+    def __init__(self, documents):
+        self.documents = {doc['_id']: doc for doc in documents}
+        self.queries = 0
+
+    def find(self, query, projection=None):
+        self.queries += 1
+        if '_id' in query:
+            return FakeCursor([self.documents[sku_id] for sku_id in query['_id']['$in'] if sku_id in self.documents])
+        return FakeCursor(list(self.documents.values()))
+
+
+@pytest.mark.asyncio
+async def test_verify_catalog_reports_missing_extra_and_stale():
+    service = DenormalizationService()
+    products = [make_product(i) for i in range(10)]
+    service.source_repo.collection = FakeSource(products)
+    target_documents = [sku for product in products for sku in service.transform_product_to_sku_documents(product)]
+    target_documents = [doc for doc in target_documents if doc['_id'] != '3_b']
+    target_documents[0] = {**target_documents[0], 'product_skus': {**target_documents[0]['product_skus'], 'color_name': 'old'}}
+    target_documents.append({'_id': 'orphan', 'source_product_id': 99})
+    service.target_repo.collection = FakeVerifyTarget(target_documents)
+
+    report = await service.verify_catalog(batch_size=8)
+
+    assert report['expected_skus'] == 20 and report['target_skus'] == 20
+    assert report['missing'] == {'count': 1, 'ids': ['3_b']}
+    assert report['extra'] == {'count': 1, 'ids': ['orphan']}
+    assert report['stale'] == {'count': 1, 'ids': ['0_a']}
+    assert not report['ok']
+    # 20 SKU / 8 개씩 $in 3 번 + extra 검사 1 번
+    assert service.target_repo.collection.queries == 4
+
+
+def test_shared_layout_stores_one_embedding_per_product():
+    service = DenormalizationService()
+    service.embedding_layout = 'shared'
+    product = {
+        '_id': 7,
+        'products': {'product_id': 7, 'current_price': 29000},
+        'embedding': {'comprehensive_description': {'vector': [0.1, 0.2]}},
+        'product_skus': {'sku_id': ['7_a', '7_b'], 'color_name': ['black', 'white'], 'main_category': 'TOP', 'style_tags': ['casual']},
+    }
+
+    sku_documents = service.transform_product_to_sku_documents(product)
+    assert all('embedding' not in doc for doc in sku_documents)
+
+    embedding_document = service.transform_product_to_embedding_document(product, sku_documents)
+    assert embedding_document['embedding'] == product['embedding']
+    assert embedding_document['product_skus']['color_name'] == ['black', 'white']
+    assert embedding_document['product_skus']['main_category'] == 'TOP'
+    assert embedding_document['products'] == {'current_price': 29000}
+
+    pipeline = service.target_repo.query_builder.shared_embedding_vector_search_pipeline(
+        [0.1] * 3072, limit=5, sku_collection='products_by_sku', pre_filter={'color': 'white'}, num_candidates=50, profile='card'
+    )
+    assert pipeline[0]['$vectorSearch']['index'] == 'product_embedding'
+    lookup = pipeline[2]['$lookup']
+    assert lookup['foreignField'] == 'source_product_id'
+    assert lookup['pipeline'][0] == {'$match': pipeline[0]['$vectorSearch']['filter']}
+    assert pipeline[-1] == {'$limit': 5}
+
+
+class FakeIndexedTarget:
+    def __init__(self):
+        self.database = {'migration_checkpoints': None}
+        self.indexes = []
+
+    async def create_index(self, keys):
+        self.indexes.append(keys)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('layout, expected', [('shared', [[('source_product_id', 1)]]), ('embedded', [])])
+async def test_connect_creates_lookup_index_for_shared_layout(monkeypatch, layout, expected):
+    service = DenormalizationService()
+    service.embedding_layout = layout
+    service.target_repo.collection = FakeIndexedTarget()
+
+    async def noop():
+        return None
+
+    monkeypatch.setattr(service.source_repo, 'connect', noop)
+    monkeypatch.setattr(service.target_repo, 'connect', noop)
+    await service.connect()
+    assert service.target_repo.collection.indexes == expected
+
+
+def _filter_paths(filter_expr):
+    for key, condition in filter_expr.items():
+        if key in ('$and', '$or'):
+            for sub in condition:
+                yield from _filter_paths(sub)
+        else:
+            yield key
+
+
+def _matches(document, filter_expr):
+    if not filter_expr:
+        return True
+    columns = {}
+    for path in _filter_paths(filter_expr):
+        columns[path] = np.empty(1, dtype=object)
+        columns[path][0] = get_path(document, path)
+    return bool(evaluate_filter(filter_expr, columns, 1)[0])
+
+
+def _run_shared_pipeline(pipeline, embedding_documents, sku_documents):
+    """$vectorSearch (입력 순서 = 유사도 순) -> $lookup -> $unwind -> $limit 를 파이썬으로 흉내"""
+    vector_stage = pipeline[0]['$vectorSearch']
+    products = [doc for doc in embedding_documents if _matches(doc, vector_stage.get('filter'))][: vector_stage['limit']]
+    lookup = next(stage['$lookup'] for stage in pipeline if '$lookup' in stage)
+    sku_filter = lookup['pipeline'][0]['$match'] if '$match' in lookup['pipeline'][0] else None
+    results = [
+        sku['_id']
+        for product in products
+        for sku in sku_documents
+        if sku[lookup['foreignField']] == product['_id'] and _matches(sku, sku_filter)
+    ]
+    return results[: pipeline[-1]['$limit']]
+
+
+def test_shared_layout_oversamples_products_for_cross_sku_conjunction():
+    service = DenormalizationService()
+    # p0, p1 은 SKU 값의 합집합으로는 (상의 AND 블랙) 을 만족하지만, 두 조건을 모두 만족하는 SKU 는 없음
+    sku_specs = {
+        'p0': [('p0_a', 'TOP', '화이트'), ('p0_b', 'BOTTOM', '블랙')],
+        'p1': [('p1_a', 'TOP', '화이트'), ('p1_b', 'BOTTOM', '블랙')],
+        'p2': [('p2_a', 'TOP', '블랙')],
+        'p3': [('p3_a', 'TOP', '블랙'), ('p3_b', 'TOP', '화이트')],
+    }
+    sku_documents = [
+        {'_id': sku_id, 'source_product_id': product_id, 'product_skus': {'main_category': category, 'color_name': color}}
+        for product_id, specs in sku_specs.items()
+        for sku_id, category, color in specs
+    ]
+    embedding_documents = [
+        service.transform_product_to_embedding_document({'_id': product_id}, [doc for doc in sku_documents if doc['source_product_id'] == product_id])
+        for product_id in sku_specs
+    ]
+
+    pipeline = service.target_repo.query_builder.shared_embedding_vector_search_pipeline(
+        [0.1] * 3072, limit=2, sku_collection='products_by_sku', pre_filter={'main_category': '상의', 'color': '블랙'}, num_candidates=50
+    )
+    assert pipeline[0]['$vectorSearch']['limit'] == 2 * service.config.get_shared_embedding_config().get('PRODUCT_OVERSAMPLE')
+    assert _run_shared_pipeline(pipeline, embedding_documents, sku_documents) == ['p2_a', 'p3_a']
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeTrickleStream:
+    """이벤트가 끊이지 않는 change stream (try_next 가 None 을 돌려주지 않음)"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.alive = True
+        self.resume_token = None
+        self.sequence = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def try_next(self):
+        self.sequence += 1
+        self.clock.now += 0.5
+        self.resume_token = {'_data': self.sequence}
+        return {'operationType': 'update', 'documentKey': {'_id': self.sequence}, 'fullDocument': make_product(self.sequence)}
+
+
+class FakeWatchSource:
+    def __init__(self, stream):
+        self.stream = stream
+
+    async def watch(self, pipeline, **kwargs):
+        return self.stream
+
+
+@pytest.mark.asyncio
+async def test_sku_sync_flushes_by_lag_under_steady_trickle(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr('db.sku_sync.time', clock)
+    service = SkuSyncService()
+    service.denormalization.source_repo.collection = FakeWatchSource(FakeTrickleStream(clock))
+    service.denormalization.checkpoint_store = FakeCheckpointStore()
+    service.batch_size, service.max_lag_seconds = 200, 2
+    stop_event = asyncio.Event()
+    flushes = []
+
+    async def flush(changes, resume_token, events):
+        flushes.append((sorted(changes), resume_token, clock.now))
+        stop_event.set()
+
+    monkeypatch.setattr(service, '_flush', flush)
+    await service.sync_once(stop_event)
+
+    # 배치(200)가 차기 전에 첫 이벤트로부터 2 초가 지나면 반영
+    changes, resume_token, flushed_at = flushes[0]
+    assert changes == [1, 2, 3, 4, 5] and resume_token == {'_data': 5}
+    assert flushed_at - 0.5 >= 2
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from db.vector.base import normalize_rows, top_k
+from db.vector.exact import ExactVectorEngine
+from db.vector.reduction import DimensionReducer, TwoStageVectorEngine, benchmark_two_stage
+
+
+@pytest.fixture
+def vectors():
+    # 정보가 앞쪽 저차원 부분공간에 몰린 (Matryoshka 와 유사한) 벡터
+    rng = np.random.default_rng(3)
+    latent = rng.standard_normal((1200, 16)).astype(np.float32)
+    basis = rng.standard_normal((16, 128)).astype(np.float32)
+    return latent @ basis + 0.05 * rng.standard_normal((1200, 128)).astype(np.float32)
+
+
+def test_pca_reducer_round_trip(vectors, tmp_path):
+    reducer = DimensionReducer('pca').fit(vectors, 24)
+    reduced = reducer.transform(vectors[:5])
+    assert reduced.shape == (5, 24)
+    np.testing.assert_allclose(np.linalg.norm(reduced, axis=1), 1.0, rtol=1e-5)
+    assert reducer.explained_variance_ratio > 0.9
+
+    reducer.save(tmp_path / 'pca.npz')
+    loaded = DimensionReducer.load(tmp_path / 'pca.npz')
+    np.testing.assert_allclose(loaded.transform(vectors[:5]), reduced, rtol=1e-5)
+
+    with pytest.raises(RuntimeError):
+        DimensionReducer('pca', 24).transform(vectors[:1])
+
+
+def test_two_stage_engine_matches_full_exact(vectors):
+    ids = np.array([f'sku-{i}' for i in range(len(vectors))], dtype=object)
+    reducer = DimensionReducer('pca').fit(vectors, 24)
+    engine = TwoStageVectorEngine.build(ids, vectors, reducer, ExactVectorEngine, candidate_multiplier=5)
+
+    matrix = normalize_rows(vectors)
+    hits = 0
+    for query in vectors[:20]:
+        expected = set(ids[top_k(matrix @ normalize_rows(query), 10)])
+        result = engine.search(query, 10)
+        assert [score for _, score in result] == sorted((score for _, score in result), reverse=True)
+        hits += len(expected & {doc_id for doc_id, _ in result})
+    assert hits / 200 >= 0.95
+
+
+def test_benchmark_two_stage_report(vectors):
+    reducer = DimensionReducer('truncate').fit(vectors, 32)
+    report = benchmark_two_stage(vectors[50:], vectors[:50], reducer, k=10, candidate_multipliers=(1, 10))
+    assert report['full']['bytes_per_vector'] == 128 * 4
+    assert report['x10']['bytes_per_vector'] == 32 * 4
+    assert report['x10']['recall'] >= report['x1']['recall']
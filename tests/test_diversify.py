@@ -0,0 +1,31 @@
+import numpy as np
+
+from db.vector.diversify import ProductOversampler, collapse_by_key, mmr_select
+
+
+def test_collapse_keeps_best_sku_per_product():
+    hits = [
+        {'_id': 'a-black', 'products': {'product_id': 'a'}, 'score': 0.9},
+        {'_id': 'a-white', 'products': {'product_id': 'a'}, 'score': 0.8},
+        {'_id': 'b-navy', 'products': {'product_id': 'b'}, 'score': 0.7},
+        {'_id': 'c-gray', 'products': {'product_id': 'c'}, 'score': 0.6},
+    ]
+    collapsed = collapse_by_key(hits, 2, 'products.product_id')
+    assert [doc['_id'] for doc in collapsed] == ['a-black', 'b-navy']
+
+
+def test_mmr_skips_near_duplicates():
+    query = np.array([1.0, 0.0, 0.0])
+    vectors = np.array([[0.95, 0.3, 0.0], [0.95, 0.31, 0.0], [0.9, 0.0, 0.4]])
+    assert mmr_select(query, vectors, 2, lambda_=1.0).tolist() == [0, 1]
+    assert mmr_select(query, vectors, 2, lambda_=0.5).tolist() == [0, 2]
+    assert len(mmr_select(query, vectors, 10)) == 3
+
+
+def test_oversampler_tracks_skus_per_product():
+    oversampler = ProductOversampler(initial_ratio=2.0, safety=1.0, max_factor=8, alpha=0.5)
+    assert oversampler.factor() == 2
+    oversampler.observe(hits=60, groups=10)
+    assert oversampler.factor() == 4
+    oversampler.observe(hits=0, groups=0)
+    assert oversampler.factor() == 4
@@ -0,0 +1,113 @@
+import pytest
+
+from db.query_builders.filter_compiler import VectorFilterCompiler, VectorFilterSpec
+
+
+@pytest.fixture
+def compiler():
+    return VectorFilterCompiler()
+
+
+def test_legacy_pre_filter(compiler):
+    assert compiler.compile({'main_category': '상의', 'color': '블랙'}) == {
+        'product_skus.main_category': 'TOP',
+        'product_skus.color_name': '블랙',
+    }
+    assert compiler.compile(None) is None
+    assert compiler.compile({}) is None
+
+
+def test_full_filter_spec(compiler):
+    spec = VectorFilterSpec(
+        main_category='하의',
+        sub_category=['데님 팬츠', 3007],
+        gender='남성',
+        color_family='블랙',
+        tpo_tags=['출근'],
+        min_price=10000,
+        max_price=50000,
+    )
+    assert compiler.compile(spec) == {
+        'product_skus.main_category': 'BOTTOM',
+        'product_skus.sub_category': {'$in': [3002, 3007]},
+        'product_skus.gender': '남성',
+        'product_skus.color_name': {'$in': ['블랙', '차콜']},
+        'product_skus.tpo_tags': {'$in': ['출근']},
+        'products.current_price': {'$gte': 10000, '$lte': 50000},
+    }
+
+
+@pytest.mark.parametrize(
+    'pre_filter',
+    [
+        {'sub_category': '없는 카테고리'},
+        {'color_family': '무지개'},
+        {'min_price': 50000, 'max_price': 10000},
+        {'unknown_field': 1},
+    ],
+)
+def test_invalid_filters(compiler, pre_filter):
+    with pytest.raises(ValueError):
+        compiler.compile(pre_filter)
+
+
+def test_unknown_main_category_falls_back_to_bottom(compiler):
+    assert compiler.compile({'main_category': '신발'}) == {'product_skus.main_category': 'BOTTOM'}
+
+
+def test_undeclared_index_field():
+    compiler = VectorFilterCompiler(declared_fields=['product_skus.main_category'])
+    assert compiler.compile({'main_category': 'TOP'}) == {'product_skus.main_category': 'TOP'}
+    with pytest.raises(ValueError, match='product_skus.fit'):
+        compiler.compile({'fit': '오버핏'})
+
+
+def test_vocabulary_restricts_codes_and_color_families_to_catalog():
+    compiler = VectorFilterCompiler()
+    compiler.set_vocabulary([3002, 3007, 1001], ['블랙', '네이비', '화이트'])
+
+    assert compiler.compile({'sub_category': ['데님 팬츠', 3007]}) == {'product_skus.sub_category': {'$in': [3002, 3007]}}
+    assert compiler.compile({'color_family': '블랙'}) == {'product_skus.color_name': '블랙'}
+    # 카탈로그에 없는 코드 / 코드표 항목 / 색상만 남지 않은 계열은 거부
+    for pre_filter in ({'sub_category': 9999}, {'sub_category': '후드 티셔츠'}, {'color_family': '레드'}):
+        with pytest.raises(ValueError):
+            compiler.compile(pre_filter)
+    # 다른 컴파일러(설정 값)는 영향 없음
+    assert VectorFilterCompiler().compile({'sub_category': '후드 티셔츠'}) == {'product_skus.sub_category': 1004}
+
+
+class _FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+
+class _FakeCatalog:
+    async def list_search_indexes(self, name):
+        fields = [{'type': 'vector', 'path': 'embedding'}, {'type': 'filter', 'path': 'product_skus.main_category'}]
+        return _FakeCursor([{'name': name, 'latestDefinition': {'fields': fields}}])
+
+    async def distinct(self, key):
+        return {'product_skus.sub_category': [3002], 'product_skus.color_name': ['블랙']}[key]
+
+
+@pytest.mark.asyncio
+async def test_sync_search_metadata_uses_live_index_and_catalog():
+    from db.repository.fashion_async import AsyncFashionRepository
+
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    repo.collection = _FakeCatalog()
+    await repo.sync_search_metadata()
+
+    compiler = repo.query_builder.filter_compiler
+    assert compiler.compile({'main_category': 'TOP'}) == {'product_skus.main_category': 'TOP'}
+    # 설정에는 있지만 인덱스에 선언되지 않은 필드는 Atlas 로 보내기 전에 거부
+    with pytest.raises(ValueError, match='product_skus.gender'):
+        compiler.compile({'gender': '남성'})
+    assert compiler.sub_category_codes == {'데님 팬츠': 3002}
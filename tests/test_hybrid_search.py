@@ -0,0 +1,52 @@
+import pytest
+
+from db.query_builders.fashion_queries import FashionQueryBuilder
+from db.repository.fashion_async import AsyncFashionRepository
+
+
+def test_text_search_filter_maps_vector_filter_to_search_operators():
+    builder = FashionQueryBuilder()
+    operators = builder.text_search_filter({'color': ['black', 'white'], 'main_category': 'TOP', 'min_price': 10000, 'max_price': 50000})
+
+    by_type = {next(iter(op)): op[next(iter(op))] for op in operators}
+    assert by_type['in']['value'] == ['black', 'white']
+    assert by_type['equals'] == {'path': 'product_skus.main_category', 'value': 'TOP'}
+    assert by_type['range'] == {'path': 'products.current_price', 'gte': 10000, 'lte': 50000}
+    assert builder.text_search_filter(None) == []
+
+
+def test_hybrid_search_pipeline_fuses_vector_and_text_stages():
+    builder = FashionQueryBuilder()
+    pipeline = builder.hybrid_search_pipeline('나이키 반팔', [0.1] * 3072, limit=5, pre_filter={'color': 'black'}, candidate_limit=3)
+
+    fusion = pipeline[0]['$rankFusion']
+    vector_stages = fusion['input']['pipelines']['vector']
+    text_stages = fusion['input']['pipelines']['text']
+    # 입력 파이프라인에는 $vectorSearch / $search 와 $limit 만 (후보 수는 limit 이상)
+    assert list(vector_stages[0]) == ['$vectorSearch'] and len(vector_stages) == 1
+    assert vector_stages[0]['$vectorSearch']['limit'] == 5
+    assert vector_stages[0]['$vectorSearch']['numCandidates'] == builder.hybrid_search_config.get('NUM_CANDIDATES')
+    assert text_stages[0]['$search']['compound']['filter'] == [{'equals': {'path': 'product_skus.color_name', 'value': 'black'}}]
+    assert text_stages[1] == {'$limit': 5}
+    assert pipeline[1] == {'$limit': 5}
+    assert pipeline[2]['$project']['score'] == {'$meta': 'score'}
+
+
+@pytest.mark.asyncio
+async def test_client_mode_vector_leg_uses_vector_search_path():
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    calls = []
+
+    async def execute(embedding, limit, pre_filter, exact, profile):
+        calls.append((limit, pre_filter))
+        return [{'_id': 'a', 'score': 0.9}, {'_id': 'b', 'score': 0.8}]
+
+    async def text_search(user_query, limit, pre_filter=None):
+        return [{'_id': 'b', 'score': 3.0}, {'_id': 'c', 'score': 2.0}]
+
+    repo._execute_vector_search = execute
+    repo.text_search = text_search
+
+    results = await repo.hybrid_search('query', [0.1, 0.2], limit=2, pre_filter={'color': 'black'}, mode='client')
+    assert calls == [(repo.query_builder.hybrid_search_config.get('CANDIDATE_LIMIT'), {'color': 'black'})]
+    assert [doc['_id'] for doc in results] == ['b', 'a']
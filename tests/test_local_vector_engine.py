@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+from db.vector.base import evaluate_filter, filter_cache_key, normalize_rows, project_document
+from db.vector.exact import ExactVectorEngine
+from db.vector.hnsw import HNSWVectorEngine
+
+
+@pytest.fixture
+def corpus():
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((1500, 32)).astype(np.float32)
+    ids = np.array([f'sku_{i}' for i in range(len(matrix))], dtype=object)
+    columns = {
+        'product_skus.main_category': np.array(['TOP' if i % 2 else 'BOTTOM' for i in range(len(matrix))], dtype=object),
+        'product_skus.color_name': np.array([['블랙', '화이트', '네이비'][i % 3] for i in range(len(matrix))], dtype=object),
+    }
+    queries = rng.standard_normal((20, 32)).astype(np.float32)
+    return ids, matrix, columns, queries
+
+
+def _exact_top_k(matrix, query, k, mask=None):
+    sims = normalize_rows(matrix) @ normalize_rows(query)
+    if mask is not None:
+        sims = np.where(mask, sims, -np.inf)
+    return set(np.argsort(-sims)[:k].tolist())
+
+
+def test_hnsw_recall_against_exact(corpus):
+    ids, matrix, columns, queries = corpus
+    engine = HNSWVectorEngine(ids, matrix, columns, brute_force_threshold=0)
+
+    recalls = []
+    for query in queries:
+        hits = engine.search(query, 10)
+        found = {int(doc_id.split('_')[1]) for doc_id, _ in hits}
+        recalls.append(len(found & _exact_top_k(matrix, query, 10)) / 10)
+    assert np.mean(recalls) >= 0.9
+
+
+def test_hnsw_filtered_search_respects_filter(corpus):
+    ids, matrix, columns, queries = corpus
+    engine = HNSWVectorEngine(ids, matrix, columns, brute_force_threshold=0)
+    filter_expr = {'product_skus.main_category': 'TOP', 'product_skus.color_name': '블랙'}
+    mask = evaluate_filter(filter_expr, engine.columns, len(engine))
+
+    hits = engine.search(queries[0], 10, filter_expr)
+    assert len(hits) == 10
+    assert all(mask[int(doc_id.split('_')[1])] for doc_id, _ in hits)
+    scores = [score for _, score in hits]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0.0 <= score <= 1.0 for score in scores)
+
+
+def test_brute_force_fallback_is_exact(corpus):
+    ids, matrix, columns, queries = corpus
+    engine = HNSWVectorEngine(ids, matrix, columns, brute_force_threshold=10_000)
+    filter_expr = {'product_skus.color_name': {'$in': ['블랙', '네이비']}}
+    mask = evaluate_filter(filter_expr, engine.columns, len(engine))
+
+    hits = engine.search(queries[1], 10, filter_expr)
+    assert {int(doc_id.split('_')[1]) for doc_id, _ in hits} == _exact_top_k(matrix, queries[1], 10, mask)
+
+
+def test_project_document_nested_fields():
+    doc = {'_id': 'a', 'products': {'captions': {'comprehensive_description': 'x'}, 'price': 1}, 'product_skus': {'main_category': 'TOP'}}
+    projected = project_document(doc, {'products.captions.comprehensive_description': 1, 'product_skus.main_category': 1})
+    assert projected == {'_id': 'a', 'products': {'captions': {'comprehensive_description': 'x'}}, 'product_skus': {'main_category': 'TOP'}}
+
+
+def test_exact_engine_memory_mapped_blocks(corpus, tmp_path):
+    ids, matrix, columns, queries = corpus
+    np.save(tmp_path / 'embeddings.npy', normalize_rows(matrix))
+    np.save(tmp_path / 'ids.npy', ids.astype(str))
+    engine = ExactVectorEngine.load(tmp_path, block_size=256)
+    assert isinstance(engine.matrix, np.memmap)
+
+    for query in queries[:5]:
+        hits = engine.search(query, 10)
+        assert {int(doc_id.split('_')[1]) for doc_id, _ in hits} == _exact_top_k(matrix, query, 10)
+
+    nodes, _ = engine.knn(queries, 10)
+    assert nodes.shape == (len(queries), 10)
+
+
+def test_exact_engine_precomputed_masks(corpus):
+    ids, matrix, columns, queries = corpus
+    engine = ExactVectorEngine(ids, normalize_rows(matrix), columns, block_size=256)
+    filter_expr = {'product_skus.main_category': 'TOP', 'product_skus.color_name': {'$in': ['블랙']}}
+    mask = engine.filter_mask(filter_expr)
+    np.testing.assert_array_equal(mask, evaluate_filter(filter_expr, engine.columns, len(engine)))
+
+    hits = engine.search(queries[2], 10, filter_expr)
+    assert {int(doc_id.split('_')[1]) for doc_id, _ in hits} == _exact_top_k(matrix, queries[2], 10, mask)
+    assert engine.search(queries[2], 10, {'product_skus.color_name': '레드'}) == []
+
+
+def test_filter_mask_cache_is_bounded(corpus, monkeypatch):
+    monkeypatch.setattr('db.vector.base.MASK_CACHE_SIZE', 4)
+    ids, matrix, columns, _ = corpus
+    engine = HNSWVectorEngine(ids, matrix, columns)
+    for color in ['블랙', '화이트', '네이비', '레드', '블루', '그린']:
+        engine.filter_mask({'product_skus.color_name': color})
+    assert len(engine._mask_cache) == 4
+    assert filter_cache_key({'product_skus.color_name': '블랙'}) not in engine._mask_cache
+    assert filter_cache_key({'product_skus.color_name': '그린'}) in engine._mask_cache
+
+
+def test_hnsw_refuses_corpus_above_build_limit(corpus, monkeypatch):
+    from db.config.config import Config
+
+    monkeypatch.setitem(Config().get_local_vector_engine_config(), 'HNSW_MAX_VECTORS', 1000)
+    ids, matrix, columns, _ = corpus
+    with pytest.raises(ValueError):
+        HNSWVectorEngine(ids, matrix, columns)
+
+
+class _FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+
+class _FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def count_documents(self, query):
+        return len(self.documents)
+
+    def find(self, query, projection=None, batch_size=None):
+        return _FakeCursor(self.documents)
+
+
+@pytest.mark.asyncio
+async def test_export_preserves_original_id_types(tmp_path):
+    from bson import ObjectId
+
+    from db.vector.exact import export_embedding_matrix
+
+    rng = np.random.default_rng(1)
+    doc_ids = [ObjectId(), 7, 'sku_a']
+    documents = [{'_id': doc_id, 'vec': rng.standard_normal(8).tolist()} for doc_id in doc_ids]
+    count = await export_embedding_matrix(_FakeCollection(documents), tmp_path, embedding_field_path='vec', filter_fields=[], dimensions=8)
+    assert count == 3
+
+    engine = ExactVectorEngine.load(tmp_path)
+    assert list(engine.ids) == doc_ids
+    assert engine.search(documents[1]['vec'], 1)[0][0] == 7
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from db.query_builders.fashion_queries import FashionQueryBuilder
+from db.query_builders.projections import PROJECTION_PROFILES, ProjectionSizeStats, get_projection
+from db.repository.fashion_async import AsyncFashionRepository
+
+
+def test_profiles_are_immutable():
+    with pytest.raises(TypeError):
+        PROJECTION_PROFILES['card']['products.reviews'] = 1
+    projection = get_projection('ids_only')
+    projection['extra'] = 1
+    assert dict(PROJECTION_PROFILES['ids_only']) == {'_id': 1}
+
+    with pytest.raises(ValueError):
+        get_projection('unknown')
+
+
+def test_pipeline_does_not_mutate_shared_profile():
+    builder = FashionQueryBuilder()
+    dim = builder.vector_search_config.get('EMBEDDING_DIMENSIONS')
+    pipeline = builder.vector_search_pipeline([0.1] * dim, limit=5, profile='ids_only', num_candidates=50)
+    assert pipeline[-1] == {'$project': {'_id': 1, 'score': {'$meta': 'vectorSearchScore'}}}
+    assert 'score' not in PROJECTION_PROFILES['rerank']
+    assert 'score' not in builder.projection()
+
+
+def test_size_stats_accumulate_per_profile():
+    stats = ProjectionSizeStats()
+    stats.record('ids_only', [{'_id': 'a'}, {'_id': 'b'}, None], 'find_by_id')
+    stats.record('detail', [{'_id': 'a', 'products': {'description_info': 'x' * 100}}], 'find_by_id')
+    summary = stats.summary()
+    assert summary['ids_only']['documents'] == 2
+    assert summary['detail']['avg_bytes'] > summary['ids_only']['avg_bytes']
+
+
+def test_size_stats_sampling_skips_measurement(monkeypatch):
+    def fail_encode(document):
+        raise AssertionError('unsampled calls must not encode documents')
+
+    stats = ProjectionSizeStats(sample_rate=0.0)
+    monkeypatch.setattr('db.query_builders.projections.bson_size', fail_encode)
+    assert stats.record('card', [{'_id': 'a'}], 'vector_search') == 0
+    assert stats.summary() == {}
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def limit(self, limit):
+        return FakeCursor(self.documents[:limit])
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection=None):
+        return FakeCursor(self.documents)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('sample_rate', [0.0, 1.0])
+async def test_find_all_always_returns_the_cursor(sample_rate):
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    repo.collection = FakeCollection([{'_id': f'sku-{i}'} for i in range(50)])
+    repo.projection_stats.sample_rate = sample_rate
+
+    cursor = await repo.find_all(profile='ids_only')
+    assert isinstance(cursor, FakeCursor)
+    await asyncio.gather(*repo._background_tasks)
+    sampled = repo.projection_stats.summary().get('ids_only', {}).get('documents', 0)
+    assert sampled == (repo.query_builder.config.get_projection_stats_config().get('SAMPLE_DOCUMENTS') if sample_rate else 0)
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from db.repository.read_cache import LRUTTLCache, ProductReadCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key, deserialize=True):
+        return self.store.get(key)
+
+    async def set(self, key, value, ttl=None, serialize=True):
+        self.store[key] = value
+        return True
+
+    async def delete(self, key):
+        return self.store.pop(key, None) is not None
+
+
+def test_lru_ttl_eviction():
+    cache = LRUTTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+
+    expired = LRUTTLCache(maxsize=2, ttl=-1)
+    expired.set('a', 1)
+    assert expired.get('a') is None
+
+
+@pytest.mark.asyncio
+async def test_read_through_and_invalidation():
+    redis = FakeRedis()
+    cache = ProductReadCache(redis, l1_maxsize=10, l1_ttl=60, l2_ttl=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {'_id': 'sku-1', 'products': {'current_price': 39000}}
+
+    key = cache.document_key('sku-1', 'card')
+    results = await asyncio.gather(*(cache.get_or_load(key, loader) for _ in range(5)))
+    assert calls == 1
+    assert all(result == results[0] for result in results)
+
+    # 반환값 수정은 캐시에 영향 없음
+    results[0]['products']['current_price'] = 0
+    assert (await cache.get_or_load(key, loader))['products']['current_price'] == 39000
+
+    # L1 이 비어도 L2 에서 채움
+    cache.l1.clear()
+    assert (await cache.get_or_load(key, loader))['_id'] == 'sku-1'
+    assert calls == 1
+
+    await cache.invalidate_document('sku-1')
+    assert key not in redis.store and len(cache.l1) == 0
+    await cache.get_or_load(key, loader)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_registered_cache_client_attaches_read_cache_to_repositories():
+    import db
+    from db.repository.fashion_async import AsyncFashionRepository
+
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    db._repositories[('test', 'fashion_db', 'products_by_sku')] = repo
+    try:
+        db.set_cache_client(FakeRedis())
+        assert isinstance(repo.read_cache, ProductReadCache)
+        assert repo.search_cache is not None
+        db.set_cache_client(None)
+        assert repo.read_cache is None and repo.search_cache is None
+    finally:
+        db._repositories.pop(('test', 'fashion_db', 'products_by_sku'), None)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_overwritten():
+    redis = FakeRedis()
+    cache = ProductReadCache(redis, l1_maxsize=10, l1_ttl=60, l2_ttl=60)
+    key = cache.description_key('P-1')
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_loader():
+        loading.set()
+        await release.wait()
+        return 'old description'
+
+    task = asyncio.create_task(cache.get_or_load(key, slow_loader))
+    await loading.wait()
+    await cache.invalidate_description('P-1')
+    release.set()
+
+    # 진행 중이던 조회는 값을 돌려주지만 무효화 이전 값이므로 캐시에 쓰지 않음
+    assert await task == 'old description'
+    assert key not in redis.store and len(cache.l1) == 0
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+
+class FakeUpdateCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def update_one(self, query, update, upsert=False):
+        from pymongo.results import UpdateResult
+
+        return UpdateResult({'n': 1, 'nModified': 1}, acknowledged=True)
+
+    def find(self, query, projection=None):
+        return FakeCursor([self.documents[doc_id] for doc_id in query['_id']['$in'] if doc_id in self.documents])
+
+
+@pytest.mark.asyncio
+async def test_description_update_invalidates_description_cache():
+    from db.repository.fashion_async import AsyncFashionRepository
+
+    redis = FakeRedis()
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    repo.collection = FakeUpdateCollection({'sku-1': {'_id': 'sku-1', 'products': {'product_id': 'P-1'}}})
+    repo.read_cache = ProductReadCache(redis, l1_maxsize=10, l1_ttl=60, l2_ttl=60)
+    key = repo.read_cache.description_key('P-1')
+    repo.read_cache.l1.set(key, 'old description')
+    redis.store[key] = '"old description"'
+
+    # 가격만 바뀐 경우는 설명 캐시를 유지
+    await repo.update_by_id('sku-1', {'products.current_price': 1000})
+    assert repo.read_cache.l1.get(key) == 'old description'
+
+    # description_info 가 바뀌면 문서에서 상품 ID 를 찾아 무효화
+    await repo.update_by_id('sku-1', {'products.description_info': 'new description'})
+    assert repo.read_cache.l1.get(key) is None and key not in redis.store
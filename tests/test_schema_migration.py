@@ -0,0 +1,106 @@
+import pytest
+from pymongo.results import UpdateResult
+
+from db.repository.schema_migration import SchemaMigration, SchemaMigrationRunner, WriteThrottle
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        self.documents = sorted(self.documents, key=lambda doc: doc[key])
+        return self
+
+    def limit(self, limit):
+        self.documents = self.documents[:limit]
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+
+def matches(doc, query):
+    id_range = query.get('_id', {})
+    return (
+        'legacy' in doc
+        and doc['_id'] > id_range.get('$gt', -1)
+        and id_range.get('$gte', -1) <= doc['_id'] <= id_range.get('$lte', float('inf'))
+    )
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = {doc['_id']: doc for doc in documents}
+        self.update_calls = 0
+        self.fail_on_call = None
+
+    async def count_documents(self, query):
+        return sum(matches(doc, query) for doc in self.documents.values())
+
+    def find(self, query, projection=None):
+        return FakeCursor([{'_id': doc['_id']} for doc in self.documents.values() if matches(doc, query)])
+
+    async def update_many(self, query, update):
+        self.update_calls += 1
+        if self.update_calls == self.fail_on_call:
+            raise ConnectionError('network down')
+        targets = [doc for doc in self.documents.values() if matches(doc, query)]
+        for doc in targets:
+            doc.pop('legacy')
+        return UpdateResult({'n': len(targets), 'nModified': len(targets)}, acknowledged=True)
+
+
+class FakeCheckpointStore:
+    def __init__(self):
+        self.state = {}
+
+    async def load(self, name):
+        return self.state.get(name)
+
+    async def save(self, name, **state):
+        self.state.setdefault(name, {'_id': name}).update(state)
+
+
+@pytest.mark.asyncio
+async def test_unset_runs_in_batches_and_resumes_after_failure():
+    collection = FakeCollection([{'_id': i, 'legacy': 1} for i in range(25)] + [{'_id': 25}])
+    store = FakeCheckpointStore()
+    migration = SchemaMigration.unset('products', 'legacy')
+    throttle = WriteThrottle(ops_per_second=1_000_000, min_ops_per_second=1, target_latency_ms=1_000)
+
+    report = await SchemaMigrationRunner(collection, store, batch_size=10, throttle=throttle).dry_run(migration)
+    assert (report['matching'], report['batches']) == (25, 3)
+
+    collection.fail_on_call = 2
+    with pytest.raises(ConnectionError):
+        await SchemaMigrationRunner(collection, store, batch_size=10, throttle=throttle).run(migration)
+    assert store.state[migration.name]['last_id'] == 9
+
+    collection.fail_on_call = None
+    stats = await SchemaMigrationRunner(collection, store, batch_size=10, throttle=throttle).run(migration)
+    assert stats['resumed_after'] == 9
+    assert (stats['modified'], stats['batches']) == (15, 2)
+    assert all('legacy' not in doc for doc in collection.documents.values())
+    assert store.state[migration.name]['status'] == 'completed'
+
+
+def test_throttle_backs_off_on_slow_writes_and_recovers():
+    throttle = WriteThrottle(ops_per_second=1000, min_ops_per_second=100, target_latency_ms=50, backoff_factor=0.5, recovery_step=0.1)
+    for _ in range(5):
+        throttle.observe(200)
+    assert throttle.rate == 100
+    throttle.observe(10)
+    assert throttle.rate == 200
+    for _ in range(20):
+        throttle.observe(10)
+    assert throttle.rate == 1000
+
+
+def test_rejects_unsupported_update_operators():
+    with pytest.raises(ValueError):
+        SchemaMigration('bad', {}, {'$inc': {'count': 1}})
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from pymongo.results import BulkWriteResult
+
+from db.repository.fashion_async import AsyncFashionRepository
+from db.repository.write_buffer import PendingWrite
+from db.vector.cache import VectorSearchCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.incr_calls = 0
+
+    async def get(self, key, deserialize=True):
+        return self.store.get(key)
+
+    async def incr(self, key, amount=1):
+        self.incr_calls += 1
+        self.store[key] = int(self.store.get(key) or 0) + amount
+        return self.store[key]
+
+    async def json_get(self, key, path='$'):
+        return self.store.get(key)
+
+    async def json_set(self, key, value, ttl=None):
+        self.store[key] = value
+        return True
+
+
+@pytest.mark.asyncio
+async def test_key_ignores_float_noise_but_not_query_shape():
+    cache = VectorSearchCache(FakeRedis(), precision=3)
+    embedding = np.random.default_rng(0).standard_normal(64)
+    key = await cache.make_key(embedding.tolist(), 10, {'color': 'black'}, 'idx', 'card')
+
+    # 부동소수점 잡음 / 스케일만 다른 임베딩은 같은 키
+    assert await cache.make_key((embedding * 2 + 1e-7).tolist(), 10, {'color': 'black'}, 'idx', 'card') == key
+    assert await cache.make_key(embedding.tolist(), 10, {'color': 'black'}, 'idx', 'card') == key
+    assert await cache.make_key(embedding.tolist(), 20, {'color': 'black'}, 'idx', 'card') != key
+    assert await cache.make_key(embedding.tolist(), 10, {'color': 'white'}, 'idx', 'card') != key
+    assert await cache.make_key(embedding.tolist(), 10, {'color': 'black'}, 'idx', 'detail') != key
+
+
+def make_repo(redis):
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    repo.search_cache = VectorSearchCache(redis, precision=3)
+    repo.search_cache.version_refresh_seconds = 0
+    calls = []
+
+    async def execute(embedding, limit, pre_filter, exact, profile):
+        calls.append(limit)
+        return [{'_id': f'sku-{i}'} for i in range(limit)]
+
+    repo._execute_vector_search = execute
+    return repo, calls
+
+
+@pytest.mark.asyncio
+async def test_vector_search_hit_miss_and_invalidation():
+    redis = FakeRedis()
+    repo, calls = make_repo(redis)
+    embedding = [0.1, 0.2, 0.3]
+
+    first = await repo.vector_search(embedding, 3)
+    assert await repo.vector_search(embedding, 3) == first
+    assert len(calls) == 1
+
+    # exact 검색은 캐시를 우회
+    await repo.vector_search(embedding, 3, exact=True)
+    assert len(calls) == 2
+
+    await repo.invalidate_search_cache()
+    await repo.vector_search(embedding, 3)
+    assert len(calls) == 3
+
+
+class FakeCollection:
+    async def bulk_write(self, operations, ordered=True):
+        return BulkWriteResult({'nMatched': len(operations), 'nModified': len(operations), 'upserted': []}, acknowledged=True)
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_invalidates_search_cache_once_per_batch():
+    redis = FakeRedis()
+    repo, _ = make_repo(redis)
+    repo.collection = FakeCollection()
+
+    batch = {}
+    for i in range(5):
+        pending = batch[f'sku-{i}'] = PendingWrite()
+        pending.fields['products.current_price'] = 1000 + i
+    await repo._bulk_update_by_id(batch)
+    assert redis.incr_calls == 1
@@ -0,0 +1,54 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from db.repository.fashion_async import AsyncFashionRepository
+
+
+def make_repo(max_pool_size):
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    repo.db_manager._client = SimpleNamespace(options=SimpleNamespace(pool_options=SimpleNamespace(max_pool_size=max_pool_size)))
+    state = {'calls': [], 'active': 0, 'peak': 0}
+
+    async def vector_search(embedding, limit, pre_filter=None, profile=None):
+        state['calls'].append((tuple(embedding), limit))
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        await asyncio.sleep(0.01)
+        state['active'] -= 1
+        return [{'_id': f'{embedding[0]}-{i}'} for i in range(limit)]
+
+    repo.vector_search = vector_search
+    return repo, state
+
+
+@pytest.mark.asyncio
+async def test_identical_queries_run_once_and_results_keep_input_order():
+    repo, state = make_repo(max_pool_size=10)
+    top, bottom = [1.0, 0.0], [0.0, 1.0]
+
+    results = await repo.vector_search_many([(top, 2, {'color': 'black'}), (bottom, 2, None), (list(top), 2, {'color': 'black'})])
+
+    assert len(state['calls']) == 2
+    assert results[0] == results[2] and results[0] is not results[2]
+    assert results[0][0] is not results[2][0]
+    assert results[1][0]['_id'] == '0.0-0'
+
+    # pre_filter 나 limit 가 다르면 별도 쿼리
+    await repo.vector_search_many([(top, 2, {'color': 'black'}), (top, 2, {'color': 'white'}), (top, 3, {'color': 'black'})])
+    assert len(state['calls']) == 5
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_by_pool_size():
+    repo, state = make_repo(max_pool_size=3)
+    queries = [([float(i), 1.0], 1, None) for i in range(10)]
+
+    await repo.vector_search_many(queries)
+    assert len(state['calls']) == 10
+    assert state['peak'] == 3
+
+    state['peak'] = 0
+    await repo.vector_search_many(queries, max_concurrency=2)
+    assert state['peak'] == 2
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from db.repository.fashion_async import AsyncFashionRepository
+from db.vector.base import normalize_rows
+from db.vector.exact import ExactVectorEngine
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, ids):
+        self.documents = {doc_id: {'_id': doc_id, 'products': {'product_name': doc_id}} for doc_id in ids}
+        self.find_calls = []
+
+    def find(self, query, projection=None):
+        requested = query['_id']['$in']
+        self.find_calls.append(requested)
+        return FakeCursor([self.documents[doc_id] for doc_id in requested])
+
+
+@pytest.mark.asyncio
+async def test_local_engine_stream_hydrates_and_yields_in_batches(monkeypatch):
+    rng = np.random.default_rng(0)
+    dimensions = 8
+    ids = np.array([f'sku_{i}' for i in range(50)], dtype=object)
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    monkeypatch.setitem(repo.query_builder.vector_search_config, 'EMBEDDING_DIMENSIONS', dimensions)
+    repo.vector_engine = ExactVectorEngine(ids, normalize_rows(rng.standard_normal((50, dimensions)).astype(np.float32)))
+    repo.collection = FakeCollection(ids)
+    events = []
+
+    stream = repo.vector_search_stream(rng.standard_normal(dimensions).tolist(), limit=10, batch_size=4, writer=events.append)
+    first = await anext(stream)
+    # 첫 문서는 첫 배치(4개)만 조회한 뒤 바로 나옴
+    assert len(repo.collection.find_calls) == 1 and len(repo.collection.find_calls[0]) == 4
+    assert events == [{'type': 'product', 'content': first}]
+
+    rest = [doc async for doc in stream]
+    assert [len(call) for call in repo.collection.find_calls] == [4, 4, 2]
+    scores = [first['score'], *(doc['score'] for doc in rest)]
+    assert len(scores) == 10 and scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_exact_mode_uses_configured_exact_engine(monkeypatch):
+    rng = np.random.default_rng(1)
+    dimensions = 8
+    ids = np.array([f'sku_{i}' for i in range(20)], dtype=object)
+    matrix = normalize_rows(rng.standard_normal((20, dimensions)).astype(np.float32))
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    monkeypatch.setitem(repo.query_builder.vector_search_config, 'EMBEDDING_DIMENSIONS', dimensions)
+    repo.set_exact_engine(ExactVectorEngine(ids, matrix))
+    repo.collection = FakeCollection(ids)
+
+    # Atlas 를 거치지 않고 exact 엔진으로 검색 (자기 자신이 1위)
+    results = await repo.vector_search(matrix[3].tolist(), 3, exact=True)
+    assert results[0]['_id'] == 'sku_3'
+    assert len(results) == 3 and len(repo.collection.find_calls) == 1
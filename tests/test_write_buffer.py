@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from pymongo.results import BulkWriteResult
+
+from db.repository.fashion_async import AsyncFashionRepository
+from db.repository.write_buffer import WriteBehindBuffer
+from db.vector.base import get_path
+
+
+def set_path(document, path, value):
+    *parents, leaf = path.split('.')
+    for key in parents:
+        document = document.setdefault(key, {})
+    document[leaf] = value
+
+
+class FakeCollection:
+    def __init__(self, existing):
+        # existing: 집합이면 빈 문서, dict 면 {_id: 문서}
+        self.docs = {doc_id: dict(doc) for doc_id, doc in existing.items()} if isinstance(existing, dict) else {doc_id: {} for doc_id in existing}
+        self.bulk_calls = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_calls.append(operations)
+        matched = modified = 0
+        upserted = []
+        for index, op in enumerate(operations):
+            doc_id = op._filter['_id']
+            fields = op._doc['$set']
+            if doc_id not in self.docs:
+                upserted.append({'index': index, '_id': doc_id})
+                self.docs[doc_id] = {}
+                for path, value in fields.items():
+                    set_path(self.docs[doc_id], path, value)
+                continue
+            matched += 1
+            if any(get_path(self.docs[doc_id], path) != value for path, value in fields.items()):
+                modified += 1
+                for path, value in fields.items():
+                    set_path(self.docs[doc_id], path, value)
+        return BulkWriteResult({'nMatched': matched, 'nModified': modified, 'upserted': upserted}, acknowledged=True)
+
+
+@pytest.mark.asyncio
+async def test_buffer_merges_writes_per_document():
+    batches = []
+
+    async def flush_fn(batch):
+        batches.append({doc_id: dict(pending.fields) for doc_id, pending in batch.items()})
+        return {doc_id: (1, 1) for doc_id in batch}
+
+    buffer = WriteBehindBuffer(flush_fn, max_batch_size=10, flush_interval_ms=10)
+    results = await asyncio.gather(
+        buffer.submit('a', {'price': 1, 'sale': True}),
+        buffer.submit('b', {'price': 5}),
+        buffer.submit('a', {'price': 2}),
+    )
+    assert results == [(1, 1)] * 3
+    assert batches == [{'a': {'price': 2, 'sale': True}, 'b': {'price': 5}}]
+
+
+@pytest.mark.asyncio
+async def test_buffered_update_by_id_uses_one_bulk_write():
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    repo.collection = FakeCollection(existing={'sku-1', 'sku-2'})
+
+    tasks = [asyncio.create_task(repo.buffered_update_by_id(sku, {'products.current_price': 1000}, upsert=True)) for sku in ['sku-1', 'sku-2', 'sku-3']]
+    await asyncio.sleep(0)
+    # flush-on-shutdown: 시간 기준을 기다리지 않고 즉시 전송
+    await repo.flush_writes()
+    assert await asyncio.gather(*tasks) == [(1, 1), (1, 1), (0, 0)]
+    assert len(repo.collection.bulk_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_buffered_update_uses_batch_modified_count_without_extra_reads():
+    repo = AsyncFashionRepository('mongodb://unused', 'fashion_db', 'products_by_sku')
+    repo.collection = FakeCollection(existing={'sku-1': {'products': {'current_price': 1000}}, 'sku-2': {'products': {'current_price': 1000}}})
+
+    tasks = [asyncio.create_task(repo.buffered_update_by_id(sku, {'products.current_price': 1000}, upsert=True)) for sku in ['sku-1', 'sku-2']]
+    await asyncio.sleep(0)
+    await repo.flush_writes()
+    # 배치에서 아무것도 바뀌지 않았으면 모두 modified=0 (FakeCollection 에 find 가 없으므로 추가 조회 없음)
+    assert await asyncio.gather(*tasks) == [(1, 0), (1, 0)]
+    assert len(repo.collection.bulk_calls) == 1